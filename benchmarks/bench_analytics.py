@@ -0,0 +1,62 @@
+"""
+Бенчмарк агрегатных запросов по каталогу.
+
+Сравниваются циклы Python по BooksManager.books и векторные запросы BooksManager(analytics=True):
+- decades: количество книг по десятилетиям;
+- issued_ratio: доля выданных книг у каждого автора;
+- filtered_count: количество выданных книг за интервал годов.
+
+Запуск: python benchmarks/bench_analytics.py [количество книг]
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from analytics import np
+from books_manager import BooksManager
+from catalog_generator import write_catalog
+from models import BookStatus
+
+
+def measure(name: str, loop, vectorized) -> None:
+    timings = []
+    for operation in (loop, vectorized):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    print(f"{name:>15}: цикл {timings[0] * 1000:9.1f} мс, numpy {timings[1] * 1000:7.1f} мс")
+
+
+def issued_ratio_loop(books) -> dict[str, float]:
+    totals, issued = Counter(), Counter()
+    for book in books:
+        totals[book.author] += 1
+        issued[book.author] += book.status == BookStatus.ISSUED
+    return {author: issued[author] / total for author, total in totals.items()}
+
+
+def main(count: int = 1_000_000) -> None:
+    if np is None:
+        print("Для бенчмарка нужен пакет numpy")
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, 'books_data.json')
+        write_catalog(data_file, count)
+        with BooksManager(data_file, analytics=True) as books_manager:
+            books = books_manager.books.values()
+            print(f"Книг: {count}")
+            measure("decades", lambda: Counter(book.year // 10 * 10 for book in books),
+                    lambda: books_manager.group_counts('decade'))
+            measure("issued_ratio", lambda: issued_ratio_loop(books), books_manager.status_ratio_by_author)
+            measure("filtered_count",
+                    lambda: sum(1 for book in books if 1950 <= book.year <= 1999 and book.status == BookStatus.ISSUED),
+                    lambda: books_manager.count_books(1950, 1999, BookStatus.ISSUED))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,124 @@
+"""
+Генератор нагрузки для HTTP-сервиса каталога (src/http_service.py).
+
+Открывает несколько подключений с keep-alive и в течение заданного времени отправляет смесь запросов:
+поиск по названию, автору и части слова, получение книги по ID и, с заданной долей, изменение статуса.
+Выводит количество запросов в секунду и задержки p50/p90/p99.
+
+Если адрес сервиса не указан, сервис запускается в отдельном процессе на временном синтетическом каталоге.
+
+Запуск:
+    python benchmarks/bench_http.py --size 10000 --connections 50 --duration 5 --write-ratio 0.1
+    python benchmarks/bench_http.py --address 127.0.0.1:8080
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import islice
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from bench_manager import percentile
+from catalog_generator import generate_books, write_catalog
+
+SERVICE = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/http_service.py'))
+
+
+def make_requests(size: int, write_ratio: float, seed: int = 0):
+    """
+    Бесконечно генерирует запросы (метод, путь, тело) по книгам синтетического каталога.
+    """
+    rng = random.Random(seed)
+    sample = list(islice(generate_books(size), 1000))
+    while True:
+        book = rng.choice(sample)
+        if rng.random() < write_ratio:
+            status = rng.choice(("В наличии", "Выдана"))
+            yield 'PUT', f'/books/{book.id}/status', json.dumps({'status': status}).encode('utf-8')
+            continue
+        kind = rng.randrange(4)
+        if kind == 0:
+            yield 'GET', f'/books/{book.id}', b''
+        elif kind == 1:
+            yield 'GET', f'/search?field=title&query={quote(book.title)}', b''
+        elif kind == 2:
+            yield 'GET', f'/search?field=author&query={quote(book.author)}', b''
+        else:
+            yield 'GET', f'/search?field=text&query={quote(book.author.split()[1][:4])}', b''
+
+
+async def client(host: str, port: int, requests, deadline: float, latencies: list[float], errors: list[int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, body = next(requests)
+            start = time.perf_counter()
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n"
+                         .encode('latin-1') + body)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b'\r\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, size: int, connections: int, duration: float, write_ratio: float) -> None:
+    requests = make_requests(size, write_ratio)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, deadline, latencies, errors) for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+
+    print(f"Запросов: {len(latencies)}, ошибок: {len(errors)}, подключений: {connections}")
+    print(f"Запросов в секунду: {len(latencies) / elapsed:.0f}")
+    for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+        print(f"{name}: {percentile(latencies, fraction) * 1000:.2f} мс")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генератор нагрузки для HTTP-сервиса каталога")
+    parser.add_argument('--address', help="адрес работающего сервиса host:port")
+    parser.add_argument('--size', type=int, default=10000, help="размер синтетического каталога")
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5.0, help="длительность в секундах")
+    parser.add_argument('--write-ratio', type=float, default=0.1, help="доля запросов на изменение")
+    args = parser.parse_args()
+
+    if args.address:
+        host, port = args.address.rsplit(':', 1)
+        asyncio.run(run_load(host, int(port), args.size, args.connections, args.duration, args.write_ratio))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, 'books.json')
+        write_catalog(data_file, args.size)
+        server = subprocess.Popen([sys.executable, SERVICE, data_file, '--port', '0'],
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            # Первая строка вывода сервиса: "Сервер запущен на http://host:port"
+            host, port = server.stdout.readline().strip().rsplit('/', 1)[1].rsplit(':', 1)
+            asyncio.run(run_load(host, int(port), args.size, args.connections, args.duration, args.write_ratio))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Бенчмарк основных операций BooksManager на каталогах разного размера.
+
+Для каждого хранилища и размера каталога измеряются пропускная способность (операций в секунду),
+задержка p50/p99 и пиковый прирост памяти операций load, save, add, remove, update_status,
+search_title, search_author, search_year и full_text. Результаты можно сохранить в JSON и сравнить
+с результатами предыдущего запуска.
+
+Запуск:
+    python benchmarks/bench_manager.py --sizes 1000 10000 100000 --output results.json
+    python benchmarks/bench_manager.py --compare old.json new.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import islice
+from typing import Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from books_manager import BooksManager
+from catalog_generator import generate_books, write_catalog
+from models import Book, BookStatus
+
+# Хранилища: расширение файла и параметры BooksManager
+STORAGES = {
+    'json': ('.json', {}),
+    'json-nocache': ('.json', {'cache_size': 0}),
+    'journal': ('.json', {'journal': True}),
+    'sqlite': ('.db', {}),
+    'snapshot': ('.snap', {}),
+    'sharded': ('.shards', {}),
+}
+MEMORY_ITERATIONS = 3
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(operation: Callable[[], object], iterations: int, budget: float) -> dict:
+    """
+    Выполняет операцию до iterations раз или пока не истечет budget секунд, затем отдельно
+    измеряет пиковый прирост памяти за одну операцию.
+    """
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < iterations and (not latencies or time.perf_counter() - started < budget):
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+    total = sum(latencies)
+
+    peak_memory = 0
+    tracemalloc.start()
+    for _ in range(min(MEMORY_ITERATIONS, len(latencies))):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        operation()
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    return {
+        'iterations': len(latencies),
+        'throughput': len(latencies) / total if total else 0.0,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def bench_catalog(data_file: str, options: dict, size: int, iterations: int, budget: float) -> dict[str, dict]:
+    """
+    Измеряет все операции на одном каталоге.
+    """
+    rng = random.Random(size)
+    sample = list(islice(generate_books(size), 1000))
+    results = {}
+
+    def load():
+        BooksManager(data_file, **options).close()
+
+    results['load'] = measure(load, iterations, budget)
+
+    books_manager = BooksManager(data_file, **options)
+    try:
+        results['save'] = measure(books_manager.compact, iterations, budget)
+
+        def add():
+            books_manager.add_book(Book(None, "Benchmark", "Benchmark Author", 2000))
+
+        results['add'] = measure(add, iterations, budget)
+
+        def remove():
+            books_manager.remove_book(books_manager.add_book(Book(None, "Benchmark", "Benchmark Author", 2000)))
+
+        # Удаляется только что добавленная книга, чтобы каталог не уменьшался
+        results['remove'] = measure(remove, iterations, budget)
+
+        def update_status():
+            book = rng.choice(sample)
+            status = rng.choice((BookStatus.AVAILABLE, BookStatus.ISSUED))
+            books_manager.update_status(book.id, status)
+
+        results['update_status'] = measure(update_status, iterations, budget)
+
+        for field in ('title', 'author', 'year'):
+            def search(field=field):
+                books_manager.search_books(field, str(getattr(rng.choice(sample), field)))
+
+            results[f'search_{field}'] = measure(search, iterations, budget)
+
+        def full_text():
+            books_manager.full_text_search(rng.choice(sample).author.split()[1][:4])
+
+        results['full_text'] = measure(full_text, iterations, budget)
+    finally:
+        books_manager.close()
+    return results
+
+
+def run_suite(sizes: list[int], storages: list[str], iterations: int, budget: float) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for storage in storages:
+            extension, options = STORAGES[storage]
+            for size in sizes:
+                data_file = os.path.join(directory, f'{storage}_{size}{extension}')
+                write_catalog(data_file, size)
+                for operation, metrics in bench_catalog(data_file, options, size, iterations, budget).items():
+                    result = {'storage': storage, 'size': size, 'operation': operation, **metrics}
+                    results.append(result)
+                    print(format_result(result), flush=True)
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': iterations,
+            'budget': budget,
+        },
+        'results': results,
+    }
+
+
+def format_result(result: dict) -> str:
+    return (f"{result['storage']:>8} {result['size']:>8} {result['operation']:>14}: "
+            f"{result['throughput']:>12.1f} оп/с, p50 {result['p50_ms']:>9.3f} мс, "
+            f"p99 {result['p99_ms']:>9.3f} мс, память {result['peak_memory_bytes'] / 1024:>10.1f} КБ")
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    """
+    Сравнивает два запуска и возвращает описания регрессий.
+
+    Регрессией считается рост задержки p50 или падение пропускной способности больше чем на threshold.
+    """
+    def key(result):
+        return result['storage'], result['size'], result['operation']
+
+    old_results = {key(result): result for result in old['results']}
+    regressions = []
+    for result in new['results']:
+        previous = old_results.get(key(result))
+        if previous is None:
+            continue
+        name = '/'.join(str(part) for part in key(result))
+        if result['p50_ms'] > previous['p50_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p50 {previous['p50_ms']:.3f} -> {result['p50_ms']:.3f} мс")
+        if result['throughput'] < previous['throughput'] * (1 - threshold):
+            regressions.append(f"{name}: {previous['throughput']:.1f} -> {result['throughput']:.1f} оп/с")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк операций BooksManager")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--storages', nargs='+', choices=sorted(STORAGES), default=list(STORAGES))
+    parser.add_argument('--iterations', type=int, default=200, help="максимум повторов операции")
+    parser.add_argument('--budget', type=float, default=2.0, help="максимум секунд на операцию")
+    parser.add_argument('--output', help="файл для результатов в формате JSON")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="сравнить два файла результатов")
+    parser.add_argument('--threshold', type=float, default=0.2, help="допустимое ухудшение, доля")
+    args = parser.parse_args()
+
+    if args.compare:
+        old_file, new_file = args.compare
+        with open(old_file, encoding='utf-8') as old, open(new_file, encoding='utf-8') as new:
+            regressions = compare(json.load(old), json.load(new), args.threshold)
+        for regression in regressions:
+            print(f"Регрессия: {regression}")
+        if not regressions:
+            print("Регрессий не найдено")
+        return 1 if regressions else 0
+
+    results = run_suite(args.sizes, args.storages, args.iterations, args.budget)
+    if args.output:
+        with open(args.output, mode='w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Бенчмарк расхода памяти на одну книгу.
+
+Сравниваются:
+- legacy: прежний класс Book с __dict__ в словаре {id: Book};
+- slots: класс Book со __slots__ в словаре {id: Book};
+- columnar: колоночное хранилище BookStore.
+
+Запуск: python benchmarks/bench_memory.py [количество книг]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from book_store import BookStore
+from models import Book, BookStatus
+
+
+class LegacyBook:
+    """
+    Прежнее представление книги без __slots__.
+    """
+
+    def __init__(self, id, title, author, year, status=BookStatus.AVAILABLE):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.year = year
+        self.status = status
+
+
+def book_fields(count: int):
+    """
+    Генерирует поля книг. Строки создаются заново для каждой книги, как при разборе JSON.
+    """
+    for book_id in range(1, count + 1):
+        yield book_id, f"Title {book_id % 50000}", f"Author {book_id % 5000}", 1800 + book_id % 224
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    books = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del books
+    return size
+
+
+def build_legacy(count):
+    return {book_id: LegacyBook(book_id, title, author, year) for book_id, title, author, year in book_fields(count)}
+
+
+def build_slots(count):
+    return {book_id: Book(book_id, title, author, year) for book_id, title, author, year in book_fields(count)}
+
+
+def build_columnar(count):
+    store = BookStore()
+    for book_id, title, author, year in book_fields(count):
+        store[book_id] = Book(book_id, title, author, year)
+    return store
+
+
+def main(count: int = 100_000) -> None:
+    print(f"Книг: {count}")
+    for name, build in (("legacy", build_legacy), ("slots", build_slots), ("columnar", build_columnar)):
+        size = measure(lambda: build(count))
+        print(f"{name:>10}: {size / count:8.1f} байт на книгу")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
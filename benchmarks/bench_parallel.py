@@ -0,0 +1,72 @@
+"""
+Бенчмарк параллельной загрузки и перебора каталога в зависимости от количества процессов.
+
+Для каждого количества процессов измеряются:
+- load: загрузка JSON-файла данных хранилищем JsonStorage;
+- scan: поиск по неиндексированному полю (id) перебором всех книг, после запуска пула.
+
+Пороги PARALLEL_LOAD_MIN_BYTES и PARALLEL_SCAN_MIN_BOOKS действуют как обычно, поэтому на маленьком
+каталоге параллельный режим не включается и время не меняется.
+
+Измерение на машине с одним ядром (400 000 книг, 74.5 МБ, `bench_parallel.py 400000 1 2 4`):
+
+    процессов   1: load   2.291 с (x 1.0), scan   0.153 с (x 1.0)
+    процессов   2: load   3.131 с (x 0.7), scan   0.332 с (x 0.5)
+    процессов   4: load   2.601 с (x 0.9), scan   0.305 с (x 0.5)
+
+На одном ядре процессы конкурируют с родителем, и к разбору добавляется передача данных между
+процессами, поэтому параллельный режим медленнее. Ускорение на многоядерной машине не измерено,
+поэтому режим включается только явно (BooksManager(..., workers=N)) после запуска бенчмарка
+на целевой машине. Если процессов больше, чем ядер, бенчмарк предупреждает об этом.
+
+Запуск: python benchmarks/bench_parallel.py [количество книг] [количество процессов ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from books_manager import BooksManager
+from catalog_generator import write_catalog
+from storage import JsonStorage
+
+REPEATS = 3
+
+
+def best_time(operation) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(count: int, worker_counts: list[int]) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, 'books_data.json')
+        write_catalog(data_file, count)
+        print(f"Книг: {count}, размер файла: {os.path.getsize(data_file) / 2 ** 20:.1f} МБ, ядер: {os.cpu_count()}")
+
+        baseline = None
+        for workers in worker_counts:
+            if workers > (os.cpu_count() or 1):
+                print(f"Процессов {workers} больше, чем ядер: ускорения не будет")
+            load_time = best_time(lambda: JsonStorage(data_file, workers=workers).load())
+            with BooksManager(data_file, workers=workers, cache_size=0) as books_manager:
+                query = str(count // 2)
+                books_manager.search_books('id', query)
+                scan_time = best_time(lambda: books_manager.search_books('id', query))
+            if baseline is None:
+                baseline = (load_time, scan_time)
+            print(f"процессов {workers:>3}: load {load_time:7.3f} с (x{baseline[0] / load_time:4.1f}), "
+                  f"scan {scan_time:7.3f} с (x{baseline[1] / scan_time:4.1f})")
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    counts = [int(value) for value in sys.argv[2:]] or [1, 2, 4, 8, 16, 32]
+    main(size, counts)
@@ -0,0 +1,52 @@
+"""
+Бенчмарк форматов файла данных.
+
+Для каталога заданного размера сравниваются JSON-файл и двоичный снимок (.snap):
+- load: загрузка всех книг хранилищем;
+- save: сохранение всех книг;
+- размер файла.
+
+Запуск: python benchmarks/bench_snapshot.py [количество книг]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from catalog_generator import generate_books
+from storage import open_storage
+
+FORMATS = (('json', '.json'), ('snapshot', '.snap'))
+REPEATS = 3
+
+
+def best_time(operation) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(count: int = 1_000_000) -> None:
+    books = list(generate_books(count))
+    print(f"Книг: {count}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, extension in FORMATS:
+            storage = open_storage(os.path.join(directory, f'books_data{extension}'))
+            try:
+                save_time = best_time(lambda: storage.save(books))
+                load_time = best_time(storage.load)
+                size = os.path.getsize(storage.data_file)
+            finally:
+                storage.close()
+            print(f"{name:>9}: load {load_time:7.3f} с, save {save_time:7.3f} с, "
+                  f"размер {size / 2 ** 20:8.1f} МБ ({size / count:5.1f} байт на книгу)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
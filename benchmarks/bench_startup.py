@@ -0,0 +1,70 @@
+"""
+Бенчмарк времени открытия каталога.
+
+Сравниваются:
+- eager: обычная загрузка всех книг в конструкторе BooksManager;
+- lazy (build): ленивое открытие без индекса, индекс строится одним проходом по файлу;
+- lazy (index): ленивое открытие с готовым индексом;
+- main.py count/search/status: время запуска команд main.py в отдельном процессе, включая запуск интерпретатора.
+
+Запуск: python benchmarks/bench_startup.py [количество книг]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from lazy_catalog import index_path
+from models import Book
+
+MAIN = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/main.py'))
+
+
+def write_catalog(data_file: str, count: int) -> None:
+    with open(data_file, mode='w', encoding='utf-8') as file:
+        books = (Book(book_id, f"Книга {book_id}", f"Автор {book_id % 5000}", 1800 + book_id % 224).to_dict()
+                 for book_id in range(1, count + 1))
+        json.dump(list(books), file, ensure_ascii=False, indent=4)
+
+
+def measure(name: str, open_catalog) -> None:
+    start = time.perf_counter()
+    books_manager = open_catalog()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>14}: {elapsed:8.3f} с, last_book_id={books_manager.last_book_id}")
+
+
+def measure_command(data_file: str, *arguments: str) -> None:
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, MAIN, '--file', data_file, *arguments],
+                            capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    output = result.stdout.splitlines()
+    print(f"{'main.py ' + arguments[0]:>14}: {elapsed:8.3f} с, {output[0] if output else ''}")
+
+
+def main(count: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, 'books_data.json')
+        write_catalog(data_file, count)
+        print(f"Книг: {count}, размер файла: {os.path.getsize(data_file) / 2 ** 20:.1f} МБ")
+
+        measure("eager", lambda: BooksManager(data_file))
+        if os.path.exists(index_path(data_file)):
+            os.remove(index_path(data_file))
+        measure("lazy (build)", lambda: BooksManager(data_file, lazy=True))
+        measure("lazy (index)", lambda: BooksManager(data_file, lazy=True))
+
+        os.remove(index_path(data_file))
+        measure_command(data_file, 'count')
+        measure_command(data_file, 'search', '--author', "Автор 7")
+        measure_command(data_file, 'status', '1', 'issued')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,80 @@
+"""
+Генератор синтетического каталога книг для бенчмарков.
+
+Распределения приближены к реальным каталогам:
+- популярность авторов и слов в названиях подчиняется закону Ципфа: немногие авторы
+  написали много книг, большинство - одну-две;
+- названия состоят из 1-5 слов;
+- годы издания смещены к современности;
+- около трети книг выдано.
+
+Запуск: python benchmarks/catalog_generator.py <количество книг> <файл каталога> [seed]
+"""
+import os
+import random
+import sys
+from itertools import accumulate
+from typing import Iterator
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from models import Book, BookStatus
+from storage import open_storage
+
+FIRST_NAMES = (
+    "Александр", "Анна", "Борис", "Вера", "Григорий", "Дарья", "Евгений", "Елена", "Иван", "Ирина",
+    "Константин", "Лев", "Мария", "Михаил", "Наталья", "Николай", "Ольга", "Павел", "Сергей", "Татьяна",
+    "Agatha", "Charles", "Emily", "Ernest", "George", "Herman", "Jane", "John", "Mark", "Virginia",
+)
+LAST_NAMES = (
+    "Толстой", "Чехов", "Пушкин", "Гоголь", "Булгаков", "Ахматова", "Цветаева", "Тургенев", "Бунин", "Набоков",
+    "Достоевский", "Лермонтов", "Пастернак", "Шолохов", "Горький", "Куприн", "Платонов", "Зощенко", "Ильф",
+    "Austen", "Christie", "Dickens", "Hemingway", "Melville", "Orwell", "Twain", "Woolf", "Tolkien", "Bronte",
+)
+TITLE_WORDS = (
+    "Война", "Мир", "Ночь", "День", "Дом", "Сад", "Море", "Город", "Тень", "Свет", "Дорога", "Время", "Сердце",
+    "Последний", "Тихий", "Белый", "Черный", "Старый", "Новый", "Золотой", "Вечный", "Дикий", "Далекий",
+    "Night", "Sea", "House", "Garden", "Road", "Time", "Heart", "Shadow", "Light", "River", "Winter", "Summer",
+    "The", "Of", "And", "In", "Last", "Silent", "White", "Black", "Old", "Golden", "Lost", "Secret", "Story",
+)
+
+
+def _zipf_weights(count: int, exponent: float = 1.1) -> list[float]:
+    return list(accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def generate_books(count: int, seed: int = 0) -> Iterator[Book]:
+    """
+    Генерирует count книг с ID от 1 до count. Результат детерминирован для одного seed.
+    """
+    rng = random.Random(seed)
+    author_count = max(10, count // 20)
+    authors = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {number}" for number in range(author_count)]
+    author_weights = _zipf_weights(author_count)
+    word_weights = _zipf_weights(len(TITLE_WORDS))
+
+    for book_id in range(1, count + 1):
+        author = rng.choices(authors, cum_weights=author_weights)[0]
+        words = rng.choices(TITLE_WORDS, cum_weights=word_weights, k=rng.randint(1, 5))
+        title = " ".join(words) + f" {rng.randint(1, count)}"
+        year = max(1450, 2024 - int(abs(rng.gauss(0, 60))))
+        status = BookStatus.ISSUED if rng.random() < 0.3 else BookStatus.AVAILABLE
+        yield Book(book_id, title, author, year, status)
+
+
+def write_catalog(data_file: str, count: int, seed: int = 0) -> None:
+    """
+    Записывает синтетический каталог в файл; хранилище выбирается по расширению файла.
+    """
+    storage = open_storage(data_file)
+    try:
+        storage.save(generate_books(count, seed))
+    finally:
+        storage.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Использование: python catalog_generator.py <количество книг> <файл каталога> [seed]")
+        sys.exit(1)
+    write_catalog(sys.argv[2], int(sys.argv[1]), int(sys.argv[3]) if len(sys.argv) > 3 else 0)
@@ -0,0 +1,144 @@
+from book_store import StringTable
+from models import Book, BookStatus
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy - необязательная зависимость: без нее недоступна только аналитика
+    np = None
+
+
+class CatalogColumns:
+    """
+    Колоночное представление каталога на массивах NumPy для агрегатных запросов.
+
+    Для каждой книги хранится строка с годом издания, кодом статуса и кодом автора; коды авторов
+    выдает таблица интернированных строк. Представление обновляется по одной книге, как индексы
+    BooksManager: add, discard и move (изменение статуса). Строки удаленных книг помечаются
+    как свободные и занимаются новыми книгами, массивы растут удвоением.
+
+    Запросы выполняются векторными операциями NumPy (маски, bincount) без перебора книг в Python.
+    Все запросы принимают фильтры year_low и year_high (включительно), status и author (точное имя).
+    """
+
+    STATUSES = tuple(BookStatus)
+    STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("Для аналитики нужен пакет numpy: pip install numpy")
+        self.clear()
+
+    def clear(self) -> None:
+        self._years = np.zeros(self.INITIAL_CAPACITY, dtype=np.int32)
+        self._statuses = np.zeros(self.INITIAL_CAPACITY, dtype=np.int8)
+        self._authors = np.zeros(self.INITIAL_CAPACITY, dtype=np.int32)
+        self._alive = np.zeros(self.INITIAL_CAPACITY, dtype=bool)
+        self._size = 0
+        self._rows: dict[int, int] = {}
+        self._free_rows: list[int] = []
+        self._author_names = StringTable()
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._years)
+        for name in ('_years', '_statuses', '_authors', '_alive'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def add(self, book: Book) -> None:
+        row = self._rows.get(book.id)
+        if row is None:
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                if self._size == len(self._years):
+                    self._grow()
+                row = self._size
+                self._size += 1
+            self._rows[book.id] = row
+        self._years[row] = book.year
+        self._statuses[row] = self.STATUS_CODES[book.status]
+        self._authors[row] = self._author_names.intern(book.author)
+        self._alive[row] = True
+
+    def discard(self, book: Book) -> None:
+        row = self._rows.pop(book.id, None)
+        if row is not None:
+            self._alive[row] = False
+            self._free_rows.append(row)
+
+    def move(self, book_id: int, old_status: BookStatus, new_status: BookStatus) -> None:
+        row = self._rows.get(book_id)
+        if row is not None:
+            self._statuses[row] = self.STATUS_CODES[new_status]
+
+    def _mask(self, year_low: int | None = None, year_high: int | None = None, status: BookStatus | None = None,
+              author: str | None = None):
+        size = self._size
+        mask = self._alive[:size].copy()
+        if year_low is not None:
+            mask &= self._years[:size] >= year_low
+        if year_high is not None:
+            mask &= self._years[:size] <= year_high
+        if status is not None:
+            mask &= self._statuses[:size] == self.STATUS_CODES[status]
+        if author is not None:
+            code = self._author_names.find(author)
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self._authors[:size] == code
+        return mask
+
+    def count(self, **filters) -> int:
+        """
+        Возвращает количество книг, подходящих под фильтры.
+        """
+        return int(np.count_nonzero(self._mask(**filters)))
+
+    def year_histogram(self, bin_width: int = 10, **filters) -> dict[int, int]:
+        """
+        Возвращает гистограмму годов издания: первый год интервала шириной bin_width -> количество книг.
+        Интервалы без книг не включаются; при bin_width=10 интервалы - десятилетия.
+        """
+        years = self._years[:self._size][self._mask(**filters)]
+        if not years.size:
+            return {}
+        bins = np.floor_divide(years, bin_width)
+        first_bin = int(bins.min())
+        counts = np.bincount(bins - first_bin)
+        return {(first_bin + int(offset)) * bin_width: int(counts[offset]) for offset in np.flatnonzero(counts)}
+
+    def group_counts(self, by: str, **filters) -> dict:
+        """
+        Возвращает количество книг по группам: by - 'status', 'author', 'year' или 'decade'.
+        """
+        if by == 'year':
+            return self.year_histogram(1, **filters)
+        if by == 'decade':
+            return self.year_histogram(10, **filters)
+        mask = self._mask(**filters)
+        if by == 'status':
+            counts = np.bincount(self._statuses[:self._size][mask], minlength=len(self.STATUSES))
+            return {status: int(counts[code]) for code, status in enumerate(self.STATUSES)}
+        if by == 'author':
+            counts = np.bincount(self._authors[:self._size][mask], minlength=len(self._author_names))
+            return {self._author_names[int(code)]: int(counts[code]) for code in np.flatnonzero(counts)}
+        raise ValueError(f"Группировка по {by} не поддерживается")
+
+    def status_ratio_by_author(self, status: BookStatus = BookStatus.ISSUED, min_books: int = 1,
+                               **filters) -> dict[str, float]:
+        """
+        Возвращает долю книг со статусом status среди книг каждого автора, у которого не меньше min_books книг.
+        """
+        mask = self._mask(**filters)
+        authors = self._authors[:self._size][mask]
+        with_status = authors[self._statuses[:self._size][mask] == self.STATUS_CODES[status]]
+        totals = np.bincount(authors, minlength=len(self._author_names))
+        matched = np.bincount(with_status, minlength=len(self._author_names))
+        selected = np.flatnonzero(totals >= max(min_books, 1))
+        ratios = matched[selected] / totals[selected]
+        return {self._author_names[code]: ratio for code, ratio in zip(selected.tolist(), ratios.tolist())}
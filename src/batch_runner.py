@@ -0,0 +1,207 @@
+import json
+from itertools import islice
+from typing import Any, Callable, Iterable, TextIO
+
+from books_manager import BooksManager
+from models import Book, BookStatus
+
+# Общие экземпляры без проверки параметров при каждом вызове json.loads/json.dumps
+_decode = json.JSONDecoder().decode
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+_ADD_RESULT_KEYS = {'id', 'ok'}
+
+
+def _format_result(result: dict) -> str:
+    # Результат команды add без request_id - самый частый, и он записывается без кодировщика JSON
+    if result.keys() == _ADD_RESULT_KEYS and result['ok'] is True:
+        return f'{{"id": {result["id"]}, "ok": true}}'
+    return _encode(result)
+
+
+class BatchRunner:
+    """
+    Выполняет команды в формате JSON Lines без интерактивного меню.
+
+    Каждая строка входа - объект с полем "op" и параметрами команды:
+    - {"op": "add", "title": ..., "author": ..., "year": ...}
+    - {"op": "remove", "id": ...}
+    - {"op": "update_status", "id": ..., "status": "Выдана"}
+    - {"op": "search", "field": "title" | "author" | "year" | "text", "query": ...}
+    - {"op": "list"}
+
+    На каждую команду выводится строка с результатом {"ok": true, ...} или {"ok": false, "error": ...}.
+    Если у команды есть поле "request_id", оно копируется в результат.
+
+    Команды выполняются группами по batch_size, изменения группы сохраняются одной записью.
+    Каждая команда выполняется в точке сохранения: ошибка команды откатывает только ее изменения
+    и не мешает остальным командам группы. Результаты группы выводятся после ее сохранения.
+
+    Атрибуты:
+    - books_manager: Экземпляр класса BooksManager.
+    - batch_size: Количество команд, изменения которых сохраняются вместе.
+    """
+
+    def __init__(self, books_manager: BooksManager, batch_size: int = 10000):
+        self.books_manager = books_manager
+        self.batch_size = batch_size
+        self.commands = {
+            'add': self.add,
+            'remove': self.remove,
+            'update_status': self.update_status,
+            'search': self.search,
+            'list': self.list_books,
+        }
+
+    @staticmethod
+    def _new_book(command: dict) -> Book:
+        year = command['year']
+        if type(year) is not int:
+            raise ValueError("Год издания должен быть целым числом")
+        return Book(None, str(command['title']), str(command['author']), year)
+
+    def add(self, command: dict) -> dict:
+        return {'id': self.books_manager.add_book(self._new_book(command))}
+
+    def remove(self, command: dict) -> dict:
+        self.books_manager.remove_book(command['id'])
+        return {}
+
+    def update_status(self, command: dict) -> dict:
+        self.books_manager.update_status(command['id'], BookStatus(command['status']))
+        return {}
+
+    def search(self, command: dict) -> dict:
+        field, query = command['field'], str(command['query'])
+        if field == 'text':
+            books, total = self.books_manager.full_text_search(
+                query, page=command.get('page', 1), page_size=command.get('page_size', 20))
+        elif field in BooksManager.INDEXED_FIELDS:
+            books = self.books_manager.search_books(field, query)
+            total = len(books)
+        else:
+            raise ValueError(f"Неизвестное поле поиска: {field}")
+        return {'total': total, 'books': [book.to_dict() for book in books]}
+
+    def list_books(self, command: dict) -> dict:
+        return {'books': [book.to_dict() for book in self.books_manager.snapshot()]}
+
+    @staticmethod
+    def _parse(line: str) -> tuple[dict | None, dict[str, Any]]:
+        """
+        Разбирает команду и возвращает ее вместе с заготовкой результата
+        или None и результат с ошибкой, если строка - не объект JSON.
+        """
+        try:
+            command = _decode(line)
+        except json.JSONDecodeError as error:
+            return None, {'ok': False, 'error': f"Некорректный JSON: {error}"}
+        if not isinstance(command, dict):
+            return None, {'ok': False, 'error': "Команда должна быть объектом JSON"}
+        return command, {'request_id': command['request_id']} if 'request_id' in command else {}
+
+    def _call(self, function: Callable[[Any], Any], command: Any, result: dict[str, Any]) -> Any:
+        """
+        Вызывает function(command) в точке сохранения, а ошибку команды записывает в result и возвращает None.
+        """
+        try:
+            with self.books_manager.transaction():
+                return function(command)
+        except KeyError as error:
+            result.update(ok=False, error=f"Не указан параметр {error}")
+        except (ValueError, TypeError) as error:
+            result.update(ok=False, error=str(error))
+        except Exception as error:
+            result.update(ok=False, error=f"Ошибка выполнения команды: {error!r}")
+        return None
+
+    def _execute(self, command: dict, result: dict[str, Any]) -> None:
+        handler = self.commands.get(command.get('op'))
+        if handler is None:
+            result.update(ok=False, error=f"Неизвестная команда: {command.get('op')}")
+            return
+        output = self._call(handler, command, result)
+        if output is not None:
+            result.update(output)
+            result['ok'] = True
+
+    def execute(self, line: str) -> dict:
+        """
+        Выполняет одну команду.
+
+        Параметры:
+        - line (str): Команда в формате JSON.
+
+        Возвращает:
+        - Результат команды. Ошибки команды не пробрасываются, а возвращаются в результате.
+        """
+        command, result = self._parse(line)
+        if command is not None:
+            self._execute(command, result)
+        return result
+
+    def _add_books(self, added: list[tuple[Book, dict[str, Any]]]) -> None:
+        if not added:
+            return
+        try:
+            self.books_manager.add_books([book for book, _ in added])
+        except Exception:
+            # Пакет откатился целиком, поэтому книги добавляются по одной и ошибка достается только своей команде
+            for book, result in added:
+                if self._call(self.books_manager.add_book, book, result) is not None:
+                    result.update(id=book.id, ok=True)
+        else:
+            for book, result in added:
+                result['id'] = book.id
+                result['ok'] = True
+        added.clear()
+
+    def execute_batch(self, lines: Iterable[str]) -> list[dict]:
+        """
+        Выполняет группу команд и сохраняет их изменения одной записью.
+
+        Подряд идущие команды add выполняются одним вызовом BooksManager.add_books, а не add_book
+        на каждую команду; перед любой другой командой добавленные книги уже находятся в каталоге.
+        Если изменения группы не удалось сохранить, успешные команды группы получают результат с ошибкой.
+        """
+        results = []
+        # Книги команд add, ожидающие добавления, и результаты этих команд
+        added: list[tuple[Book, dict[str, Any]]] = []
+        try:
+            with self.books_manager.transaction():
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    command, result = self._parse(line)
+                    results.append(result)
+                    if command is None:
+                        continue
+                    if command.get('op') == 'add':
+                        book = self._call(self._new_book, command, result)
+                        if book is not None:
+                            added.append((book, result))
+                        continue
+                    self._add_books(added)
+                    self._execute(command, result)
+                self._add_books(added)
+        except Exception as error:
+            for result in results:
+                if result.get('ok'):
+                    result.pop('id', None)
+                    result.update(ok=False, error=f"Изменения не сохранены: {error!r}")
+        return results
+
+    def run(self, input_file: TextIO, output_file: TextIO) -> int:
+        """
+        Читает команды из input_file и записывает результаты в output_file.
+
+        Возвращает:
+        - Количество выполненных команд.
+        """
+        count = 0
+        lines = iter(input_file)
+        while batch := list(islice(lines, self.batch_size)):
+            results = self.execute_batch(batch)
+            output_file.write(''.join(_format_result(result) + '\n' for result in results))
+            output_file.flush()
+            count += len(results)
+        return count
@@ -0,0 +1,127 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from typing import Iterator
+
+from models import Book, BookStatus
+
+
+class StringTable:
+    """
+    Таблица интернированных строк: каждая уникальная строка хранится один раз,
+    а книги ссылаются на нее по целочисленному коду.
+    """
+
+    def __init__(self):
+        self._values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def __getitem__(self, code: int) -> str:
+        return self._values[code]
+
+    def find(self, value: str) -> int | None:
+        """
+        Возвращает код строки или None, если строка не встречалась.
+        """
+        return self._codes.get(value)
+
+
+class BookStore(MutableMapping):
+    """
+    Колоночное хранилище книг.
+
+    ID, годы издания и коды статусов хранятся в компактных массивах array, отсортированных по ID,
+    названия и авторы - в таблицах интернированных строк. Объекты Book не хранятся:
+    при обращении по ID создается легковесное представление книги.
+
+    Изменение полученного представления не меняет хранилище - для этого книгу нужно
+    записать обратно: store[book.id] = book.
+    """
+
+    STATUSES = tuple(BookStatus)
+    STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+    def __init__(self):
+        self._ids = array('q')
+        self._years = array('i')
+        self._statuses = array('b')
+        self._title_codes = array('i')
+        self._author_codes = array('i')
+        self._titles = StringTable()
+        self._authors = StringTable()
+
+    def _columns(self) -> tuple[array, ...]:
+        return self._ids, self._years, self._statuses, self._title_codes, self._author_codes
+
+    def _find(self, book_id: int) -> int:
+        """
+        Возвращает номер строки книги или -1, если книги нет.
+        """
+        row = bisect_left(self._ids, book_id)
+        if row < len(self._ids) and self._ids[row] == book_id:
+            return row
+        return -1
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __contains__(self, book_id) -> bool:
+        return isinstance(book_id, int) and self._find(book_id) >= 0
+
+    def __getitem__(self, book_id: int) -> Book:
+        row = self._find(book_id)
+        if row < 0:
+            raise KeyError(book_id)
+        return Book(
+            book_id,
+            self._titles[self._title_codes[row]],
+            self._authors[self._author_codes[row]],
+            self._years[row],
+            self.STATUSES[self._statuses[row]],
+        )
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        values = (
+            book_id,
+            book.year,
+            self.STATUS_CODES[book.status],
+            self._titles.intern(book.title),
+            self._authors.intern(book.author),
+        )
+        row = bisect_left(self._ids, book_id)
+        if row < len(self._ids) and self._ids[row] == book_id:
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+        elif row == len(self._ids):
+            # Обычный случай: ID новой книги больше всех существующих
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns(), values):
+                column.insert(row, value)
+
+    def __delitem__(self, book_id: int) -> None:
+        row = self._find(book_id)
+        if row < 0:
+            raise KeyError(book_id)
+        for column in self._columns():
+            del column[row]
+
+    def set_status(self, book_id: int, status: BookStatus) -> None:
+        row = self._find(book_id)
+        if row < 0:
+            raise KeyError(book_id)
+        self._statuses[row] = self.STATUS_CODES[status]
@@ -2,7 +2,8 @@ from datetime import datetime
 from typing import Callable, Any
 
 from books_manager import BooksManager
-from models import Book, BookStatus
+from metrics import metrics
+from models import Book, BookStatus, is_valid_year, new_book
 
 
 class BooksHandler:
@@ -12,11 +13,13 @@ class BooksHandler:
     Атрибуты:
     - books_manager: Экземпляр класса BooksManager.
     - menu: Доступные пункты меню для пользователя.
+    - page_size: Количество книг на одной странице при просмотре всех книг.
 
     """
 
-    def __init__(self, books_manager: BooksManager):
+    def __init__(self, books_manager: BooksManager, page_size: int = 20):
         self.books_manager = books_manager
+        self.page_size = page_size
 
         self.menu = (
             ("Добавить книгу", self.handle_add_book),
@@ -59,23 +62,25 @@ class BooksHandler:
                     raise ValueError
                 return input_data
             except Exception as error:
+                metrics.increment('input_errors')
                 # print(error)# delete
                 print(f'Ошибка\n{error_message}')
 
+    @metrics.timed('handler_add_book')
     def handle_add_book(self) -> None:
         """
         Обрабатывает добавление новой книги.
         """
-        title = input("Введите название книги:\n").title().strip()
-        author = input("Введите автора книги:\n").title().strip()
-        year = self.validate_input("Введите год издания книги:", int, lambda x: 1 <= x <= self.current_year,
+        title = input("Введите название книги:\n")
+        author = input("Введите автора книги:\n")
+        year = self.validate_input("Введите год издания книги:", int, is_valid_year,
                                    f"Введите число от 1 до {self.current_year}")
 
-        book_id = self.books_manager.last_book_id + 1
-        book = Book(book_id, title, author, year, BookStatus.AVAILABLE)
+        book = new_book(title, author, year)
         self.books_manager.add_book(book)
-        print(f"Книга {title} успешно добавлена")
+        print(f"Книга {book.title} успешно добавлена")
 
+    @metrics.timed('handler_remove_book')
     def handle_remove_book(self) -> None:
         """
         Обрабатывает удаление книги по ID.
@@ -86,8 +91,10 @@ class BooksHandler:
             print(f"Книга с ID={book_id} успешно удалена")
 
         except ValueError as error:
+            metrics.increment('handler_errors')
             print(error)
 
+    @metrics.timed('handler_search_book')
     def handle_search_book(self) -> None:
         """
         Обрабатывает поиск книги по заданному фильтру.
@@ -96,6 +103,10 @@ class BooksHandler:
             ("Название", "title"),
             ("Автор", "author"),
             ("Год издания", "year"),
+            ("Часть названия или автора", "text"),
+            ("Годы издания от и до", "year_range"),
+            ("ID от и до", "id_range"),
+            ("Статус", "status"),
         )
         filter_options_len = len(filter_options)
 
@@ -108,27 +119,156 @@ class BooksHandler:
 
         _, filter_field = filter_options[choice_number - 1]
 
+        if filter_field.endswith("_range"):
+            self.handle_range_search(filter_field.removesuffix("_range"))
+            return
+        if filter_field == "status":
+            self.handle_status_search()
+            return
+
         query = input("Введите запрос для поиска:\n").lower().strip()
+        if filter_field == "text":
+            self.show_found_books(lambda offset, limit: self.books_manager.full_text_search(
+                query, page=offset // limit + 1, page_size=limit))
+            return
         found_books = self.books_manager.search_books(filter_field, query)
+        self.show_found_books(lambda offset, limit: (found_books[offset:offset + limit], len(found_books)))
+
+    @metrics.timed('handler_range_search')
+    def handle_range_search(self, filter_field: str) -> None:
+        """
+        Обрабатывает поиск книг, у которых год издания или ID находится в диапазоне.
+
+        Диапазон вводится в виде "от-до", любую из границ можно опустить: "1900-1950", "1900-", "-1950".
+        Книги выводятся постранично по возрастанию значения поля.
+        """
+        query = input("Введите диапазон в виде от-до, например 1900-1950 (границу можно не указывать):\n")
+        low, separator, high = query.strip().partition("-")
+        try:
+            if not separator:
+                raise ValueError
+            low = int(low) if low.strip() else None
+            high = int(high) if high.strip() else None
+        except ValueError:
+            print("Неверный диапазон")
+            return
+
+        self.show_found_books(lambda offset, limit: self.books_manager.range_search(
+            filter_field, low, high, offset=offset, limit=limit))
+
+    @metrics.timed('handler_status_search')
+    def handle_status_search(self) -> None:
+        """
+        Обрабатывает поиск книг по статусу.
+
+        Книги выводятся постранично по возрастанию ID; количество берется из счетчиков BooksManager.
+        """
+        print("Выберите статус:")
+        for index, book_status in enumerate(BookStatus, start=1):
+            print(f"{index}. {book_status.value}")
+        choice_number = self.validate_input("", int, lambda x: 1 <= x <= len(BookStatus),
+                                            f"Введите число от 1 до {len(BookStatus)}")
+        status = list(BookStatus)[choice_number - 1]
+
+        self.show_found_books(lambda offset, limit: self.books_manager.books_by_status(status, offset, limit))
+
+    def show_found_books(self, fetch: Callable[[int, int], tuple[list[Book], int]]) -> None:
+        """
+        Выводит количество найденных книг и сами книги постранично, по page_size книг на странице.
+
+        Параметры:
+        - fetch (Callable[[int, int], tuple[list[Book], int]]): Функция, которая по смещению и размеру
+          страницы возвращает книги страницы и общее количество найденных книг.
+
+        Переход между страницами - как в handle_display_books, но без перехода к ID.
+        """
+        offset = 0
+        found_books, found_number = fetch(offset, self.page_size)
         if not found_books:
             print("По вашему запросу книги не найдены")
             return
 
-        print(f'Количество найденных книг: {len(found_books)}')
-        for book in found_books:
-            print(book)
+        print(f'Количество найденных книг: {found_number}')
+        while True:
+            self.print_books(found_books)
+            if found_number <= self.page_size:
+                return
+
+            new_offset = None
+            while new_offset is None:
+                command = self.read_page_command(jump=False)
+                if command == 'q':
+                    return
+                new_offset = offset + self.page_size if command == '' else offset - self.page_size
+                if not 0 <= new_offset < found_number:
+                    print("Книг на этой странице нет")
+                    new_offset = None
+            offset = new_offset
+            found_books, found_number = fetch(offset, self.page_size)
+
+    @staticmethod
+    def print_books(books: list[Book]) -> None:
+        """
+        Выводит книги одной записью, а не отдельным print для каждой книги.
+        """
+        print('\n'.join(map(str, books)))
 
+    @metrics.timed('handler_display_books')
     def handle_display_books(self) -> None:
         """
-        Отображает все книги.
+        Отображает все книги постранично, по page_size книг на странице.
+
+        Если книг больше одной страницы, после каждой страницы можно перейти к следующей (Enter),
+        предыдущей (p) или к странице, которая начинается с книги с заданным ID (номер), либо
+        закончить просмотр (q).
         """
-        books = self.books_manager.books.values()
-        if not books:
+        page = self.books_manager.books_page(limit=self.page_size)
+        if not page:
             print("Нет добавленных книг")
             return
-        for book in books:
-            print(book)
 
+        while True:
+            self.print_books(page)
+            has_next = bool(self.books_manager.books_page(page[-1].id, 1))
+            has_previous = bool(self.books_manager.books_page(limit=1, before_id=page[0].id))
+            if not has_next and not has_previous:
+                return
+
+            new_page = None
+            while not new_page:
+                command = self.read_page_command()
+                if command == 'q':
+                    return
+                if command == '':
+                    new_page = self.books_manager.books_page(page[-1].id, self.page_size)
+                elif command == 'p':
+                    new_page = self.books_manager.books_page(limit=self.page_size, before_id=page[0].id)
+                else:
+                    new_page = self.books_manager.books_page(command - 1, self.page_size)
+                if not new_page:
+                    print("Книг на этой странице нет")
+            page = new_page
+
+    @staticmethod
+    def read_page_command(jump: bool = True) -> str | int:
+        """
+        Запрашивает команду просмотра страниц, пока она не будет введена верно.
+
+        Возвращает:
+        - '' - следующая страница, 'p' - предыдущая, 'q' - закончить просмотр, а при jump=True
+          также ID книги (int), с которой начинается нужная страница.
+        """
+        prompt = "Enter - следующая страница, p - предыдущая, "
+        prompt += "ID - перейти к книге, q - закончить просмотр:\n" if jump else "q - закончить просмотр:\n"
+        while True:
+            command = input(prompt).strip().lower()
+            if command in ('', 'p', 'q'):
+                return command
+            if jump and command.isdigit():
+                return int(command)
+            print("Неверная команда")
+
+    @metrics.timed('handler_update_status')
     def handle_update_status(self) -> None:
         """
         Обрабатывает обновление статуса книги.
@@ -149,6 +289,7 @@ class BooksHandler:
             print(f"Статус книги с ID {book_id} обновлен на {new_status.value}")
 
         except ValueError as error:
+            metrics.increment('handler_errors')
             print(error)
 
     def display_menu(self) -> None:
@@ -1,7 +1,23 @@
-import json
-import os
+import heapq
+import threading
+from collections.abc import MutableMapping
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
+from indexes import FieldIndex, SortedIndex, StatusIndex
+from lazy_catalog import LazyBooks
+from metrics import COUNT_BUCKETS, metrics
 from models import Book, BookStatus
+from parallel import FieldEquals, ParallelScanner
+from query import IndexAccess, Predicate, QueryPlan, plan_query
+from query_cache import QueryCache
+from rwlock import RWLock
+from storage import BooksStorage, open_storage
+from text_index import TextIndex
+
+if TYPE_CHECKING:
+    from analytics import CatalogColumns
 
 
 class BooksManager:
@@ -12,66 +28,547 @@ class BooksManager:
     - data_file: Путь к файлу данных о книгах.
     - books: Словарь книг, где ключ - это id книги.
     - last_book_id: Последний использованный ID книги.
+
+    Книги хранятся в хранилище BooksStorage, которое выбирается по расширению data_file:
+    база SQLite для .db, .sqlite и .sqlite3, двоичный снимок (SnapshotStorage) для .snap,
+    директория из шардов с манифестом (ShardedStorage) для .shards, иначе JSON-файл (JsonStorage).
+    Параметры journal, compact_threshold, columnar, lazy, progress и recover
+    передаются JsonStorage и SnapshotStorage. Вместо выбора
+    по расширению можно передать готовое хранилище в параметре storage.
+
+    Для полей INDEXED_FIELDS поддерживаются вторичные хеш-индексы, поэтому поиск по точному
+    совпадению не требует просмотра всех книг. Полнотекстовый поиск по словам названия и автора
+    выполняется по инвертированному индексу; с trigrams=True доступен поиск по подстроке.
+    Если книги загружаются по требованию (lazy=True или SQLite), индексы строятся при первом поиске,
+    а поиск по точному совпадению выполняет само хранилище, если оно это поддерживает. С lazy_indexes=True
+    индексы откладываются до первого поиска и для загруженного целиком каталога: так открываются
+    каталоги для одного изменения, например в командах main.py.
+    Запросы с несколькими условиями (query) начинаются с самого избирательного индекса,
+    план такого запроса показывает explain. Индекс по статусу хранит ID книг для каждого статуса,
+    поэтому status_counts и books_by_status не перебирают каталог.
+
+    Результаты search_books хранятся в LRU-кеше на cache_size запросов с временем жизни cache_ttl
+    секунд (None - без ограничения). При изменении книги сбрасываются только результаты, в которые
+    она входит; статистику кеша возвращает cache_stats().
+
+    С workers > 1 большой JSON-файл данных загружается по частям в нескольких процессах,
+    а перебор книг в search_books и query для каталогов от PARALLEL_SCAN_MIN_BOOKS книг
+    выполняется в пуле процессов (см. parallel.ParallelScanner). Меньшие каталоги обрабатываются
+    в одном процессе. Параллельный режим включается только явно: ускорение зависит от количества
+    ядер и не измерено на многоядерной машине, а на одном ядре процессы только замедляют загрузку
+    и перебор (см. benchmarks/bench_parallel.py). По умолчанию (workers=0) процессы не запускаются.
+
+    С analytics=True (нужен пакет numpy) поддерживается колоночное представление годов, статусов
+    и авторов на NumPy, по которому count_books, group_counts, year_histogram и status_ratio_by_author
+    считают агрегаты векторными операциями (см. analytics.CatalogColumns).
+
+    Пакетные методы add_books, remove_books и update_statuses, а также блок
+    `with manager.transaction():` сохраняют все изменения одной записью и откатывают их при ошибке.
+
+    С write_behind=<интервал в секундах> изменения сохраняются не сразу, а фоновым потоком,
+    который объединяет накопившиеся изменения и сохраняет их раз в интервал. Метод flush()
+    сохраняет отложенные изменения немедленно, close() - сохраняет их и останавливает поток.
+
+    Один экземпляр можно использовать из нескольких потоков: поиск выполняется параллельно
+    под блокировкой на чтение, изменения и транзакции - по одному под блокировкой на запись.
+    ID новой книги выделяется внутри add_book, если у книги нет ID. Для перебора книг,
+    пока другие потоки их меняют, используется snapshot().
+
+    С shared=True один файл данных могут одновременно использовать несколько процессов:
+    изменения выполняются под межпроцессной блокировкой файла, а перед каждой операцией
+    применяются изменения других процессов (см. JsonStorage). Проверка отсутствия изменений
+    стоит одного-двух вызовов os.stat. Для shared=True лучше включать журнал: тогда другие
+    процессы читают только новые записи журнала, а не весь файл данных.
     """
 
-    def __init__(self, data_file='books_data.json'):
+    INDEXED_FIELDS = ('title', 'author', 'year')
+    RANGE_FIELDS = ('id', 'year')
+
+    def __init__(self, data_file='books_data.json', journal: bool = False, compact_threshold: int = 1000,
+                 trigrams: bool = False, columnar: bool = False,
+                 progress: Callable[[int, int, int], None] | None = None, recover: bool = False,
+                 lazy: bool = False, write_behind: float | None = None, storage: BooksStorage | None = None,
+                 shared: bool = False, cache_size: int = 1024, cache_ttl: float | None = None,
+                 workers: int = 0, analytics: bool = False, lazy_indexes: bool = False):
         self.data_file = data_file
+        if storage is None:
+            storage = open_storage(data_file, journal=journal, compact_threshold=compact_threshold,
+                                   columnar=columnar, lazy=lazy, progress=progress, recover=recover,
+                                   shared=shared, workers=workers)
+        self._storage = storage
+        self._transaction: tuple[list[dict], list[tuple]] | None = None
+        # _rwlock разделяет поиск и изменения, _lock защищает данные в памяти от фоновой записи,
+        # _flush_lock упорядочивает записи в хранилище. Блокировки всегда берутся в порядке
+        # _rwlock, блокировка файла, _flush_lock, _lock, а _lock удерживается только на короткие участки
+        self._rwlock = RWLock()
+        self._lock = storage.lock
+        self._flush_lock = threading.RLock()
+        self._pending: list[dict] = []
+        self._dirty = False
+        self.write_behind = write_behind
+        self._closing = threading.Event()
+        self._writer = None
         self._books = self._load_books()
-        self._last_book_id = max(self._books.keys(), default=0)
+        self._last_book_id = storage.last_book_id(self._books)
+        self._indexes = {field: FieldIndex(field) for field in self.INDEXED_FIELDS}
+        self._text_index = TextIndex(trigrams)
+        self._sorted_indexes = {field: SortedIndex(field) for field in self.RANGE_FIELDS}
+        self._status_index = StatusIndex()
+        self._columns = None
+        if analytics:
+            # Импорт здесь: NumPy нужен только аналитике, а его импорт заметно замедляет запуск программы
+            from analytics import CatalogColumns
+            self._columns = CatalogColumns()
+        # Индексы, которые при изменении статуса книги обновляются без ее переиндексации
+        self._status_indexes = [self._status_index] + ([self._columns] if analytics else [])
+        self._book_indexes = [*self._indexes.values(), self._text_index, *self._sorted_indexes.values(),
+                              *self._status_indexes]
+        self._indexes_ready = False
+        self._cache = QueryCache(cache_size, cache_ttl)
+        self._scanner = ParallelScanner(workers) if workers > 1 and not storage.lazy else None
+        self._eager_indexes = not (storage.lazy or lazy_indexes)
+        if self._eager_indexes:
+            self._rebuild_indexes()
+        if storage.needs_compaction:
+            self.compact()
+        if write_behind is not None:
+            self._writer = threading.Thread(target=self._write_behind_loop, name='books-write-behind', daemon=True)
+            self._writer.start()
+
+    def __enter__(self) -> 'BooksManager':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     @property
     def last_book_id(self) -> int:
+        self._refresh()
         return self._last_book_id
 
     @property
-    def books(self) -> dict[int, Book]:
+    def books(self) -> MutableMapping[int, Book]:
+        self._refresh()
         return self._books
 
-    def _load_books(self) -> dict[int, Book]:
+    @metrics.timed('load')
+    def _load_books(self) -> MutableMapping[int, Book]:
+        """
+        Загружает книги из хранилища.
         """
-        Загружает книги из файла данных.
+        return self._storage.load()
 
-        Если файл не существует или поврежден, создается пустой список.
+    def _rebuild_indexes(self) -> None:
         """
-        if not os.path.exists(self.data_file):
-            with open(self.data_file, "w", encoding="utf-8") as file:
-                json.dump([], file)
-        books = {}
-        try:
-            with open(self.data_file, mode='r', encoding='utf-8') as file:
-                data = json.load(file)
-                books = {book['id']: Book.from_dict(book) for book in data}
-        except json.JSONDecodeError as error:
-            print(f"Ошибка при чтении файла {self.data_file}: некорректный формат JSON")
-        except FileNotFoundError:
-            print(f"Файл {self.data_file} не найден")
-        finally:
-            return books
-
-    def _save_books(self) -> None:
-        with open(self.data_file, mode='w', encoding='utf-8') as file:
-            data = [book.to_dict() for book in self._books.values()]
-            json.dump(data, file, ensure_ascii=False, indent=4)
-            file.flush()
-
-    def add_book(self, book: Book) -> None:
+        Заново строит все индексы по текущему набору книг.
         """
-        Добавляет книгу в систему.
+        for index in self._book_indexes:
+            index.clear()
+        self._indexes_ready = True
+        for book in self._books.values():
+            self._index_book(book)
+
+    def _ensure_indexes(self) -> None:
+        """
+        Строит индексы, если они еще не построены (в ленивом режиме).
         """
+        if not self._indexes_ready:
+            # Индексы может одновременно запросить несколько читателей
+            with self._lock:
+                if not self._indexes_ready:
+                    self._rebuild_indexes()
+
+    def _index_book(self, book: Book) -> None:
+        self._cache.invalidate_book(book)
+        if not self._indexes_ready:
+            return
+        for index in self._book_indexes:
+            index.add(book)
+
+    def _unindex_book(self, book: Book) -> None:
+        self._cache.invalidate_book(book)
+        if not self._indexes_ready:
+            return
+        for index in self._book_indexes:
+            index.discard(book)
+
+    def _set_status(self, book: Book, new_status: BookStatus) -> None:
+        old_status = book.status
+        self._cache.invalidate_book(book)
+        book.status = new_status
+        self._cache.invalidate_book(book)
+        # Для BookStore книга - это представление, поэтому изменение записывается обратно
+        self._store_book(book)
+        if self._indexes_ready:
+            for index in self._status_indexes:
+                index.move(book.id, old_status, new_status)
+
+    def _store_book(self, book: Book) -> None:
+        """
+        Добавляет или заменяет книгу в каталоге в памяти и передает изменение пулу перебора.
+        """
+        if self._scanner is not None:
+            self._scanner.put(book, book.id not in self._books)
         self._books[book.id] = book
-        self._last_book_id += 1
-        self._save_books()
+
+    def _discard_book(self, book_id: int) -> Book | None:
+        """
+        Удаляет книгу из каталога в памяти и возвращает ее или None, если книги нет.
+        """
+        book = self._books.pop(book_id, None)
+        if book is not None and self._scanner is not None:
+            self._scanner.delete(book_id)
+        return book
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """
+        Захватывает блокировку на запись в процессе и, для общего хранилища, между процессами,
+        после чего применяет изменения других процессов.
+        """
+        with self._rwlock.write(), self._storage.locked():
+            self._sync()
+            yield
+
+    def _refresh(self) -> None:
+        """
+        Применяет изменения других процессов, если они есть.
+        """
+        if self._storage.changed():
+            with self._writing():
+                pass
+
+    def _sync(self) -> None:
+        if not self._storage.changed():
+            return
+        records = self._storage.changes(self._books)
+        with self._lock:
+            if records is None:
+                if isinstance(self._books, LazyBooks):
+                    self._books.close()
+                self._books = self._load_books()
+                self._last_book_id = self._storage.last_book_id(self._books)
+                self._cache.clear()
+                if self._scanner is not None:
+                    self._scanner.reset()
+                self._indexes_ready = False
+                if self._eager_indexes:
+                    self._rebuild_indexes()
+                return
+            for record in records:
+                self._apply_external(record)
+
+    def _apply_external(self, record: dict) -> None:
+        """
+        Применяет к книгам и индексам запись об изменении, сделанном другим процессом.
+        """
+        operation = record['op']
+        if operation == 'batch':
+            for batch_record in record['records']:
+                self._apply_external(batch_record)
+        elif operation == 'add':
+            book = Book.from_dict(record['book'])
+            previous = self._books.get(book.id)
+            if previous is not None:
+                self._unindex_book(previous)
+            self._store_book(book)
+            self._index_book(book)
+            self._last_book_id = max(self._last_book_id, book.id)
+        elif operation == 'remove':
+            book = self._discard_book(record['id'])
+            if book is not None:
+                self._unindex_book(book)
+        elif operation == 'status':
+            book = self._books.get(record['id'])
+            if book is not None:
+                self._set_status(book, BookStatus(record['status']))
+
+    def _persist(self, records: list[dict]) -> None:
+        """
+        Сохраняет изменения или, в режиме отложенной записи, помечает их для фонового сохранения.
+        """
+        if not records:
+            return
+        if self._writer is not None:
+            with self._lock:
+                self._pending.extend(records)
+                self._dirty = True
+            return
+        self._write(partial(self._storage.write, self._books, records))
+
+    @metrics.timed('save')
+    def _write(self, write: Callable[[], None]) -> None:
+        """
+        Записывает изменения в хранилище функцией write.
+        """
+        with self._flush_lock:
+            write()
+
+    def flush(self) -> None:
+        """
+        Немедленно сохраняет изменения, отложенные в режиме отложенной записи.
+        """
+        shared = self._storage.shared
+        with ExitStack() as stack:
+            # В общем хранилище перед записью применяются изменения других процессов, иначе запись их затрет,
+            # поэтому запись идет под блокировкой на запись и блокировкой файла. Иначе блокировка на чтение
+            # дожидается завершения транзакции и держится, только пока хранилище снимает изменения:
+            # сериализация и fsync идут без нее и не задерживают писателей
+            with self._writing() if shared else self._rwlock.read():
+                stack.enter_context(self._flush_lock)
+                with self._lock:
+                    if not self._dirty:
+                        return
+                    records, self._pending = self._pending, []
+                    self._dirty = False
+                try:
+                    write = self._storage.prepare_write(self._books, records)
+                    if shared:
+                        self._write(write)
+                except BaseException:
+                    self._restore_pending(records)
+                    raise
+            if not shared:
+                try:
+                    self._write(write)
+                except BaseException:
+                    self._restore_pending(records)
+                    raise
+
+    def _restore_pending(self, records: list[dict]) -> None:
+        # Изменения остаются отложенными до следующей попытки
+        with self._lock:
+            self._pending[:0] = records
+            self._dirty = True
+
+    def _write_behind_loop(self) -> None:
+        while not self._closing.wait(self.write_behind):
+            try:
+                self.flush()
+            except Exception as error:
+                print(f"Ошибка при сохранении файла {self.data_file}: {error}")
+
+    def close(self) -> None:
+        """
+        Сохраняет отложенные изменения, останавливает фоновую запись и закрывает файлы.
+        """
+        if self._writer is not None:
+            self._closing.set()
+            self._writer.join()
+        self.flush()
+        self._writer = None
+        if self._scanner is not None:
+            self._scanner.close()
+        if isinstance(self._books, LazyBooks):
+            self._books.close()
+        self._storage.close()
+
+    def _undo(self, undo: tuple) -> None:
+        """
+        Внутри транзакции запоминает данные для отката изменения. Вызывается до изменения книг
+        и индексов, поэтому при ошибке посередине изменения оно откатывается целиком.
+        """
+        if self._transaction is not None:
+            self._transaction[1].append(undo)
+
+    def _record(self, record: dict) -> None:
+        """
+        Сохраняет изменение или, внутри транзакции, откладывает его до ее завершения.
+        """
+        if self._transaction is None:
+            self._persist([record])
+            return
+        self._transaction[0].append(record)
+
+    def _rollback(self, undo_log: list[tuple]) -> None:
+        """
+        Отменяет изменения в памяти в обратном порядке.
+        """
+        for operation, book_id, previous in reversed(undo_log):
+            if operation == 'add':
+                # Изменение могло прерваться до того, как книга попала в каталог.
+                # Замененная книга возвращается на свое место, а не в конец каталога
+                book = self._books.get(book_id) if previous is not None else self._discard_book(book_id)
+                if book is not None:
+                    self._unindex_book(book)
+                if previous is not None:
+                    self._store_book(previous)
+                    self._index_book(previous)
+            elif operation == 'remove':
+                self._store_book(previous)
+                self._index_book(previous)
+            elif operation == 'status':
+                self._set_status(self._books[book_id], previous)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Объединяет изменения в транзакцию.
+
+        Изменения внутри блока сохраняются одной записью при выходе из него.
+        При исключении внутри блока все изменения откатываются, а исключение пробрасывается дальше.
+        Вложенная транзакция входит во внешнюю и работает как точка сохранения: при исключении
+        откатываются только ее изменения, и если исключение перехвачено, внешняя транзакция продолжается.
+        """
+        with self._writing():
+            if self._transaction is not None:
+                records, undo_log = self._transaction
+                record_count, undo_count, last_book_id = len(records), len(undo_log), self._last_book_id
+                try:
+                    yield
+                except BaseException:
+                    with self._lock:
+                        self._rollback(undo_log[undo_count:])
+                        del records[record_count:], undo_log[undo_count:]
+                        self._last_book_id = last_book_id
+                    raise
+                return
+
+            # Других писателей исключает блокировка на запись, поэтому _lock берется только
+            # на отдельные изменения, а не на весь блок и сохранение, которое берет _flush_lock
+            self._transaction = ([], [])
+            last_book_id = self._last_book_id
+            try:
+                yield
+                records, _ = self._transaction
+                self._persist(records)
+            except BaseException:
+                _, undo_log = self._transaction
+                with self._lock:
+                    self._rollback(undo_log)
+                    self._storage.rollback()
+                    self._last_book_id = last_book_id
+                raise
+            finally:
+                self._transaction = None
+
+    def compact(self) -> None:
+        """
+        Приводит хранилище к компактному виду, например сворачивает журнал в снимок файла данных.
+        """
+        with self._writing(), self._flush_lock:
+            self._storage.compact(self._books)
+
+    def _add_book(self, book: Book) -> None:
+        # Значения, не помещающиеся в ключи отсортированных индексов, отклоняются до любых изменений
+        for index in self._sorted_indexes.values():
+            index.check(book)
+        with self._lock:
+            previous = self._books.get(book.id)
+            self._undo(('add', book.id, previous))
+            if previous is not None:
+                self._unindex_book(previous)
+            self._store_book(book)
+            self._index_book(book)
+            self._last_book_id = max(self._last_book_id, book.id)
+        self._record({'op': 'add', 'book': book.to_dict()})
+
+    def _remove_book(self, book_id: int) -> None:
+        with self._lock:
+            book = self._books[book_id]
+            self._undo(('remove', book_id, book))
+            self._discard_book(book_id)
+            self._unindex_book(book)
+        self._record({'op': 'remove', 'id': book_id})
+
+    def _update_status(self, book_id: int, new_status: BookStatus) -> None:
+        with self._lock:
+            book = self._books[book_id]
+            if book.status == new_status:
+                return
+            old_status = book.status
+            self._undo(('status', book_id, old_status))
+            self._set_status(book, new_status)
+        self._record({'op': 'status', 'id': book_id, 'status': new_status.value})
+
+    @staticmethod
+    def _check_id(book_id) -> None:
+        # bool - подкласс int, но ID-логическое значение почти наверняка ошибка
+        if not isinstance(book_id, int) or isinstance(book_id, bool):
+            raise ValueError(f"ID книги должен быть целым числом, а не {book_id!r}")
+
+    def _check_exists(self, book_ids: Iterable[int]) -> None:
+        for book_id in book_ids:
+            if book_id not in self._books:
+                raise ValueError(f"Книга с ID {book_id} не найдена")
+
+    def add_book(self, book: Book) -> int:
+        """
+        Добавляет книгу в систему.
+
+        Если ID книги равен None, книге атомарно выделяется следующий после last_book_id ID.
+        Если книгу не удалось добавить (например, из-за ошибки в индексах), каталог не меняется.
+
+        Возвращает:
+        - ID добавленной книги.
+        """
+        allocated = book.id is None
+        if not allocated:
+            self._check_id(book.id)
+        try:
+            with self.transaction():
+                if allocated:
+                    book.id = self._last_book_id + 1
+                self._add_book(book)
+        except BaseException:
+            if allocated:
+                book.id = None
+            raise
+        return book.id
+
+    def add_books(self, books: Iterable[Book]) -> None:
+        """
+        Добавляет несколько книг и сохраняет их одной записью.
+
+        Книгам с ID, равным None, выделяются ID по порядку после last_book_id и ID остальных книг пакета.
+        Если ID книги не целое число, повторяется в пакете или уже занят, ни одна книга не добавляется,
+        а выделенные ID сбрасываются обратно в None.
+        """
+        books = list(books)
+        new_books = [book for book in books if book.id is None]
+        try:
+            with self.transaction():
+                book_ids = set()
+                for book in books:
+                    if book.id is None:
+                        continue
+                    self._check_id(book.id)
+                    if book.id in book_ids or book.id in self._books:
+                        raise ValueError(f"Книга с ID {book.id} уже существует")
+                    book_ids.add(book.id)
+
+                next_id = max(self._last_book_id, max(book_ids, default=0)) + 1
+                for book_id, book in enumerate(new_books, start=next_id):
+                    book.id = book_id
+                for book in books:
+                    self._add_book(book)
+        except BaseException:
+            # ID сбрасываются после отката транзакции: откат удаляет книги из индексов по их ID
+            for book in new_books:
+                book.id = None
+            raise
 
     def remove_book(self, book_id: int) -> None:
         """
         Удаляет книгу по ID.
         """
-        if book_id not in self._books:
-            raise ValueError(f"Книга с ID {book_id} не найдена")
+        with self.transaction():
+            self._check_exists([book_id])
+            self._remove_book(book_id)
 
-        del self._books[book_id]
-        self._save_books()
+    def remove_books(self, book_ids: Iterable[int]) -> None:
+        """
+        Удаляет несколько книг по ID и сохраняет изменения одной записью.
+
+        Если хотя бы одна книга не найдена, ни одна книга не удаляется.
+        """
+        book_ids = list(dict.fromkeys(book_ids))
+        with self.transaction():
+            self._check_exists(book_ids)
+            for book_id in book_ids:
+                self._remove_book(book_id)
 
+    @metrics.timed('search')
     def search_books(self, filter_field: str, query: str) -> list[Book]:
         """
         Ищет книги по заданному фильтру.
@@ -79,7 +576,38 @@ class BooksManager:
         Параметры:
         - filter_field (str): Поле для фильтрации (title, author или year).
         - query (str): Запрос для поиска.
+
+        Поиск выполняется хранилищем, если оно это поддерживает, иначе по индексу для индексируемых
+        полей, а для остальных - перебором всех книг. Результат сохраняется в кеше запросов.
         """
+        self._refresh()
+        with self._rwlock.read():
+            self._cache.validate(self._storage.data_version())
+            key = QueryCache.key(filter_field, query)
+            found_books = self._cache.get(key)
+            if found_books is None:
+                found_books = self._search_books(filter_field, query)
+                self._cache.put(key, found_books)
+            return found_books
+
+    def _search_books(self, filter_field: str, query: str) -> list[Book]:
+        found_books = self._storage.search(filter_field, query)
+        if found_books is not None:
+            return found_books
+
+        index = self._indexes.get(filter_field)
+        if index is not None:
+            self._ensure_indexes()
+            found_books = [self._books[book_id] for book_id in index.get(query)]
+            metrics.observe('search_scanned_books', len(found_books), COUNT_BUCKETS)
+            return found_books
+
+        metrics.observe('search_scanned_books', len(self._books), COUNT_BUCKETS)
+        if self._scanner is not None:
+            found_books = self._scanner.scan(self._books, [FieldEquals(filter_field, query)])
+            if found_books is not None:
+                return found_books
+
         query = query.lower()
         result = [
             book for book in self._books.values()
@@ -87,13 +615,276 @@ class BooksManager:
         ]
         return result
 
+    def cache_stats(self) -> dict[str, int]:
+        """
+        Возвращает статистику кеша запросов: hits, misses, evictions, expirations, invalidations, size и maxsize.
+        """
+        return self._cache.stats()
+
+    def full_text_search(self, query: str, mode: str | None = None, page: int = 1,
+                         page_size: int = 20) -> tuple[list[Book], int]:
+        """
+        Ищет книги по словам названия и автора с ранжированием результатов.
+
+        Параметры:
+        - query (str): Запрос для поиска, например часть названия или фамилия автора.
+        - mode (str | None): 'word', 'prefix' или 'substring'. По умолчанию 'substring',
+          если включен индекс триграмм, иначе 'prefix'.
+        - page (int): Номер страницы результатов, начиная с 1.
+        - page_size (int): Количество книг на странице.
+
+        Возвращает:
+        - Кортеж из списка книг на странице и общего количества найденных книг.
+        """
+        if mode is None:
+            mode = 'substring' if self._text_index.trigrams else 'prefix'
+        self._refresh()
+        with self._rwlock.read():
+            self._ensure_indexes()
+            book_ids, total = self._text_index.search(query, mode, (page - 1) * page_size, page_size)
+            return [self._books[book_id] for book_id in book_ids], total
+
+    def books_page(self, after_id: int = 0, limit: int = 20, before_id: int | None = None) -> list[Book]:
+        """
+        Возвращает страницу книг по возрастанию ID без построения полного списка книг.
+
+        Следующая страница запрашивается с after_id, равным ID последней книги текущей страницы,
+        предыдущая - с before_id, равным ID первой книги, поэтому стоимость запроса не зависит
+        от номера страницы (keyset pagination).
+
+        Параметры:
+        - after_id (int): Возвращаются книги с ID больше after_id; 0 - первая страница.
+        - limit (int): Количество книг на странице.
+        - before_id (int | None): Если задан, возвращаются последние limit книг с ID меньше before_id,
+          а after_id не учитывается.
+
+        Возвращает:
+        - Список книг страницы по возрастанию ID.
+        """
+        self._refresh()
+        with self._rwlock.read():
+            found_books = self._storage.page(after_id, before_id, limit)
+            if found_books is not None:
+                return found_books
+            self._ensure_indexes()
+            id_index = self._sorted_indexes['id']
+            if before_id is None:
+                book_ids, _ = id_index.range(low=after_id + 1, limit=limit)
+            else:
+                book_ids, _ = id_index.range(high=before_id - 1, descending=True, limit=limit)
+                book_ids.reverse()
+            return [self._books[book_id] for book_id in book_ids]
+
+    def range_search(self, filter_field: str, low: int | None = None, high: int | None = None,
+                     descending: bool = False, offset: int = 0,
+                     limit: int | None = None) -> tuple[list[Book], int]:
+        """
+        Ищет книги, у которых значение поля находится в диапазоне, по отсортированному индексу
+        за O(log n + k), где k - количество возвращаемых книг.
+
+        Параметры:
+        - filter_field (str): Поле из RANGE_FIELDS (id или year).
+        - low (int | None), high (int | None): Границы диапазона включительно; None - без границы.
+        - descending (bool): Если True, книги упорядочиваются по убыванию значения поля, иначе по возрастанию.
+          Книги с равным значением упорядочиваются по ID.
+        - offset (int): Сколько книг пропустить.
+        - limit (int | None): Сколько книг вернуть; None - все.
+
+        Возвращает:
+        - Кортеж из списка книг и общего количества книг в диапазоне.
+        """
+        index = self._sorted_indexes.get(filter_field)
+        if index is None:
+            raise ValueError(f"Поиск по диапазону не поддерживается для поля {filter_field}")
+        self._refresh()
+        with self._rwlock.read():
+            found = self._storage.range_search(filter_field, low, high, descending, offset, limit)
+            if found is not None:
+                return found
+            self._ensure_indexes()
+            book_ids, total = index.range(low, high, descending, offset, limit)
+            return [self._books[book_id] for book_id in book_ids], total
+
+    def _index_access(self, predicate: Predicate) -> IndexAccess | None:
+        """
+        Возвращает способ выполнить условие по индексу или None, если подходящего индекса нет.
+        """
+        field, value = predicate.field, predicate.value
+        if predicate.operator == 'range':
+            index = self._sorted_indexes[field]
+            return IndexAccess(f"диапазон {field}", index.count(value, predicate.high),
+                               lambda: index.range(value, predicate.high)[0])
+        if predicate.operator == 'prefix':
+            # Индекс слов общий для названия и автора, поэтому кандидаты проверяются по полю
+            return IndexAccess("слова названия и автора", self._text_index.estimate_prefix(value),
+                               lambda: self._text_index.prefix_ids(value), exact=False)
+        if field == 'status':
+            return IndexAccess("статус", self._status_index.count(value), lambda: self._status_index.get(value))
+        if field == 'id' and type(value) is int:
+            book_ids = [value] if value in self._books else []
+            return IndexAccess("ID", len(book_ids), lambda: book_ids)
+        index = self._indexes.get(field)
+        if index is None:
+            return None
+        book_ids = index.get(value)
+        return IndexAccess(f"хеш {field}", len(book_ids), lambda: book_ids)
+
+    def _plan_query(self, predicates: list[Predicate]) -> QueryPlan:
+        self._ensure_indexes()
+        return plan_query(predicates, self._index_access, len(self._books))
+
+    def query(self, predicates: Iterable[Predicate]) -> list[Book]:
+        """
+        Ищет книги, подходящие под все условия.
+
+        Параметры:
+        - predicates (Iterable[Predicate]): Условия на равенство, диапазон, статус или начало слов,
+          например [Predicate.eq('author', 'Лев Толстой'), Predicate.range('year', 1860, 1880),
+          Predicate.status(BookStatus.AVAILABLE)].
+
+        Запрос выполняет хранилище, если оно это поддерживает. Иначе ID книг берутся из самого
+        избирательного индекса и пересекаются с ID из остальных индексов от меньшего к большему,
+        а условия без индекса проверяются для каждой найденной книги (см. plan_query).
+
+        Возвращает:
+        - Список книг по возрастанию ID.
+        """
+        predicates = list(predicates)
+        self._refresh()
+        with self._rwlock.read():
+            found_books = self._storage.query(predicates)
+            if found_books is not None:
+                return found_books
+            plan = self._plan_query(predicates)
+            if not plan.indexes and self._scanner is not None:
+                found_books = self._scanner.scan(self._books, plan.filters)
+                if found_books is not None:
+                    return sorted(found_books, key=lambda book: book.id)
+            return plan.execute(self._books)
+
+    def explain(self, predicates: Iterable[Predicate]) -> QueryPlan:
+        """
+        Возвращает план, по которому query выполнит запрос; str(plan) - его шаги по строкам.
+        """
+        predicates = list(predicates)
+        self._refresh()
+        with self._rwlock.read():
+            plan = self._storage.explain_query(predicates)
+            if plan is not None:
+                return plan
+            return self._plan_query(predicates)
+
+    def status_counts(self) -> dict[BookStatus, int]:
+        """
+        Возвращает количество книг с каждым статусом без перебора книг.
+        """
+        self._refresh()
+        with self._rwlock.read():
+            counts = self._storage.status_counts()
+            if counts is not None:
+                return counts
+            self._ensure_indexes()
+            return {status: self._status_index.count(status) for status in BookStatus}
+
+    def books_by_status(self, status: BookStatus, offset: int = 0,
+                        limit: int | None = None) -> tuple[list[Book], int]:
+        """
+        Возвращает книги со статусом status по возрастанию ID.
+
+        Параметры:
+        - status (BookStatus): Статус книг.
+        - offset (int): Сколько книг пропустить.
+        - limit (int | None): Сколько книг вернуть; None - все.
+
+        Возвращает:
+        - Кортеж из списка книг и общего количества книг с этим статусом.
+        """
+        self._refresh()
+        with self._rwlock.read():
+            found = self._storage.books_by_status(status, offset, limit)
+            if found is not None:
+                return found
+            self._ensure_indexes()
+            book_ids = self._status_index.get(status)
+            if limit is None:
+                book_ids = sorted(book_ids)[offset:]
+            else:
+                book_ids = heapq.nsmallest(offset + limit, book_ids)[offset:]
+            return [self._books[book_id] for book_id in book_ids], self._status_index.count(status)
+
+    @contextmanager
+    def _reading_columns(self) -> Iterator['CatalogColumns']:
+        if self._columns is None:
+            raise ValueError("Аналитика выключена: используйте BooksManager(..., analytics=True)")
+        self._refresh()
+        with self._rwlock.read():
+            self._ensure_indexes()
+            yield self._columns
+
+    def count_books(self, year_low: int | None = None, year_high: int | None = None,
+                    status: BookStatus | None = None, author: str | None = None) -> int:
+        """
+        Возвращает количество книг с годом издания от year_low до year_high, статусом status и автором author.
+        Незаданный фильтр не учитывается.
+        """
+        with self._reading_columns() as columns:
+            return columns.count(year_low=year_low, year_high=year_high, status=status, author=author)
+
+    def group_counts(self, by: str, year_low: int | None = None, year_high: int | None = None,
+                     status: BookStatus | None = None, author: str | None = None) -> dict:
+        """
+        Возвращает количество книг по группам: by - 'status', 'author', 'year' или 'decade'.
+        Фильтры - как в count_books.
+        """
+        with self._reading_columns() as columns:
+            return columns.group_counts(by, year_low=year_low, year_high=year_high, status=status, author=author)
+
+    def year_histogram(self, bin_width: int = 10, year_low: int | None = None, year_high: int | None = None,
+                       status: BookStatus | None = None, author: str | None = None) -> dict[int, int]:
+        """
+        Возвращает гистограмму годов издания: первый год интервала шириной bin_width -> количество книг.
+        Фильтры - как в count_books.
+        """
+        with self._reading_columns() as columns:
+            return columns.year_histogram(bin_width, year_low=year_low, year_high=year_high, status=status,
+                                          author=author)
+
+    def status_ratio_by_author(self, status: BookStatus = BookStatus.ISSUED, min_books: int = 1) -> dict[str, float]:
+        """
+        Возвращает долю книг со статусом status (по умолчанию - выданных) у каждого автора,
+        у которого не меньше min_books книг.
+        """
+        with self._reading_columns() as columns:
+            return columns.status_ratio_by_author(status, min_books)
+
+    def snapshot(self) -> list[Book]:
+        """
+        Возвращает копию списка книг, которую можно перебирать, пока другие потоки меняют каталог.
+
+        Блокировка на чтение удерживается только на время копирования.
+        """
+        self._refresh()
+        with self._rwlock.read():
+            return list(self._books.values())
+
     def update_status(self, book_id: int, new_status: BookStatus):
         """
         Обновляет статус книги.
         """
-        if book_id not in self._books:
-            raise ValueError(f"Книга с ID {book_id} не найдена")
+        with self.transaction():
+            self._check_exists([book_id])
+            self._update_status(book_id, new_status)
 
-        if self._books[book_id].status != new_status:
-            self._books[book_id].status = new_status
-            self._save_books()
+    def update_statuses(self, statuses: dict[int, BookStatus]) -> None:
+        """
+        Обновляет статусы нескольких книг и сохраняет изменения одной записью.
+
+        Параметры:
+        - statuses (dict[int, BookStatus]): Соответствие ID книги и нового статуса.
+
+        Если хотя бы одна книга не найдена, ни один статус не меняется.
+        """
+        with self.transaction():
+            self._check_exists(statuses)
+            for book_id, new_status in statuses.items():
+                self._update_status(book_id, new_status)
@@ -0,0 +1,91 @@
+from models import Book, BookStatus, new_book
+from storage import open_storage
+
+# Статусы в командной строке: английские имена или значения BookStatus
+STATUS_NAMES = {'available': BookStatus.AVAILABLE, 'issued': BookStatus.ISSUED,
+                **{status.value.lower(): status for status in BookStatus}}
+
+
+def parse_status(value: str) -> BookStatus:
+    """
+    Преобразует статус из командной строки в BookStatus.
+    """
+    status = STATUS_NAMES.get(value.strip().lower())
+    if status is None:
+        raise ValueError(f"Неизвестный статус {value}, доступны: {', '.join(STATUS_NAMES)}")
+    return status
+
+
+def count_books(data_file: str, status: BookStatus | None = None) -> int:
+    """
+    Возвращает количество книг (со статусом status, если он задан).
+
+    Количество берется из заголовка снимка, индекса ленивого режима или таблицы status_counts
+    SQLite, а в JSON-файле считается без разбора книг (см. BooksStorage.book_count).
+    Книги загружаются, только если хранилище не может посчитать их само.
+    """
+    storage = open_storage(data_file)
+    try:
+        if status is None:
+            count = storage.book_count()
+            if count is not None:
+                return count
+            return len(storage.load())
+        counts = storage.status_counts()
+        if counts is not None:
+            return counts[status]
+        return sum(1 for book in storage.load().values() if book.status == status)
+    finally:
+        storage.close()
+
+
+def search_books(data_file: str, filter_field: str, query: str) -> list[Book]:
+    """
+    Ищет книги, как BooksManager.search_books, но без построения индексов: для одного запроса
+    перебор загруженных книг быстрее, чем индексы по всему каталогу. Поиск по полю status
+    и поиск в SQLite выполняет хранилище.
+    """
+    storage = open_storage(data_file)
+    try:
+        if filter_field == 'status':
+            status = parse_status(query)
+            found = storage.books_by_status(status, 0, None)
+            if found is not None:
+                return found[0]
+            return [book for book in storage.load().values() if book.status == status]
+        found_books = storage.search(filter_field, query)
+        if found_books is not None:
+            return found_books
+        query = query.lower()
+        return [book for book in storage.load().values() if str(getattr(book, filter_field)).lower() == query]
+    finally:
+        storage.close()
+
+
+def _open_manager(data_file: str, shared: bool):
+    # Импорт здесь: остальным командам BooksManager не нужен
+    from books_manager import BooksManager
+    # Для одного изменения индексы не нужны
+    return BooksManager(data_file, shared=shared, lazy_indexes=True, cache_size=0)
+
+
+def add_book(data_file: str, title: str, author: str, year: int, shared: bool = False) -> int:
+    """
+    Добавляет книгу и возвращает ее ID.
+
+    Название, автор и год издания проверяются и нормализуются так же, как в меню (см. models.new_book).
+    При shared=True изменение выполняется под блокировкой файла данных, который
+    одновременно используют другие процессы (см. BooksManager, параметр shared).
+    """
+    with _open_manager(data_file, shared) as books_manager:
+        return books_manager.add_book(new_book(title, author, year))
+
+
+def update_status(data_file: str, book_id: int, status: BookStatus, shared: bool = False) -> None:
+    with _open_manager(data_file, shared) as books_manager:
+        books_manager.update_status(book_id, status)
+
+
+def remove_book(data_file: str, book_id: int, shared: bool = False) -> None:
+    with _open_manager(data_file, shared) as books_manager:
+        books_manager.remove_book(book_id)
@@ -0,0 +1,74 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    # В Windows нет fcntl: блокировка действует только между потоками одного процесса
+    fcntl = None
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', encoding: str | None = 'utf-8') -> Iterator[IO]:
+    """
+    Открывает временный файл для записи и атомарно заменяет им файл path.
+
+    Данные пишутся в `<path>.tmp`, сбрасываются на диск (fsync) и только после этого
+    файл переименовывается в path с помощью os.replace. При сбое во время записи
+    прежний файл остается целым, а временный файл удаляется.
+    """
+    temp_path = f'{path}.tmp'
+    if 'b' in mode:
+        encoding = None
+    try:
+        with open(temp_path, mode=mode, encoding=encoding) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class FileLock:
+    """
+    Рекомендательная (advisory) блокировка между процессами через fcntl.flock на файле path.
+
+    Блокировка повторно входима в пределах процесса: вложенные захваты учитываются счетчиком,
+    и файл разблокируется при выходе из внешнего. Потоки одного процесса захватывают ее по очереди.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._file = None
+        self._depth = 0
+
+    @contextmanager
+    def acquire(self) -> Iterator[None]:
+        """
+        Захватывает блокировку, ожидая, пока ее освободят другие процессы.
+        """
+        with self._lock:
+            if not self._depth:
+                if self._file is None:
+                    self._file = open(self.path, mode='a')
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if not self._depth and fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
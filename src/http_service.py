@@ -0,0 +1,231 @@
+import argparse
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from batch_runner import BatchRunner
+from books_manager import BooksManager
+from metrics import configure, metrics
+
+_decode = json.JSONDecoder().decode
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class BooksService:
+    """
+    HTTP-сервис с JSON API поверх одного общего BooksManager.
+
+    Запросы на чтение выполняются из памяти в пуле потоков, чтобы не останавливать цикл событий.
+    Изменения ставятся в очередь и выполняются одной задачей: накопившиеся изменения объединяются
+    в транзакцию и сохраняются одной записью (group commit), после чего клиенты получают ответы.
+    Каждое изменение выполняется в точке сохранения, поэтому ошибка одного изменения откатывает
+    и отклоняет только его. Сохранение выполняется в отдельном потоке, чтобы не останавливать чтение.
+
+    Маршруты:
+    - GET /books?after_id=0&limit=100 - страница списка книг с ID больше after_id;
+    - GET /books/<id> - одна книга;
+    - GET /search?field=title&query=... - поиск (field: title, author, year или text);
+    - GET /status_counts - количество книг с каждым статусом;
+    - GET /metrics - счетчики и гистограммы операций (см. metrics.Metrics), если метрики включены;
+    - POST /books {"title": ..., "author": ..., "year": ...} - добавление книги;
+    - DELETE /books/<id> - удаление книги;
+    - PUT /books/<id>/status {"status": "Выдана"} - изменение статуса.
+
+    Атрибуты:
+    - books_manager: Экземпляр класса BooksManager.
+    - max_batch: Максимальное количество изменений в одной транзакции.
+    """
+
+    def __init__(self, books_manager: BooksManager, max_batch: int = 1000):
+        self.books_manager = books_manager
+        self.max_batch = max_batch
+        self._runner = BatchRunner(books_manager)
+        self._queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.Server:
+        """
+        Запускает сервер и задачу записи изменений.
+        """
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_loop())
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def stop(self) -> None:
+        """
+        Дожидается записи изменений из очереди и останавливает задачу записи.
+        """
+        await self._queue.join()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+
+    async def _write_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                with self.books_manager.transaction():
+                    results = [self._apply(command) for command, _ in batch]
+                # В режиме отложенной записи сохраняет изменения группы, иначе они уже сохранены
+                await loop.run_in_executor(None, self.books_manager.flush)
+            except Exception as error:
+                print(f"Ошибка при сохранении изменений: {error}")
+                results = [(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)})] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _apply(self, command: dict) -> tuple[HTTPStatus, dict]:
+        if 'id' in command and command['id'] not in self.books_manager.books:
+            return HTTPStatus.NOT_FOUND, {'error': f"Книга с ID {command['id']} не найдена"}
+        try:
+            with self.books_manager.transaction():
+                result = self._runner.commands[command['op']](command)
+        except KeyError as error:
+            return HTTPStatus.BAD_REQUEST, {'error': f"Не указан параметр {error}"}
+        except (ValueError, TypeError) as error:
+            return HTTPStatus.BAD_REQUEST, {'error': str(error)}
+        except Exception as error:
+            print(f"Ошибка при выполнении изменения {command['op']}: {error!r}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)}
+        return (HTTPStatus.CREATED if command['op'] == 'add' else HTTPStatus.OK), result
+
+    @staticmethod
+    async def _read(function: Callable[..., Any], *args) -> Any:
+        # Чтение может ждать блокировку каталога или синхронизацию с другими процессами
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    def _books_page(self, after_id: int, limit: int) -> dict:
+        books = self.books_manager.books_page(after_id, limit)
+        return {'total': len(self.books_manager.books), 'books': [book.to_dict() for book in books]}
+
+    def _status_counts(self) -> dict:
+        return {status.value: count for status, count in self.books_manager.status_counts().items()}
+
+    def _book(self, book_id: int) -> tuple[HTTPStatus, dict]:
+        book = self.books_manager.books.get(book_id)
+        if book is None:
+            return HTTPStatus.NOT_FOUND, {'error': f"Книга с ID {book_id} не найдена"}
+        return HTTPStatus.OK, book.to_dict()
+
+    async def _submit(self, command: dict) -> tuple[HTTPStatus, dict]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((command, future))
+        return await future
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple[HTTPStatus, dict]:
+        """
+        Выполняет запрос и возвращает HTTP-статус и тело ответа.
+        """
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        parts = url.path.strip('/').split('/')
+        try:
+            data = _decode(body.decode('utf-8')) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("Тело запроса должно быть объектом JSON")
+
+            if parts == ['books']:
+                if method == 'GET':
+                    after_id, limit = int(params.get('after_id', 0)), int(params.get('limit', 100))
+                    return HTTPStatus.OK, await self._read(self._books_page, after_id, limit)
+                if method == 'POST':
+                    fields = {name: data[name] for name in ('title', 'author', 'year') if name in data}
+                    return await self._submit({'op': 'add', **fields})
+            elif parts == ['search'] and method == 'GET':
+                command = {'field': params.get('field', 'text'), 'query': params.get('query', ''),
+                           'page': int(params.get('page', 1)), 'page_size': int(params.get('page_size', 20))}
+                return HTTPStatus.OK, await self._read(self._runner.search, command)
+            elif parts == ['status_counts'] and method == 'GET':
+                return HTTPStatus.OK, await self._read(self._status_counts)
+            elif parts == ['metrics'] and method == 'GET':
+                return HTTPStatus.OK, metrics.to_dict()
+            elif len(parts) in (2, 3) and parts[0] == 'books' and parts[1].isdigit():
+                book_id = int(parts[1])
+                if len(parts) == 2 and method == 'GET':
+                    return await self._read(self._book, book_id)
+                if len(parts) == 2 and method == 'DELETE':
+                    return await self._submit({'op': 'remove', 'id': book_id})
+                if parts[2:] == ['status'] and method == 'PUT':
+                    return await self._submit({'op': 'update_status', 'id': book_id, 'status': data.get('status')})
+            else:
+                return HTTPStatus.NOT_FOUND, {'error': f"Путь {url.path} не найден"}
+        except (ValueError, UnicodeDecodeError) as error:
+            return HTTPStatus.BAD_REQUEST, {'error': str(error)}
+        return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"Метод {method} не поддерживается для {url.path}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Обслуживает одно подключение; поддерживает несколько запросов в одном подключении (keep-alive).
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self.dispatch(method, target, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                content = _encode(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(data_file: str = 'books_data.json', host: str = '127.0.0.1', port: int = 8080) -> None:
+    """
+    Запускает сервис и работает до прерывания.
+
+    Изменения дописываются в журнал; сохранением управляет сервис, поэтому включена отложенная запись.
+    Каталог могут одновременно использовать несколько процессов сервиса.
+    """
+    books_manager = BooksManager(data_file, journal=True, write_behind=60, shared=True)
+    service = BooksService(books_manager)
+    server = await service.start(host, port)
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f"Сервер запущен на http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+        books_manager.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="HTTP-сервис каталога книг")
+    parser.add_argument('data_file', nargs='?', default='books_data.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--metrics', help="файл, в который метрики записываются при выходе (.json или Prometheus)")
+    parser.add_argument('--profile', choices=('cpu', 'memory'), help="профилирование cProfile или tracemalloc")
+    args = parser.parse_args()
+    configure(args.metrics, args.profile)
+    try:
+        asyncio.run(serve(args.data_file, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
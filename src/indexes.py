@@ -0,0 +1,242 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+from typing import Iterable
+
+from models import Book, BookStatus
+
+
+class FieldIndex:
+    """
+    Вторичный хеш-индекс по полю книги.
+
+    Хранит соответствие нормализованного значения поля (str(value).lower()) и ID книг с этим значением.
+    ID хранятся в словаре как упорядоченном множестве, поэтому порядок добавления книг сохраняется.
+
+    Атрибуты:
+    - field: Имя индексируемого поля книги.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self._ids: dict[str, dict[int, None]] = {}
+
+    @staticmethod
+    def normalize(value) -> str:
+        return str(value).lower()
+
+    def add(self, book: Book) -> None:
+        key = self.normalize(getattr(book, self.field))
+        self._ids.setdefault(key, {})[book.id] = None
+
+    def discard(self, book: Book) -> None:
+        key = self.normalize(getattr(book, self.field))
+        ids = self._ids.get(key)
+        if ids is None:
+            return
+        ids.pop(book.id, None)
+        if not ids:
+            del self._ids[key]
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+    def get(self, query) -> Iterable[int]:
+        """
+        Возвращает ID книг, у которых значение поля совпадает с запросом без учета регистра.
+        """
+        return self._ids.get(self.normalize(query), {}).keys()
+
+
+class StatusIndex:
+    """
+    Индекс книг по статусу.
+
+    Для каждого статуса BookStatus хранит ID книг с этим статусом в словаре как упорядоченном множестве,
+    поэтому количество книг со статусом - длина множества и не требует перебора книг.
+    Изменение статуса книги переносит ее ID между множествами методом move.
+    """
+
+    field = 'status'
+
+    def __init__(self):
+        self._ids: dict[BookStatus, dict[int, None]] = {status: {} for status in BookStatus}
+
+    def add(self, book: Book) -> None:
+        self._ids[book.status][book.id] = None
+
+    def discard(self, book: Book) -> None:
+        self._ids[book.status].pop(book.id, None)
+
+    def move(self, book_id: int, old_status: BookStatus, new_status: BookStatus) -> None:
+        self._ids[old_status].pop(book_id, None)
+        self._ids[new_status][book_id] = None
+
+    def clear(self) -> None:
+        for ids in self._ids.values():
+            ids.clear()
+
+    def get(self, status: BookStatus) -> Iterable[int]:
+        """
+        Возвращает ID книг со статусом status в порядке, в котором книги его получили.
+        """
+        return self._ids[status].keys()
+
+    def count(self, status: BookStatus) -> int:
+        return len(self._ids[status])
+
+
+class SortedIndex:
+    """
+    Отсортированный индекс по целочисленному полю книги для запросов по диапазону за O(log n + k).
+
+    Хранит составные ключи (значение << ID_BITS) + ID, упорядоченные по значению поля, а при равных
+    значениях - по ID. Для поля id ключ - сам ID. Ключи лежат в отсортированных частях array('q')
+    длиной до 2 * CHUNK_SIZE, поэтому добавление и удаление ключа в любом порядке сдвигают только
+    одну часть, а не весь массив. ID должны быть в диапазоне [0, 2**ID_BITS), значения поля -
+    по модулю меньше 2**VALUE_BITS, чтобы ключ помещался в 64 бита; метод check проверяет это
+    до изменения индекса.
+
+    Атрибуты:
+    - field: Имя индексируемого поля книги.
+    """
+
+    ID_BITS = 40
+    ID_MASK = (1 << ID_BITS) - 1
+    VALUE_BITS = 22
+    CHUNK_SIZE = 1024
+
+    def __init__(self, field: str):
+        self.field = field
+        self.clear()
+
+    def _key(self, value: int, book_id: int) -> int:
+        return value if self.field == 'id' else (value << self.ID_BITS) + book_id
+
+    def check(self, book: Book) -> None:
+        """
+        Проверяет, что ключ книги помещается в индекс, иначе выбрасывает ValueError.
+        """
+        value = getattr(book, self.field)
+        if not isinstance(value, int):
+            return
+        if self.field == 'id':
+            if not 0 <= value <= self.ID_MASK:
+                raise ValueError(f"ID книги должен быть в диапазоне от 0 до {self.ID_MASK}")
+        elif not -(1 << self.VALUE_BITS) < value < 1 << self.VALUE_BITS:
+            raise ValueError(f"Значение поля {self.field} должно быть по модулю меньше {1 << self.VALUE_BITS}")
+
+    def _book_key(self, book: Book) -> int:
+        return self._key(getattr(book, self.field), book.id)
+
+    def add(self, book: Book) -> None:
+        key = self._book_key(book)
+        self._offsets = None
+        maxes = self._maxes
+        if not maxes:
+            self._chunks.append(array('q', (key,)))
+            maxes.append(key)
+            return
+        if key >= maxes[-1]:
+            # Новые ключи обычно больше существующих и дописываются в конец последней части
+            number = len(maxes) - 1
+            chunk = self._chunks[number]
+            chunk.append(key)
+        else:
+            number = bisect_left(maxes, key)
+            chunk = self._chunks[number]
+            insort(chunk, key)
+        maxes[number] = chunk[-1]
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            self._chunks[number:number + 1] = chunk[:self.CHUNK_SIZE], chunk[self.CHUNK_SIZE:]
+            maxes.insert(number, chunk[self.CHUNK_SIZE - 1])
+
+    def discard(self, book: Book) -> None:
+        key = self._book_key(book)
+        number = bisect_left(self._maxes, key)
+        if number == len(self._maxes):
+            return
+        chunk = self._chunks[number]
+        position = bisect_left(chunk, key)
+        if chunk[position] != key:
+            return
+        del chunk[position]
+        if chunk:
+            self._maxes[number] = chunk[-1]
+        else:
+            del self._chunks[number], self._maxes[number]
+        self._offsets = None
+
+    def clear(self) -> None:
+        self._chunks: list[array] = []
+        # Наибольший ключ каждой части для поиска части по ключу
+        self._maxes: list[int] = []
+        # Позиции начала частей; пересчитываются при первом запросе после изменения
+        self._offsets: list[int] | None = None
+
+    def _chunk_offsets(self) -> list[int]:
+        offsets = self._offsets
+        if offsets is None:
+            offsets = [0, *accumulate(map(len, self._chunks))]
+            self._offsets = offsets
+        return offsets
+
+    def _position(self, key: int) -> int:
+        """
+        Возвращает позицию первого ключа не меньше key среди всех ключей индекса.
+        """
+        offsets = self._chunk_offsets()
+        number = bisect_left(self._maxes, key)
+        if number == len(self._maxes):
+            return offsets[-1]
+        return offsets[number] + bisect_left(self._chunks[number], key)
+
+    def _slice(self, start: int, stop: int) -> array:
+        """
+        Возвращает ключи с позициями от start до stop.
+        """
+        keys = array('q')
+        offsets = self._chunk_offsets()
+        number = bisect_right(offsets, start) - 1
+        while start < stop:
+            chunk_start = offsets[number]
+            keys.extend(self._chunks[number][start - chunk_start:stop - chunk_start])
+            start = offsets[number + 1]
+            number += 1
+        return keys
+
+    def _bounds(self, low: int | None, high: int | None) -> tuple[int, int]:
+        start = 0 if low is None else self._position(self._key(low, 0))
+        end = self._chunk_offsets()[-1] if high is None else max(start, self._position(self._key(high + 1, 0)))
+        return start, end
+
+    def count(self, low: int | None = None, high: int | None = None) -> int:
+        """
+        Возвращает количество книг в диапазоне за O(log n), не перебирая их.
+        """
+        start, end = self._bounds(low, high)
+        return max(0, end - start)
+
+    def range(self, low: int | None = None, high: int | None = None, descending: bool = False,
+              offset: int = 0, limit: int | None = None) -> tuple[list[int], int]:
+        """
+        Ищет книги, у которых значение поля находится между low и high включительно.
+
+        Параметры:
+        - low (int | None), high (int | None): Границы диапазона; None - без границы.
+        - descending (bool): Если True, книги упорядочиваются по убыванию значения поля и ID.
+        - offset (int), limit (int | None): Сколько книг пропустить и сколько вернуть.
+
+        Возвращает:
+        - Кортеж из списка ID книг и общего количества книг в диапазоне.
+        """
+        start, end = self._bounds(low, high)
+        total = max(0, end - start)
+        if descending:
+            stop = end - offset
+            keys = self._slice(max(start, stop - limit if limit is not None else start), max(start, stop))
+            keys.reverse()
+        else:
+            first = start + offset
+            keys = self._slice(first, end if limit is None else min(end, first + limit))
+        return [key & self.ID_MASK for key in keys], total
@@ -0,0 +1,98 @@
+import json
+import os
+from typing import Iterator
+
+
+class Journal:
+    """
+    Журнал изменений (write-ahead log) каталога книг.
+
+    Каждое изменение записывается в конец файла одной компактной JSON-строкой,
+    поэтому стоимость записи не зависит от размера каталога.
+
+    Атрибуты:
+    - path: Путь к файлу журнала.
+    - records: Количество записей в журнале.
+    - offset: Позиция в байтах после последней прочитанной или записанной записи.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = 0
+        self.offset = 0
+        self._file = None
+        # Найдена ли при последнем чтении оборванная последняя строка
+        self._torn = False
+
+    def size(self) -> int:
+        """
+        Возвращает размер файла журнала в байтах.
+        """
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def append(self, record: dict) -> None:
+        """
+        Добавляет запись в конец журнала и сбрасывает ее на диск (fsync).
+
+        Оборванная последняя строка, найденная при чтении, сначала обрезается, иначе новая запись
+        склеилась бы с ней и была бы пропущена при следующем чтении как поврежденная.
+        """
+        if self._torn:
+            self.close()
+            os.truncate(self.path, self.offset)
+            self._torn = False
+        if self._file is None:
+            self._file = open(self.path, mode='a', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.records += 1
+        self.offset = os.fstat(self._file.fileno()).st_size
+
+    def replay(self, offset: int = 0) -> Iterator[dict]:
+        """
+        Последовательно возвращает записи журнала, начиная с позиции offset.
+
+        Недописанная последняя строка (оборванная при сбое) пропускается и не сдвигает offset;
+        следующий append обрезает ее. Журнал читается и дописывается под блокировкой хранилища,
+        поэтому такая строка не может быть записью, которую другой процесс еще дописывает.
+        """
+        if not offset:
+            self.records = 0
+        self.offset = offset
+        self._torn = False
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, mode='rb') as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b'\n'):
+                    self._torn = True
+                    break
+                self.offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Ошибка при чтении журнала {self.path}: пропущена поврежденная запись")
+                    continue
+                self.records += 1
+                yield record
+
+    def truncate(self) -> None:
+        """
+        Очищает журнал после того, как его содержимое попало в снимок.
+        """
+        self.close()
+        with open(self.path, mode='w', encoding='utf-8'):
+            pass
+        self.records = 0
+        self.offset = 0
+        self._torn = False
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
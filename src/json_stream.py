@@ -0,0 +1,149 @@
+import codecs
+import json
+import os
+import re
+from typing import Callable, Iterator, BinaryIO
+
+CHUNK_SIZE = 1 << 16
+MAX_ELEMENT_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+# Пробелы и запятые между элементами массива
+_SEPARATORS = re.compile(r'[\s,]*')
+_WHITESPACE = re.compile(r'\s*')
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    return _WHITESPACE.match(buffer, pos).end()
+
+
+def _report_skipped(file: BinaryIO) -> None:
+    print(f"Ошибка при чтении файла {getattr(file, 'name', '')}: пропущен поврежденный фрагмент")
+
+
+def iter_json_array(file: BinaryIO, progress: Callable[[int, int, int], None] | None = None,
+                    recover: bool = False, chunk_size: int = CHUNK_SIZE, offsets: bool = False) -> Iterator:
+    """
+    Потоково разбирает JSON-массив, возвращая элементы по одному.
+
+    В памяти одновременно находится только текущий фрагмент файла, а не весь массив.
+
+    Параметры:
+    - file (BinaryIO): Файл, открытый в двоичном режиме.
+    - progress (Callable[[int, int, int], None] | None): Функция, которая вызывается после чтения
+      каждого фрагмента с количеством прочитанных байт, размером файла и количеством разобранных элементов.
+    - recover (bool): Если True, поврежденные элементы и оборванный конец файла пропускаются,
+      иначе выбрасывается json.JSONDecodeError.
+    - chunk_size (int): Размер читаемого фрагмента в байтах.
+    - offsets (bool): Если True, возвращаются пары (смещение элемента в байтах от начала файла, элемент).
+    """
+    # При восстановлении неверные байты (например, оборванный посреди символа конец файла) заменяются,
+    # и содержащий их элемент пропускается как поврежденный
+    decoder = codecs.getincrementaldecoder('utf-8')('replace' if recover else 'strict')
+    try:
+        total_bytes = os.fstat(file.fileno()).st_size
+    except (AttributeError, OSError):
+        total_bytes = 0
+    read_bytes = 0
+    count = 0
+    buffer = ''
+    pos = 0
+    eof = False
+    # Известное соответствие позиции символа в буфере и смещения в байтах
+    mark_char = 0
+    mark_byte = 0
+
+    def byte_offset(char_pos: int) -> int:
+        nonlocal mark_char, mark_byte
+        mark_byte += len(buffer[mark_char:char_pos].encode('utf-8'))
+        mark_char = char_pos
+        return mark_byte
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, read_bytes, eof, mark_char
+        if eof:
+            return False
+        chunk = file.read(chunk_size)
+        read_bytes += len(chunk)
+        eof = not chunk
+        if offsets:
+            byte_offset(pos)
+            mark_char = 0
+        # Уже разобранная часть буфера отбрасывается
+        try:
+            text = decoder.decode(chunk, final=eof)
+        except UnicodeDecodeError as error:
+            raise json.JSONDecodeError(f"Invalid UTF-8: {error.reason}", buffer, pos) from error
+        buffer = buffer[pos:] + text
+        pos = 0
+        if progress is not None:
+            progress(read_bytes, total_bytes, count)
+        return not eof
+
+    def fail(message: str):
+        raise json.JSONDecodeError(message, buffer, pos)
+
+    # Начало массива
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        if pos < len(buffer) or not read_more():
+            break
+    if pos >= len(buffer) or buffer[pos] != '[':
+        fail("Expecting '['")
+    pos += 1
+
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if pos >= len(buffer):
+            if read_more():
+                continue
+            if recover:
+                _report_skipped(file)
+                return
+            fail("Unexpected end of array")
+
+        if buffer[pos] == ']':
+            return
+
+        try:
+            element, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Элемент мог не поместиться в буфер целиком - дочитываем файл
+            if len(buffer) - pos < MAX_ELEMENT_SIZE and read_more():
+                continue
+            if not recover:
+                raise
+            _report_skipped(file)
+            # Пропускаем поврежденный элемент до начала следующего объекта
+            next_pos = buffer.find('{', pos + 1)
+            while next_pos < 0 and read_more():
+                next_pos = buffer.find('{', pos + 1)
+            if next_pos < 0:
+                return
+            pos = next_pos
+            continue
+
+        count += 1
+        if offsets:
+            yield byte_offset(pos), element
+        else:
+            yield element
+        pos = end
+
+
+def count_key(file: BinaryIO, key: str, chunk_size: int = 1 << 20) -> int:
+    """
+    Считает вхождения ключа key в JSON-файле без его разбора.
+
+    Ищется последовательность `"key":`, как ее записывает json.dump. Внутри строк кавычки
+    экранированы, поэтому такая последовательность встречается только как ключ объекта.
+    """
+    marker = json.dumps(key, ensure_ascii=False).encode('utf-8') + b':'
+    count = 0
+    tail = b''
+    while chunk := file.read(chunk_size):
+        data = tail + chunk
+        count += data.count(marker)
+        # Хвост короче marker, поэтому вхождение на границе частей не считается дважды
+        tail = data[-(len(marker) - 1):]
+    return count
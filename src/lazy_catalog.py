@@ -0,0 +1,202 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator
+
+from file_utils import atomic_write
+from json_stream import iter_json_array
+from models import Book
+
+# Окончание файла индекса: сигнатура, количество книг, последний ID, размер и время изменения файла данных
+INDEX_FOOTER = struct.Struct('<8sqqqq')
+INDEX_MAGIC = b'BOOKIDX1'
+
+_decoder = json.JSONDecoder()
+
+
+def index_path(data_file: str) -> str:
+    return f'{data_file}.idx'
+
+
+def write_index(data_file: str, ids: array, offsets: array, last_book_id: int) -> None:
+    """
+    Записывает индекс ID -> смещение для файла данных.
+
+    ID и смещения хранятся в двоичном виде, отсортированными по ID, а в окончании файла
+    записываются последний ID и размер и время изменения файла данных для проверки актуальности.
+    """
+    stat = os.stat(data_file)
+    with open(index_path(data_file), mode='wb') as file:
+        ids.tofile(file)
+        offsets.tofile(file)
+        file.write(INDEX_FOOTER.pack(INDEX_MAGIC, len(ids), last_book_id, stat.st_size, stat.st_mtime_ns))
+
+
+def read_index(data_file: str) -> tuple[array, array, int] | None:
+    """
+    Читает индекс файла данных.
+
+    Возвращает:
+    - Кортеж из массивов ID и смещений и последнего ID или None, если индекса нет или он устарел.
+    """
+    try:
+        with open(index_path(data_file), mode='rb') as file:
+            file.seek(-INDEX_FOOTER.size, os.SEEK_END)
+            magic, count, last_book_id, data_size, data_mtime = INDEX_FOOTER.unpack(file.read(INDEX_FOOTER.size))
+            stat = os.stat(data_file)
+            if magic != INDEX_MAGIC or (data_size, data_mtime) != (stat.st_size, stat.st_mtime_ns):
+                return None
+            file.seek(0)
+            ids = array('q')
+            offsets = array('q')
+            ids.fromfile(file, count)
+            offsets.fromfile(file, count)
+    except (OSError, EOFError, struct.error):
+        return None
+    return ids, offsets, last_book_id
+
+
+def build_index(data_file: str) -> tuple[array, array, int]:
+    """
+    Строит индекс, один раз потоково просматривая файл данных, и сохраняет его рядом с файлом.
+    """
+    pairs = []
+    with open(data_file, mode='rb') as file:
+        for offset, book in iter_json_array(file, offsets=True):
+            pairs.append((book['id'], offset))
+    pairs.sort()
+    ids = array('q', (book_id for book_id, _ in pairs))
+    offsets = array('q', (offset for _, offset in pairs))
+    last_book_id = ids[-1] if ids else 0
+    write_index(data_file, ids, offsets, last_book_id)
+    return ids, offsets, last_book_id
+
+
+def save_with_index(data_file: str, books: Iterable[Book], last_book_id: int) -> None:
+    """
+    Сохраняет книги в файл данных в прежнем формате JSON и сразу записывает индекс.
+
+    Данные пишутся во временный файл, который затем атомарно заменяет файл данных,
+    поэтому открытые отображения старого файла в память остаются корректными.
+    """
+    pairs = []
+    with atomic_write(data_file, mode='wb') as file:
+        file.write(b'[')
+        for book in books:
+            file.write(b',\n    ' if pairs else b'\n    ')
+            pairs.append((book.id, file.tell()))
+            text = json.dumps(book.to_dict(), ensure_ascii=False, indent=4).replace('\n', '\n    ')
+            file.write(text.encode('utf-8'))
+        file.write(b'\n]' if pairs else b']')
+    pairs.sort()
+    write_index(data_file, array('q', (book_id for book_id, _ in pairs)),
+                array('q', (offset for _, offset in pairs)), last_book_id)
+
+
+class LazyBooks(MutableMapping):
+    """
+    Ленивое представление каталога поверх отображенного в память файла данных.
+
+    При открытии читается только индекс ID -> смещение; объект Book создается при первом
+    обращении к книге и затем кешируется. Добавленные и удаленные книги хранятся поверх
+    исходного файла до следующего сохранения.
+
+    Атрибуты:
+    - data_file: Путь к файлу данных.
+    - last_book_id: Наибольший ID книги, известный из окончания индекса и добавленных книг.
+    """
+
+    def __init__(self, data_file: str):
+        self.data_file = data_file
+        self._map = None
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Заново открывает файл данных и его индекс, сбрасывая изменения поверх файла.
+        """
+        self.close()
+        index = read_index(self.data_file)
+        if index is None:
+            index = build_index(self.data_file)
+        self._ids, self._offsets, self._last_book_id = index
+        if os.path.getsize(self.data_file):
+            with open(self.data_file, mode='rb') as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._cache: dict[int, Book] = {}
+        self._added: dict[int, None] = {}
+        self._removed: set[int] = set()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    @property
+    def last_book_id(self) -> int:
+        return max(self._last_book_id, max(self._added, default=0))
+
+    def _find(self, book_id) -> int:
+        row = bisect_left(self._ids, book_id)
+        if row < len(self._ids) and self._ids[row] == book_id:
+            return row
+        return -1
+
+    def _in_file(self, book_id) -> bool:
+        return book_id not in self._removed and self._find(book_id) >= 0
+
+    def _materialize(self, offset: int) -> Book:
+        size = 512
+        while True:
+            text = self._map[offset:offset + size].decode('utf-8', errors='ignore')
+            try:
+                return Book.from_dict(_decoder.raw_decode(text)[0])
+            except json.JSONDecodeError:
+                if offset + size >= len(self._map):
+                    raise
+                size *= 4
+
+    def __len__(self) -> int:
+        return len(self._ids) - len(self._removed) + len(self._added)
+
+    def __iter__(self) -> Iterator[int]:
+        for book_id in self._ids:
+            if book_id not in self._removed:
+                yield book_id
+        yield from self._added
+
+    def __contains__(self, book_id) -> bool:
+        return book_id in self._cache or self._in_file(book_id)
+
+    def __getitem__(self, book_id: int) -> Book:
+        book = self._cache.get(book_id)
+        if book is not None:
+            return book
+        if book_id in self._removed:
+            raise KeyError(book_id)
+        row = self._find(book_id)
+        if row < 0:
+            raise KeyError(book_id)
+        book = self._cache[book_id] = self._materialize(self._offsets[row])
+        return book
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        if book_id not in self:
+            if book_id in self._removed:
+                self._removed.discard(book_id)
+            else:
+                self._added[book_id] = None
+        self._cache[book_id] = book
+
+    def __delitem__(self, book_id: int) -> None:
+        if book_id not in self:
+            raise KeyError(book_id)
+        self._cache.pop(book_id, None)
+        if book_id in self._added:
+            del self._added[book_id]
+        else:
+            self._removed.add(book_id)
@@ -1,19 +1,139 @@
+import argparse
 import os
 import sys
-from io import StringIO
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
-from books_handler import BooksHandler
-from books_manager import BooksManager
+# Модули каталога импортируются внутри функций: каждая команда загружает только то, что ей нужно,
+# поэтому короткие команды запускаются без импорта меню, индексов и пулов процессов
 
 
+def main(file_path='books_data.json', shared=False):
+    """
+    Запускает меню. При shared=True файл данных может быть одновременно открыт в других процессах
+    (см. BooksManager, параметр shared); рядом с ним тогда остается файл блокировки `<file_path>.lock`.
+    """
+    from books_handler import BooksHandler
+    from books_manager import BooksManager
 
+    books_manager = BooksManager(file_path, shared=shared)
+    try:
+        books_handler = BooksHandler(books_manager)
+        books_handler.run()
+    finally:
+        books_manager.close()
 
-def main(file_path='books_data.json'):
-    books_manager = BooksManager(file_path)
-    books_handler = BooksHandler(books_manager)
-    books_handler.run()
+
+def run_batch(commands_file='-', file_path='books_data.json', batch_size=10000, shared=False):
+    """
+    Выполняет команды в формате JSON Lines из файла или стандартного ввода ('-')
+    и выводит результаты в стандартный вывод.
+
+    Изменения дописываются в журнал, а в конце сворачиваются в файл данных.
+    """
+    from batch_runner import BatchRunner
+    from books_manager import BooksManager
+
+    # Индексы строятся только для первой команды поиска, поэтому добавления их не обновляют
+    books_manager = BooksManager(file_path, journal=True, shared=shared, lazy_indexes=True)
+    try:
+        runner = BatchRunner(books_manager, batch_size)
+        if commands_file == '-':
+            return runner.run(sys.stdin, sys.stdout)
+        with open(commands_file, encoding='utf-8') as input_file:
+            return runner.run(input_file, sys.stdout)
+    finally:
+        books_manager.compact()
+        books_manager.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Каталог книг. Без команды запускается меню.",
+        epilog="Пакетный режим: main.py --batch <файл команд JSON Lines | -> [файл данных]")
+    parser.add_argument('--file', '-f', default='books_data.json', help="файл данных (по умолчанию books_data.json)")
+    parser.add_argument('--shared', action='store_true',
+                        help="файл данных одновременно используют несколько процессов (блокировка <файл>.lock)")
+    parser.add_argument('--batch', nargs='+', metavar='ARG', help=argparse.SUPPRESS)
+    parser.add_argument('--metrics', help="файл, в который метрики записываются при выходе (.json или Prometheus)")
+    parser.add_argument('--profile', choices=('cpu', 'memory'), help="профилирование cProfile или tracemalloc")
+    subparsers = parser.add_subparsers(dest='command', metavar='команда')
+
+    search = subparsers.add_parser('search', help="поиск книг по точному значению поля")
+    fields = search.add_mutually_exclusive_group(required=True)
+    for field, help_text in (('id', "ID"), ('title', "название"), ('author', "автор"), ('year', "год издания"),
+                             ('status', "статус: available, issued, В наличии или Выдана")):
+        fields.add_argument(f'--{field}', help=help_text)
+
+    add = subparsers.add_parser('add', help="добавление книги, выводит ее ID")
+    add.add_argument('title')
+    add.add_argument('author')
+    add.add_argument('year', type=int)
+
+    status = subparsers.add_parser('status', help="изменение статуса книги")
+    status.add_argument('id', type=int)
+    status.add_argument('status', help="available, issued, В наличии или Выдана")
+
+    remove = subparsers.add_parser('remove', help="удаление книги")
+    remove.add_argument('id', type=int)
+
+    count = subparsers.add_parser('count', help="количество книг без загрузки каталога, если хранилище это позволяет")
+    count.add_argument('--status', help="считать только книги с этим статусом")
+    return parser
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """
+    Выполняет команду командной строки и возвращает код возврата.
+    """
+    import commands
+
+    try:
+        if args.command == 'search':
+            field = next(field for field in ('id', 'title', 'author', 'year', 'status')
+                         if getattr(args, field) is not None)
+            found_books = commands.search_books(args.file, field, getattr(args, field))
+            if found_books:
+                print('\n'.join(map(str, found_books)))
+            else:
+                print("По вашему запросу книги не найдены", file=sys.stderr)
+            return 0
+        if args.command == 'count':
+            status = commands.parse_status(args.status) if args.status is not None else None
+            print(commands.count_books(args.file, status))
+        elif args.command == 'add':
+            print(commands.add_book(args.file, args.title, args.author, args.year, args.shared))
+        elif args.command == 'status':
+            new_status = commands.parse_status(args.status)
+            commands.update_status(args.file, args.id, new_status, args.shared)
+            print(f"Статус книги с ID {args.id} обновлен на {new_status.value}")
+        elif args.command == 'remove':
+            commands.remove_book(args.file, args.id, args.shared)
+            print(f"Книга с ID={args.id} успешно удалена")
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    return 0
+
+
+def cli(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # В argparse нет nargs "от 1 до 2", поэтому количество аргументов --batch проверяется здесь
+    if args.batch is not None and len(args.batch) > 2:
+        parser.error("--batch принимает файл команд и, необязательно, файл данных")
+    if args.metrics or args.profile:
+        from metrics import configure
+        configure(args.metrics, args.profile)
+    if args.batch:
+        # Файл данных можно задать вторым аргументом --batch или параметром --file
+        commands_file, file_path = args.batch[0], args.batch[1] if len(args.batch) > 1 else args.file
+        run_batch(commands_file, file_path, shared=args.shared)
+        return 0
+    if args.command is None:
+        main(args.file, args.shared)
+        return 0
+    return run_command(args)
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(cli())
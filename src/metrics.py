@@ -0,0 +1,187 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable
+
+# Границы интервалов гистограмм (верхние, включительно), как у гистограмм Prometheus
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+SIZE_BUCKETS = tuple(1 << shift for shift in range(10, 32, 2))
+COUNT_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+PROFILE_MODES = ('cpu', 'memory')
+PROFILE_OUTPUTS = {'cpu': 'books.prof', 'memory': 'books_memory.txt'}
+MEMORY_TOP = 30
+
+
+class Histogram:
+    """
+    Гистограмма значений с фиксированными границами интервалов: количество значений в каждом
+    интервале, сумма и общее количество значений.
+    """
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        return {
+            'buckets': dict(zip(map(str, self.buckets), self.counts)) | {'+Inf': self.counts[-1]},
+            'sum': self.sum,
+            'count': self.count,
+        }
+
+
+class Metrics:
+    """
+    Счетчики и гистограммы горячих операций каталога.
+
+    Выключенные метрики ничего не записывают: increment и observe сразу возвращаются, а обертка
+    timed только проверяет флаг enabled и вызывает функцию.
+
+    Метрики выводятся в JSON (to_dict) или в текстовом формате Prometheus (to_prometheus);
+    dump записывает их в файл, формат выбирается по расширению (.json - JSON, иначе Prometheus).
+    """
+
+    def __init__(self, enabled: bool = False, prefix: str = 'books_'):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._counters: dict[str, int] = {}
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """
+        Декоратор: записывает время выполнения функции в гистограмму `<name>_seconds`, а исключения -
+        в счетчик `<name>_errors`.
+        """
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                except Exception:
+                    self.increment(f'{name}_errors')
+                    raise
+                finally:
+                    self.observe(f'{name}_seconds', time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {name: histogram.to_dict() for name, histogram in self._histograms.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, value in sorted(self._counters.items()):
+                lines += [f'# TYPE {self.prefix}{name}_total counter', f'{self.prefix}{name}_total {value}']
+            for name, histogram in sorted(self._histograms.items()):
+                full_name = f'{self.prefix}{name}'
+                lines.append(f'# TYPE {full_name} histogram')
+                cumulative = 0
+                for bound, count in zip((*map(str, histogram.buckets), '+Inf'), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{full_name}_bucket{{le="{bound}"}} {cumulative}')
+                lines += [f'{full_name}_sum {histogram.sum}', f'{full_name}_count {histogram.count}']
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str) -> None:
+        """
+        Записывает метрики в файл path: в JSON для расширения .json, иначе в формате Prometheus.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            if path.endswith('.json'):
+                json.dump(self.to_dict(), file, indent=4)
+            else:
+                file.write(self.to_prometheus())
+
+
+metrics = Metrics()
+
+
+def _start_profile(mode: str, output: str) -> None:
+    """
+    Запускает профилирование и регистрирует сохранение результата при выходе из программы.
+    """
+    if mode == 'cpu':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def finish():
+            profiler.disable()
+            profiler.dump_stats(output)
+    else:
+        import tracemalloc
+        tracemalloc.start()
+
+        def finish():
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            with open(output, 'w', encoding='utf-8') as file:
+                for statistic in snapshot.statistics('lineno')[:MEMORY_TOP]:
+                    file.write(f'{statistic}\n')
+    atexit.register(finish)
+    print(f"Профилирование ({mode}) будет сохранено в {output}", file=sys.stderr)
+
+
+def configure(metrics_file: str | None = None, profile: str | None = None, profile_file: str | None = None) -> None:
+    """
+    Включает метрики и профилирование.
+
+    Параметры:
+    - metrics_file (str | None): Файл, в который метрики записываются при выходе (см. Metrics.dump).
+    - profile (str | None): 'cpu' - профилирование cProfile (файл для pstats), 'memory' - самые
+      крупные места выделения памяти по данным tracemalloc.
+    - profile_file (str | None): Файл результата профилирования, по умолчанию из PROFILE_OUTPUTS.
+    """
+    if profile is not None and profile not in PROFILE_MODES:
+        raise ValueError(f"Неизвестный режим профилирования {profile}, доступны: {', '.join(PROFILE_MODES)}")
+    if metrics_file:
+        metrics.enabled = True
+        atexit.register(metrics.dump, metrics_file)
+    if profile:
+        _start_profile(profile, profile_file or PROFILE_OUTPUTS[profile])
+
+
+# Переменные окружения включают метрики и профилирование для любой точки входа
+configure(os.environ.get('BOOKS_METRICS'), os.environ.get('BOOKS_PROFILE') or None,
+          os.environ.get('BOOKS_PROFILE_FILE'))
@@ -0,0 +1,39 @@
+import os
+import sys
+
+from storage import open_storage
+
+
+def migrate(source: str, target: str) -> int:
+    """
+    Переносит каталог из одного хранилища в другое, например из JSON-файла в базу SQLite.
+
+    Хранилища выбираются по расширениям файлов. Содержимое target полностью заменяется.
+
+    Параметры:
+    - source (str): Путь к исходному файлу каталога.
+    - target (str): Путь к файлу, в который переносится каталог.
+
+    Возвращает:
+    - Количество перенесенных книг.
+    """
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Файл {source} не найден")
+
+    source_storage = open_storage(source)
+    target_storage = open_storage(target)
+    try:
+        books = source_storage.load()
+        target_storage.save(books.values())
+        return len(books)
+    finally:
+        source_storage.close()
+        target_storage.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("Использование: python migrate.py <исходный файл> <новый файл>")
+        sys.exit(1)
+    count = migrate(sys.argv[1], sys.argv[2])
+    print(f"Перенесено книг: {count}")
@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import Enum
 
 
@@ -22,6 +23,8 @@ class Book:
     - year: Год издания книги.
     - status: Статус книги (BookStatus).
     """
+    __slots__ = ('id', 'title', 'author', 'year', 'status')
+
     def __init__(self, id: int, title: str, author: str, year: int, status: BookStatus = BookStatus.AVAILABLE) -> object:
         self.id = id
         self.title = title
@@ -49,6 +52,33 @@ class Book:
         )
 
 
+    def __eq__(self, other):
+        if not isinstance(other, Book):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        # Статус книги меняется, поэтому хеш считается только по ID: равные книги имеют равные ID
+        return hash(self.id)
+
     def __str__(self):
         return f'ID: {self.id}, Название: {self.title}, Автор:{self.author}, Год издания: {self.year} , Статус: {self.status.value}'
 
+
+def is_valid_year(year: int) -> bool:
+    """
+    Проверяет, что год издания новой книги находится в диапазоне от 1 до текущего года.
+    """
+    return 1 <= year <= datetime.now().year
+
+
+def new_book(title: str, author: str, year: int) -> Book:
+    """
+    Создает новую книгу (без ID) из введенных пользователем данных.
+
+    Название и автор приводятся к виду str.title() без пробелов по краям, год издания проверяется
+    функцией is_valid_year. Меню (BooksHandler) и команда add командной строки создают книги только так.
+    """
+    if not is_valid_year(year):
+        raise ValueError(f"Год издания должен быть числом от 1 до {datetime.now().year}")
+    return Book(None, title.title().strip(), author.title().strip(), year, BookStatus.AVAILABLE)
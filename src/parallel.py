@@ -0,0 +1,273 @@
+import json
+import mmap
+import threading
+from collections.abc import Mapping
+from itertools import repeat
+from typing import TYPE_CHECKING, Iterable, Protocol
+
+from models import Book, BookStatus
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from multiprocessing.context import BaseContext
+    from multiprocessing.process import BaseProcess
+
+# Меньшие каталоги обрабатываются в одном процессе: запуск процессов и передача результатов
+# стоят дороже, чем выигрыш от параллельной работы
+PARALLEL_LOAD_MIN_BYTES = 32 << 20
+PARALLEL_SCAN_MIN_BOOKS = 200_000
+# Начало книги в файле данных, который сохраняет JsonStorage (json.dump с indent=4).
+# Внутри строк перевод строки экранирован, поэтому эта последовательность - всегда начало объекта.
+RECORD_START = b'\n    {'
+
+_STATUSES = {status.value: status for status in BookStatus}
+
+
+class Matcher(Protocol):
+    def matches(self, book: Book) -> bool: ...
+
+
+class FieldEquals:
+    """
+    Условие BooksManager.search_books для перебора: строковое значение поля совпадает с запросом
+    без учета регистра.
+    """
+
+    def __init__(self, field: str, query: str):
+        self.field = field
+        self.query = query.lower()
+
+    def matches(self, book: Book) -> bool:
+        return str(getattr(book, self.field)).lower() == self.query
+
+
+def process_context() -> 'BaseContext':
+    """
+    Возвращает способ запуска процессов пула: forkserver или, где его нет, spawn.
+
+    fork не используется: процесс может уже выполнять другие потоки (фоновую запись, HTTP-сервис),
+    и дочерний процесс, созданный fork, унаследует захваченные ими блокировки.
+    """
+    import multiprocessing
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _parse_shard(path: str, start: int, end: int) -> list[tuple]:
+    with open(path, mode='rb') as file:
+        file.seek(start)
+        data = file.read(end - start).strip().strip(b',')
+    return [(book['id'], book['title'], book['author'], book['year'], book['status'])
+            for book in json.loads(b'[' + data + b']')]
+
+
+def _shard_bounds(path: str, workers: int) -> list[int] | None:
+    """
+    Делит массив книг в файле на workers частей по границам книг.
+
+    Возвращает:
+    - Смещения границ частей или None, если файл нельзя разделить (пустой или записан не JsonStorage).
+    """
+    with open(path, mode='rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start, end = data.find(b'['), data.rfind(b']')
+        if start < 0 or end < start:
+            return None
+        bounds = [start + 1]
+        for shard in range(1, workers):
+            position = data.find(RECORD_START, max(bounds[-1] + 1, len(data) * shard // workers), end)
+            if position < 0:
+                break
+            bounds.append(position)
+        bounds.append(end)
+    return bounds if len(bounds) > 2 else None
+
+
+def load_parallel(path: str, workers: int) -> list[Book] | None:
+    """
+    Загружает книги из JSON-файла данных, разбирая его части в workers процессах.
+
+    Процессы возвращают книги кортежами, которые передаются между процессами быстрее объектов Book,
+    а объекты создаются в родителе в порядке следования книг в файле.
+
+    Возвращает:
+    - Список книг или None, если файл нельзя разделить на части.
+    """
+    bounds = _shard_bounds(path, workers)
+    if bounds is None:
+        return None
+    # Пулы процессов импортируются только при использовании: импорт заметно замедляет запуск программы
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(min(workers, len(bounds) - 1), mp_context=process_context()) as executor:
+        shards = executor.map(_parse_shard, repeat(path), bounds[:-1], bounds[1:])
+        return [Book(book_id, title, author, year, _STATUSES[status])
+                for shard in shards for book_id, title, author, year, status in shard]
+
+
+def _book_row(book: Book) -> tuple:
+    return book.id, book.title, book.author, book.year, book.status.value
+
+
+def _scan_worker(connection: 'Connection', last: bool) -> None:
+    """
+    Цикл процесса перебора: хранит свою часть каталога и выполняет команды родителя.
+
+    Команды:
+    - ('load', rows): заменить часть каталога книгами из кортежей rows.
+    - ('scan', changes, matchers): применить изменения и вернуть ID подходящих книг в порядке части.
+      Изменение ('put', row) заменяет книгу на месте, если она есть в части, а ('add', row) добавляет
+      новую книгу в последний процесс: в словаре книг родителя новые ключи тоже попадают в конец.
+      Изменение ('delete', book_id) удаляет книгу, если она есть в части.
+    - None: завершить работу.
+    """
+    books: dict[int, Book] = {}
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        if message[0] == 'load':
+            books = {row[0]: Book(*row[:4], _STATUSES[row[4]]) for row in message[1]}
+            continue
+        _, changes, matchers = message
+        try:
+            for operation, value in changes:
+                if operation == 'delete':
+                    books.pop(value, None)
+                elif value[0] in books or operation == 'add' and last:
+                    books[value[0]] = Book(*value[:4], _STATUSES[value[4]])
+            result = [book_id for book_id, book in books.items()
+                      if all(matcher.matches(book) for matcher in matchers)]
+        except Exception as error:
+            connection.send((False, error))
+        else:
+            connection.send((True, result))
+    connection.close()
+
+
+class ParallelScanner:
+    """
+    Параллельный перебор книг в пуле процессов.
+
+    Процессы запускаются через forkserver или spawn (см. process_context).
+    Каждый процесс один раз получает свою часть каталога, а дальше пул используется повторно:
+    изменения книг (put и delete, см. BooksManager._store_book) накапливаются и передаются процессам вместе
+    со следующим перебором. Если изменений больше, чем книг в последнем снимке, или каталог
+    заменен целиком (reset), процессы получают новый снимок. Обратно передаются только ID найденных книг.
+
+    Пул создается, только если BooksManager открыт с workers > 1: выигрыш есть лишь при свободных ядрах
+    и проверяется бенчмарком benchmarks/bench_parallel.py на целевой машине.
+
+    Атрибуты:
+    - workers: Количество процессов.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._processes: list['BaseProcess'] = []
+        self._connections: list['Connection'] = []
+        self._changes: list[tuple] = []
+        self._loaded = 0
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        context = process_context()
+        for number in range(self.workers):
+            connection, child_connection = context.Pipe()
+            process = context.Process(target=_scan_worker, args=(child_connection, number == self.workers - 1),
+                                      name=f'books-scan-{number}', daemon=True)
+            process.start()
+            child_connection.close()
+            self._processes.append(process)
+            self._connections.append(connection)
+
+    def _load(self, books: Mapping[int, Book]) -> None:
+        """
+        Делит книги на части по порядку и отправляет каждому процессу его часть.
+        """
+        rows = [_book_row(book) for book in books.values()]
+        bounds = [len(rows) * part // self.workers for part in range(self.workers + 1)]
+        for connection, start, end in zip(self._connections, bounds, bounds[1:]):
+            connection.send(('load', rows[start:end]))
+        self._loaded = len(rows)
+        self._changes = []
+        self._stale = False
+
+    def put(self, book: Book, new: bool) -> None:
+        """
+        Отмечает, что книга добавлена в каталог (new=True) или заменена (books[book.id] = book).
+        """
+        if self._stale:
+            return
+        self._changes.append(('add' if new else 'put', _book_row(book)))
+        self._check_changes()
+
+    def delete(self, book_id: int) -> None:
+        """
+        Отмечает, что книга удалена из каталога.
+        """
+        if self._stale:
+            return
+        self._changes.append(('delete', book_id))
+        self._check_changes()
+
+    def _check_changes(self) -> None:
+        # Длинный список изменений дороже нового снимка
+        if len(self._changes) > max(self._loaded, 1000):
+            self.reset()
+
+    def reset(self) -> None:
+        """
+        Отмечает, что каталог заменен целиком: при следующем переборе процессы получат новый снимок.
+        """
+        self._stale = True
+        self._changes = []
+
+    def scan(self, books: Mapping[int, Book], matchers: Iterable[Matcher]) -> list[Book] | None:
+        """
+        Возвращает книги, подходящие под все условия, в порядке books.
+
+        Возвращает None, если каталог меньше PARALLEL_SCAN_MIN_BOOKS: тогда книги перебирает вызывающий код.
+        """
+        if len(books) < PARALLEL_SCAN_MIN_BOOKS:
+            return None
+        matchers = list(matchers)
+        with self._lock:
+            try:
+                if not self._processes:
+                    self._start()
+                    self._stale = True
+                if self._stale:
+                    self._load(books)
+                changes, self._changes = self._changes, []
+                for connection in self._connections:
+                    connection.send(('scan', changes, matchers))
+                results = [connection.recv() for connection in self._connections]
+            except (OSError, EOFError):
+                # Процесс пула завершился: при следующем переборе пул запускается заново
+                self._close()
+                raise
+        found_books = []
+        for success, result in results:
+            if not success:
+                raise result
+            found_books.extend(books[book_id] for book_id in result)
+        return found_books
+
+    def _close(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(5)
+            if process.is_alive():
+                process.kill()
+        self._processes = []
+        self._connections = []
+        self.reset()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
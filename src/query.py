@@ -0,0 +1,213 @@
+from collections.abc import Mapping
+from typing import Callable, Iterable
+
+from indexes import FieldIndex
+from models import Book, BookStatus
+from text_index import TextIndex
+
+
+class Predicate:
+    """
+    Условие на поле книги для составного запроса BooksManager.query.
+
+    Виды условий (operator):
+    - 'eq': значение поля совпадает с value без учета регистра, как в BooksManager.search_books.
+      Для поля status value - BookStatus или его значение.
+    - 'range': значение поля id или year находится между value и high включительно; None - без границы.
+    - 'prefix': каждое слово value - начало какого-либо слова поля title или author.
+
+    Условия удобнее создавать методами eq, range, prefix и status.
+    """
+
+    OPERATORS = ('eq', 'range', 'prefix')
+    RANGE_FIELDS = ('id', 'year')
+    PREFIX_FIELDS = ('title', 'author')
+
+    def __init__(self, field: str, operator: str, value=None, high: int | None = None):
+        if field not in Book.__slots__:
+            raise ValueError(f"Неизвестное поле {field}")
+        if operator not in self.OPERATORS:
+            raise ValueError(f"Неизвестный вид условия {operator}")
+        if operator == 'range' and field not in self.RANGE_FIELDS:
+            raise ValueError(f"Поиск по диапазону не поддерживается для поля {field}")
+        if operator == 'prefix' and field not in self.PREFIX_FIELDS:
+            raise ValueError(f"Поиск по началу слов не поддерживается для поля {field}")
+        if operator == 'eq' and field == 'status':
+            value = BookStatus(value)
+        self.field = field
+        self.operator = operator
+        self.value = value
+        self.high = high
+        self._normalized = FieldIndex.normalize(value) if operator == 'eq' else None
+        self._tokens = TextIndex.tokenize(value) if operator == 'prefix' else None
+
+    @classmethod
+    def eq(cls, field: str, value) -> 'Predicate':
+        return cls(field, 'eq', value)
+
+    @classmethod
+    def range(cls, field: str, low: int | None = None, high: int | None = None) -> 'Predicate':
+        return cls(field, 'range', low, high)
+
+    @classmethod
+    def prefix(cls, field: str, value: str) -> 'Predicate':
+        return cls(field, 'prefix', value)
+
+    @classmethod
+    def status(cls, status: BookStatus | str) -> 'Predicate':
+        return cls('status', 'eq', status)
+
+    def matches(self, book: Book) -> bool:
+        value = getattr(book, self.field)
+        if self.operator == 'range':
+            return (self.value is None or value >= self.value) and (self.high is None or value <= self.high)
+        if self.operator == 'prefix':
+            words = TextIndex.tokenize(value)
+            return all(any(word.startswith(token) for word in words) for token in self._tokens)
+        if self.field == 'status':
+            return value == self.value
+        return FieldIndex.normalize(value) == self._normalized
+
+    def __str__(self):
+        if self.operator == 'range':
+            if self.value is not None and self.high is not None:
+                return f"{self.value} <= {self.field} <= {self.high}"
+            if self.value is not None:
+                return f"{self.field} >= {self.value}"
+            if self.high is not None:
+                return f"{self.field} <= {self.high}"
+            return f"{self.field} - любое значение"
+        if self.operator == 'prefix':
+            return f"слова {self.field} начинаются с {self.value!r}"
+        value = self.value.value if self.field == 'status' else self.value
+        return f"{self.field} = {value!r}"
+
+
+class IndexAccess:
+    """
+    Способ получить ID книг, подходящих под условие, по индексу.
+
+    Атрибуты:
+    - name: Название индекса для плана запроса.
+    - estimate: Оценка количества книг сверху.
+    - fetch: Функция, возвращающая ID книг.
+    - exact: Если False, индекс возвращает лишние книги и условие нужно проверить для каждой книги.
+    """
+
+    def __init__(self, name: str, estimate: int, fetch: Callable[[], Iterable[int]], exact: bool = True):
+        self.name = name
+        self.estimate = estimate
+        self.fetch = fetch
+        self.exact = exact
+
+
+class PlanStep:
+    """
+    Шаг плана запроса: 'storage' - запрос выполняет хранилище, 'index' - ID книг берутся из индекса,
+    'intersect' - пересекаются с ID из индекса, 'scan' - перебираются все книги,
+    'filter' - условие проверяется для каждой книги.
+    """
+
+    LABELS = {
+        'storage': 'хранилище',
+        'index': 'индекс',
+        'intersect': 'пересечение с индексом',
+        'scan': 'перебор всех книг',
+        'filter': 'проверка',
+    }
+
+    def __init__(self, access: str, description: str, estimate: int | None = None):
+        self.access = access
+        self.description = description
+        self.estimate = estimate
+
+    def __str__(self):
+        text = f"{self.LABELS[self.access]}: {self.description}" if self.description else self.LABELS[self.access]
+        return text if self.estimate is None else f"{text} (~{self.estimate} книг)"
+
+
+class QueryPlan:
+    """
+    План составного запроса, который возвращает BooksManager.explain; str(plan) - шаги плана по строкам.
+
+    Атрибуты:
+    - steps: Шаги плана по порядку выполнения.
+    - indexes: Индексы, ID книг из которых пересекаются, начиная с самого избирательного.
+    - filters: Условия, которые проверяются для каждой книги-кандидата.
+    """
+
+    def __init__(self, steps: list[PlanStep], indexes: Iterable[IndexAccess] = (),
+                 filters: Iterable[Predicate] = ()):
+        self.steps = steps
+        self.indexes = list(indexes)
+        self.filters = list(filters)
+
+    def execute(self, books: Mapping[int, Book]) -> list[Book]:
+        """
+        Выполняет план над книгами и возвращает подходящие книги по возрастанию ID.
+        """
+        if self.indexes:
+            book_ids = None
+            for index_access in self.indexes:
+                if book_ids is None:
+                    book_ids = set(index_access.fetch())
+                else:
+                    book_ids.intersection_update(index_access.fetch())
+                if not book_ids:
+                    return []
+            candidates = (books[book_id] for book_id in sorted(book_ids))
+        else:
+            candidates = books.values()
+        found_books = [book for book in candidates if all(predicate.matches(book) for predicate in self.filters)]
+        if not self.indexes:
+            found_books.sort(key=lambda book: book.id)
+        return found_books
+
+    def __str__(self):
+        return '\n'.join(f"{number}. {step}" for number, step in enumerate(self.steps, 1))
+
+
+# Индекс пересекается с кандидатами, только если он не намного больше их: иначе дешевле проверить
+# условие для каждого кандидата, чем перебрать все ID индекса
+INTERSECT_RATIO = 4
+
+
+def plan_query(predicates: Iterable[Predicate], index_access: Callable[[Predicate], IndexAccess | None],
+               total: int) -> QueryPlan:
+    """
+    Строит план составного запроса по оценкам избирательности индексов.
+
+    Кандидаты берутся из самого избирательного индекса и пересекаются с остальными от меньшего к большему,
+    пока индекс не больше кандидатов в INTERSECT_RATIO раз. Остальные условия и условия без индекса
+    проверяются для каждого кандидата. Если ни один индекс не сужает выборку, перебираются все книги.
+
+    Параметры:
+    - predicates: Условия запроса.
+    - index_access: Функция, возвращающая для условия способ доступа по индексу или None.
+    - total: Количество книг в каталоге.
+    """
+    accessible, filters = [], []
+    for predicate in predicates:
+        access = index_access(predicate)
+        if access is None:
+            filters.append(predicate)
+        else:
+            accessible.append((access, predicate))
+    accessible.sort(key=lambda item: item[0].estimate)
+
+    steps, indexes, index_filters = [], [], []
+    estimate = total
+    for access, predicate in accessible:
+        if access.estimate >= total or (indexes and access.estimate > estimate * INTERSECT_RATIO):
+            filters.append(predicate)
+            continue
+        estimate = min(estimate, access.estimate)
+        steps.append(PlanStep('intersect' if indexes else 'index', f"{access.name}, {predicate}", estimate))
+        indexes.append(access)
+        if not access.exact:
+            index_filters.append(predicate)
+    if not indexes:
+        steps.append(PlanStep('scan', '', total))
+    filters = index_filters + filters
+    steps.extend(PlanStep('filter', str(predicate)) for predicate in filters)
+    return QueryPlan(steps, indexes, filters)
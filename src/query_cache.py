@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from indexes import FieldIndex
+from models import Book
+
+
+class QueryCache:
+    """
+    Ограниченный LRU-кеш результатов поиска BooksManager.search_books.
+
+    Ключ - пара (поле, нормализованный запрос). Результат поиска по полю зависит только от книг,
+    у которых нормализованное значение этого поля совпадает с запросом, поэтому при изменении книги
+    сбрасываются только ключи ее значений (invalidate_book), а не весь кеш.
+    Если хранилище меняют другие процессы, кеш сбрасывается целиком при изменении версии данных (validate).
+
+    Параметры:
+    - maxsize (int): Максимальное количество результатов в кеше; 0 - кеш выключен.
+    - ttl (float | None): Время жизни результата в секундах; None - без ограничения.
+    - clock (Callable[[], float]): Источник времени для ttl.
+
+    Атрибуты:
+    - hits, misses: Количество попаданий и промахов.
+    - evictions: Количество результатов, вытесненных из-за maxsize.
+    - expirations: Количество результатов, устаревших по ttl.
+    - invalidations: Количество результатов, сброшенных из-за изменения книг.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, list[Book]]] = OrderedDict()
+        # Кеш читают параллельно несколько потоков под блокировкой на чтение BooksManager
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    @staticmethod
+    def key(field: str, query) -> tuple[str, str]:
+        return field, FieldIndex.normalize(query)
+
+    def get(self, key: Hashable) -> list[Book] | None:
+        """
+        Возвращает копию закешированного результата или None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and self._clock() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, key: Hashable, books: list[Book]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), list(books))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_book(self, book: Book) -> None:
+        """
+        Сбрасывает результаты, в которые входит книга в ее текущем состоянии.
+        """
+        if not self._entries:
+            return
+        with self._lock:
+            for field in Book.__slots__:
+                if self._entries.pop(self.key(field, getattr(book, field)), None) is not None:
+                    self.invalidations += 1
+
+    def validate(self, version) -> None:
+        """
+        Сбрасывает кеш, если версия данных хранилища изменилась с прошлой проверки.
+        """
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._entries.clear()
+                    self._version = version
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'expirations': self.expirations, 'invalidations': self.invalidations,
+                    'size': len(self._entries), 'maxsize': self.maxsize}
@@ -0,0 +1,66 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class RWLock:
+    """
+    Блокировка читателей-писателей.
+
+    Несколько потоков могут одновременно читать, писатель работает один. Ожидающий писатель
+    получает приоритет перед новыми читателями, чтобы частое чтение не откладывало запись бесконечно.
+    Поток-писатель может повторно брать блокировку на запись и на чтение. Повышение блокировки
+    с чтения до записи не поддерживается и приводит к взаимной блокировке.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._waiting_writers = 0
+        self._writer: int | None = None
+        self._writer_depth = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Захватывает блокировку на чтение.
+        """
+        if self._writer == threading.get_ident():
+            yield
+            return
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Захватывает блокировку на запись.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+            else:
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._waiting_writers -= 1
+                self._writer = me
+                self._writer_depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
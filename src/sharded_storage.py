@@ -0,0 +1,365 @@
+import argparse
+import heapq
+import json
+import os
+from collections.abc import MutableMapping
+from functools import partial
+from typing import Callable, Iterable, Iterator
+
+from book_store import BookStore
+from file_utils import atomic_write
+from models import Book, BookStatus
+from parallel import PARALLEL_LOAD_MIN_BYTES, process_context
+from storage import BooksStorage, open_storage
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+PARTITIONS = ('hash', 'range')
+SHARD_FORMATS = {'json': '.json', 'snapshot': '.snap'}
+DEFAULT_SHARDS = 16
+DEFAULT_RANGE_SIZE = 100_000
+
+_STATUSES = {status.value: status for status in BookStatus}
+
+
+def _load_shard(path: str) -> list[tuple]:
+    """
+    Загружает файл шарда в процессе пула. Книги возвращаются кортежами, которые передаются
+    между процессами быстрее объектов Book.
+    """
+    storage = open_storage(path)
+    try:
+        return [(book.id, book.title, book.author, book.year, book.status.value)
+                for book in storage.load().values()]
+    finally:
+        storage.close()
+
+
+def _record_ids(records: Iterable[dict]) -> Iterator[int]:
+    for record in records:
+        if record['op'] == 'batch':
+            yield from _record_ids(record['records'])
+        elif record['op'] == 'add':
+            yield record['book']['id']
+        else:
+            yield record['id']
+
+
+class ShardedStorage(BooksStorage):
+    """
+    Хранилище каталога в каталоге (директории) из нескольких файлов-шардов и манифеста.
+
+    Книги распределяются по шардам по ID: при partition='hash' в шард `id % shards`, при
+    partition='range' - интервалами по range_size ID (шард `(id - 1) // range_size`), и новые
+    шарды добавляются по мере роста ID. Каждый шард - обычный файл данных JSON или двоичный
+    снимок (format='snapshot'), книги в нем упорядочены по ID.
+
+    Манифест `manifest.json` хранит схему разбиения, формат и имена файлов шардов, а также
+    last_book_id, поэтому ID удаленной последней книги не выдается повторно. Манифест и шарды
+    сохраняются атомарно (см. file_utils.atomic_write).
+
+    При записи изменений перезаписываются только шарды, в которых есть измененные книги.
+    Каждый шард записывается атомарно, но изменения, затронувшие несколько шардов (транзакция или
+    пакет), записываются несколькими независимыми заменами файлов: при сбое посреди записи
+    на диске может остаться только часть из них. Атомарно целиком заменяются только все шарды
+    сразу - функциями save, reshard и compact, которые переключаются на новое поколение манифестом.
+    Как и в JsonStorage, при workers больше 1 шарды загружаются параллельно в пуле процессов,
+    если их общий размер не меньше PARALLEL_LOAD_MIN_BYTES, а recover и progress не заданы.
+    Параметры recover и progress действуют на каждый шард; progress получает прочитанные байты,
+    общий размер и количество книг по всем шардам.
+
+    Схема разбиения новой директории задается параметрами shards, partition, range_size и format,
+    у существующей она читается из манифеста и меняется только функцией reshard.
+    Журнал, ленивый режим и общий доступ нескольких процессов не поддерживаются, а compact_threshold
+    без журнала не действует; остальные параметры совпадают с параметрами JsonStorage.
+    """
+
+    def __init__(self, directory: str, columnar: bool = False, workers: int = 0, shards: int = DEFAULT_SHARDS,
+                 partition: str = 'hash', range_size: int = DEFAULT_RANGE_SIZE, format: str = 'json', *,
+                 journal: bool = False, compact_threshold: int = 1000, lazy: bool = False,
+                 progress: Callable[[int, int, int], None] | None = None, recover: bool = False,
+                 shared: bool = False):
+        for option, value in (('journal', journal), ('lazy', lazy), ('shared', shared)):
+            if value:
+                raise ValueError(f"Параметр {option} не поддерживается для шардированного каталога")
+        super().__init__()
+        self.directory = directory
+        self.columnar = columnar
+        self.workers = workers
+        self.compact_threshold = compact_threshold
+        self.progress = progress
+        self.recover = recover
+        self.manifest = self._read_manifest() or self._new_manifest(shards, partition, range_size, format)
+        self._shard_ids: list[set[int]] = []
+
+    @staticmethod
+    def _new_manifest(shards: int, partition: str, range_size: int, format: str, generation: int = 0,
+                      last_book_id: int = 0) -> dict:
+        if partition not in PARTITIONS:
+            raise ValueError(f"Неизвестная схема разбиения {partition}")
+        if format not in SHARD_FORMATS:
+            raise ValueError(f"Неизвестный формат шардов {format}")
+        if shards < 1 or range_size < 1:
+            raise ValueError("Количество шардов и размер интервала должны быть положительными")
+        return {
+            'version': MANIFEST_VERSION,
+            'partition': partition,
+            'shards': 1 if partition == 'range' else shards,
+            'range_size': range_size,
+            'format': format,
+            'generation': generation,
+            'last_book_id': last_book_id,
+        }
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def _read_manifest(self) -> dict | None:
+        try:
+            with open(self.manifest_path, encoding='utf-8') as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return None
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Неподдерживаемая версия манифеста {self.manifest_path}: {manifest.get('version')}")
+        return manifest
+
+    def _write_manifest(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with atomic_write(self.manifest_path, 'w') as file:
+            json.dump(self.manifest, file, indent=4)
+
+    def shard_path(self, shard: int, manifest: dict | None = None) -> str:
+        """
+        Возвращает путь к файлу шарда. В имя входит поколение разбиения, чтобы reshard мог записать
+        новые шарды рядом со старыми и переключиться на них заменой манифеста.
+        """
+        manifest = manifest or self.manifest
+        extension = SHARD_FORMATS[manifest['format']]
+        return os.path.join(self.directory, f"shard-{manifest['generation']}-{shard:04d}{extension}")
+
+    def shard_of(self, book_id: int, manifest: dict | None = None) -> int:
+        """
+        Возвращает номер шарда, в котором хранится книга с ID book_id.
+        """
+        manifest = manifest or self.manifest
+        if manifest['partition'] == 'range':
+            return max(book_id - 1, 0) // manifest['range_size']
+        return book_id % manifest['shards']
+
+    def _empty_books(self) -> MutableMapping[int, Book]:
+        return BookStore() if self.columnar else {}
+
+    def _shard_paths(self) -> list[str]:
+        return [self.shard_path(shard) for shard in range(self.manifest['shards'])]
+
+    def _load_shards(self, paths: list[str]) -> list[list[Book]]:
+        sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path in paths]
+        total_size = sum(sizes)
+        workers = min(self.workers, len(paths))
+        if workers > 1 and not self.recover and self.progress is None and total_size >= PARALLEL_LOAD_MIN_BYTES:
+            # Импорт здесь, как в parallel: пул процессов нужен только большим каталогам
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(workers, mp_context=process_context()) as executor:
+                return [[Book(book_id, title, author, year, _STATUSES[status])
+                         for book_id, title, author, year, status in shard]
+                        for shard in executor.map(_load_shard, paths)]
+        shards = []
+        read_size = read_books = 0
+        for path, size in zip(paths, sizes):
+            progress = None
+            if self.progress is not None:
+                # Прогресс шарда пересчитывается в прогресс всего каталога
+                def progress(read, _, books, read_before=read_size, books_before=read_books):
+                    self.progress(read_before + read, total_size, books_before + books)
+            storage = open_storage(path, progress=progress, recover=self.recover)
+            try:
+                shards.append(list(storage.load().values()))
+            finally:
+                storage.close()
+            read_size += size
+            read_books += len(shards[-1])
+        return shards
+
+    def load(self) -> MutableMapping[int, Book]:
+        """
+        Загружает книги из всех шардов. Новая директория создается с манифестом и пустыми шардами.
+        """
+        with self.lock:
+            if not os.path.exists(self.manifest_path):
+                self._write_layout(self.manifest, [])
+            shards = self._load_shards(self._shard_paths())
+            self._shard_ids = [{book.id for book in shard} for shard in shards]
+            books = self._empty_books()
+            for book in heapq.merge(*shards, key=lambda book: book.id):
+                books[book.id] = book
+            return books
+
+    def last_book_id(self, books: MutableMapping[int, Book]) -> int:
+        return max(self.manifest['last_book_id'], super().last_book_id(books))
+
+    def _shard_set(self, shard: int) -> set[int]:
+        while len(self._shard_ids) <= shard:
+            self._shard_ids.append(set())
+        return self._shard_ids[shard]
+
+    def write(self, books: MutableMapping[int, Book], records: list[dict]) -> None:
+        """
+        Перезаписывает шарды, в которых есть измененные книги, и при росте last_book_id - манифест.
+        """
+        self.prepare_write(books, records)()
+
+    def prepare_write(self, books: MutableMapping[int, Book], records: list[dict]) -> Callable[[], None]:
+        """
+        Снимает копии книг измененных шардов; шарды и манифест записывает возвращенная функция.
+        """
+        with self.lock:
+            affected = set()
+            last_book_id = self.manifest['last_book_id']
+            for book_id in _record_ids(records):
+                shard = self.shard_of(book_id)
+                affected.add(shard)
+                if book_id in books:
+                    self._shard_set(shard).add(book_id)
+                    last_book_id = max(last_book_id, book_id)
+                else:
+                    self._shard_set(shard).discard(book_id)
+            # Под блокировкой снимаются только копии книг (статус книги меняется на месте), сериализация идет без нее
+            snapshots = {shard: [Book(book.id, book.title, book.author, book.year, book.status)
+                                 for book in map(books.__getitem__, sorted(self._shard_ids[shard]))]
+                         for shard in affected}
+        return partial(self._write_shards, snapshots, last_book_id)
+
+    def _write_shards(self, snapshots: dict[int, list[Book]], last_book_id: int) -> None:
+        affected = snapshots.keys()
+        for shard, shard_books in snapshots.items():
+            self._save_shard(self.shard_path(shard), shard_books)
+        shards = max(self.manifest['shards'], max(affected, default=-1) + 1)
+        if (shards, last_book_id) != (self.manifest['shards'], self.manifest['last_book_id']):
+            # Новые шарды интервального разбиения уже записаны, поэтому манифест ссылается только на готовые файлы
+            self.manifest = {**self.manifest, 'shards': shards, 'last_book_id': last_book_id}
+            self._write_manifest()
+
+    @staticmethod
+    def _save_shard(path: str, books: list[Book]) -> None:
+        storage = open_storage(path)
+        try:
+            storage.save(books)
+        finally:
+            storage.close()
+
+    def _write_layout(self, manifest: dict, books: Iterable[Book]) -> None:
+        """
+        Записывает книги в шарды разбиения manifest и переключается на него заменой манифеста.
+        Файлы предыдущего поколения удаляются после замены, поэтому при сбое каталог остается целым.
+        """
+        old_paths = self._shard_paths() if os.path.exists(self.manifest_path) else []
+        shards: list[list[Book]] = [[] for _ in range(manifest['shards'])]
+        for book in sorted(books, key=lambda book: book.id):
+            shard = self.shard_of(book.id, manifest)
+            while len(shards) <= shard:
+                shards.append([])
+            shards[shard].append(book)
+            manifest['last_book_id'] = max(manifest['last_book_id'], book.id)
+        manifest['shards'] = len(shards)
+        os.makedirs(self.directory, exist_ok=True)
+        for shard, shard_books in enumerate(shards):
+            self._save_shard(self.shard_path(shard, manifest), shard_books)
+        self.manifest = manifest
+        self._write_manifest()
+        self._shard_ids = [{book.id for book in shard_books} for shard_books in shards]
+        new_paths = set(self._shard_paths())
+        for path in old_paths:
+            if path not in new_paths and os.path.exists(path):
+                os.remove(path)
+
+    def save(self, books: Iterable[Book]) -> None:
+        """
+        Полностью заменяет содержимое каталога, сохраняя схему разбиения.
+        """
+        with self.lock:
+            manifest = self._new_manifest(self.manifest['shards'], self.manifest['partition'],
+                                          self.manifest['range_size'], self.manifest['format'],
+                                          self.manifest['generation'] + 1, self.manifest['last_book_id'])
+            self._write_layout(manifest, books)
+
+    def reshard(self, books: Iterable[Book], shards: int | None = None, partition: str | None = None,
+                range_size: int | None = None, format: str | None = None) -> None:
+        """
+        Перераспределяет книги по новой схеме разбиения. Не указанные параметры берутся из текущей схемы.
+        """
+        with self.lock:
+            manifest = self._new_manifest(shards or self.manifest['shards'], partition or self.manifest['partition'],
+                                          range_size or self.manifest['range_size'],
+                                          format or self.manifest['format'],
+                                          self.manifest['generation'] + 1, self.manifest['last_book_id'])
+            self._write_layout(manifest, books)
+
+    def compact(self, books: MutableMapping[int, Book]) -> None:
+        """
+        Перезаписывает все шарды.
+        """
+        with self.lock:
+            snapshot = list(books.values())
+        self.save(snapshot)
+
+    def book_count(self) -> int | None:
+        """
+        Возвращает сумму количеств книг в шардах, посчитанных без загрузки (см. JsonStorage.book_count).
+        """
+        if not os.path.exists(self.manifest_path):
+            return 0
+        total = 0
+        for path in self._shard_paths():
+            storage = open_storage(path)
+            try:
+                count = storage.book_count()
+            finally:
+                storage.close()
+            if count is None:
+                return None
+            total += count
+        return total
+
+    def shard_sizes(self) -> list[int]:
+        """
+        Возвращает количество книг в каждом шарде.
+        """
+        with self.lock:
+            return [len(book_ids) for book_ids in self._shard_ids]
+
+
+def reshard(directory: str, shards: int | None = None, partition: str | None = None,
+            range_size: int | None = None, format: str | None = None) -> list[int]:
+    """
+    Перераспределяет книги шардированного каталога по новой схеме разбиения.
+
+    Параметры:
+    - directory (str): Путь к директории каталога.
+    - shards (int | None): Количество шардов для partition='hash'.
+    - partition (str | None): Схема разбиения: 'hash' или 'range'.
+    - range_size (int | None): Количество ID в шарде для partition='range'.
+    - format (str | None): Формат файлов шардов: 'json' или 'snapshot'.
+
+    Возвращает:
+    - Количество книг в каждом шарде новой схемы.
+    """
+    if not os.path.exists(os.path.join(directory, MANIFEST_NAME)):
+        raise FileNotFoundError(f"Манифест каталога {directory} не найден")
+    storage = ShardedStorage(directory)
+    books = storage.load()
+    storage.reshard(books.values(), shards, partition, range_size, format)
+    return storage.shard_sizes()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Перераспределение книг шардированного каталога")
+    parser.add_argument('directory')
+    parser.add_argument('--shards', type=int)
+    parser.add_argument('--partition', choices=PARTITIONS)
+    parser.add_argument('--range-size', type=int)
+    parser.add_argument('--format', choices=tuple(SHARD_FORMATS))
+    args = parser.parse_args()
+    sizes = reshard(args.directory, args.shards, args.partition, args.range_size, args.format)
+    print(f"Шардов: {len(sizes)}, книг: {sum(sizes)}, наибольший шард: {max(sizes)}")
@@ -0,0 +1,145 @@
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import BinaryIO, Iterable, Iterator
+
+from models import Book, BookStatus
+from storage import JsonStorage
+
+MAGIC = b'BOOKSNAP'
+VERSION = 1
+# Заголовок: сигнатура, версия формата и количество книг
+HEADER = struct.Struct('<8sHI')
+# Размеры в байтах блоков названий и авторов
+TEXT_SIZES = struct.Struct('<QQ')
+# Коды статусов фиксированы в формате и не зависят от порядка BookStatus
+STATUSES = (BookStatus.AVAILABLE, BookStatus.ISSUED)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+# Типы колонок: ID, год, код статуса, длины названия и автора в символах
+COLUMN_TYPES = ('q', 'i', 'B', 'I', 'I')
+
+
+class SnapshotError(ValueError):
+    """
+    Файл не является снимком каталога или поврежден.
+    """
+
+
+def _read_exact(file: BinaryIO, size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise SnapshotError("Файл снимка обрезан")
+    return data
+
+
+def write_snapshot(file: BinaryIO, books: Iterable[Book]) -> None:
+    """
+    Записывает книги в двоичный снимок.
+
+    Снимок хранит книги по колонкам: после заголовка HEADER идут массивы ID, годов, кодов статусов
+    и длин названий и авторов, затем размеры TEXT_SIZES и два блока UTF-8 со всеми названиями
+    и всеми авторами подряд. Числа записываются в порядке little-endian.
+    """
+    columns = [array(type_code) for type_code in COLUMN_TYPES]
+    ids, years, statuses, title_lengths, author_lengths = columns
+    titles, authors = [], []
+    for book in books:
+        ids.append(book.id)
+        years.append(book.year)
+        statuses.append(STATUS_CODES[book.status])
+        title_lengths.append(len(book.title))
+        author_lengths.append(len(book.author))
+        titles.append(book.title)
+        authors.append(book.author)
+
+    titles_data = ''.join(titles).encode('utf-8')
+    authors_data = ''.join(authors).encode('utf-8')
+    file.write(HEADER.pack(MAGIC, VERSION, len(ids)))
+    for column in columns:
+        if sys.byteorder != 'little':
+            column.byteswap()
+        column.tofile(file)
+    file.write(TEXT_SIZES.pack(len(titles_data), len(authors_data)))
+    file.write(titles_data)
+    file.write(authors_data)
+
+
+def read_header(file: BinaryIO) -> int:
+    """
+    Читает и проверяет заголовок снимка.
+
+    Возвращает:
+    - Количество книг в снимке.
+    """
+    magic, version, count = HEADER.unpack(_read_exact(file, HEADER.size))
+    if magic != MAGIC:
+        raise SnapshotError("Файл не является снимком каталога")
+    if version != VERSION:
+        raise SnapshotError(f"Неподдерживаемая версия снимка {version}")
+    return count
+
+
+def read_snapshot(file: BinaryIO) -> Iterator[Book]:
+    """
+    Читает книги из двоичного снимка, записанного write_snapshot.
+
+    Колонки читаются целиком методом array.frombytes, а строки - двумя вызовами decode,
+    поэтому разбор не зависит от количества полей в записи, как при чтении JSON.
+    """
+    count = read_header(file)
+
+    columns = []
+    for type_code in COLUMN_TYPES:
+        column = array(type_code)
+        column.frombytes(_read_exact(file, column.itemsize * count))
+        if sys.byteorder != 'little':
+            column.byteswap()
+        columns.append(column)
+    ids, years, statuses, title_lengths, author_lengths = columns
+    titles_size, authors_size = TEXT_SIZES.unpack(_read_exact(file, TEXT_SIZES.size))
+    try:
+        titles = _read_exact(file, titles_size).decode('utf-8')
+        authors = _read_exact(file, authors_size).decode('utf-8')
+        book_statuses = [STATUSES[code] for code in statuses]
+    except (UnicodeDecodeError, IndexError) as error:
+        raise SnapshotError(f"Поврежденный снимок: {error}") from None
+
+    title_start = author_start = 0
+    for book_id, year, status, title_end, author_end in zip(ids, years, book_statuses,
+                                                            accumulate(title_lengths), accumulate(author_lengths)):
+        yield Book(book_id, titles[title_start:title_end], authors[author_start:author_end], year, status)
+        title_start, author_start = title_end, author_end
+
+
+class SnapshotStorage(JsonStorage):
+    """
+    Хранилище каталога в компактном двоичном снимке (см. write_snapshot).
+
+    Работает так же, как JsonStorage, включая журнал и общий доступ нескольких процессов,
+    но файл данных хранится в двоичном формате, а статус - кодом из одного байта.
+    Ленивый режим не поддерживается: он читает книги по смещениям в JSON-файле.
+    Параметр progress вызывается один раз после чтения снимка, а recover не используется:
+    снимок сохраняется атомарно и не бывает оборван посередине.
+    """
+
+    FORMAT_NAME = 'снимка'
+    FORMAT_ERRORS = (SnapshotError,)
+
+    def __init__(self, data_file: str, **options):
+        if options.get('lazy'):
+            raise ValueError("Ленивый режим не поддерживается для двоичного снимка")
+        super().__init__(data_file, **options)
+
+    def _read_books(self, file: BinaryIO) -> Iterator[Book]:
+        books = list(read_snapshot(file))
+        if self.progress is not None:
+            size = file.tell()
+            self.progress(size, size, len(books))
+        return iter(books)
+
+    def _count_books(self, file: BinaryIO) -> int:
+        return read_header(file)
+
+    def _write_books(self, file: BinaryIO, books: Iterable[Book]) -> None:
+        write_snapshot(file, books)
@@ -0,0 +1,299 @@
+import sqlite3
+from collections.abc import MutableMapping, ValuesView
+from typing import Iterable, Iterator
+
+from indexes import FieldIndex
+from models import Book, BookStatus
+from query import PlanStep, Predicate, QueryPlan
+from storage import BooksStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_title ON books (unicode_lower(title));
+CREATE INDEX IF NOT EXISTS books_author ON books (unicode_lower(author));
+CREATE INDEX IF NOT EXISTS books_year ON books (year);
+CREATE INDEX IF NOT EXISTS books_status ON books (status);
+CREATE TABLE IF NOT EXISTS status_counts (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS books_count_insert AFTER INSERT ON books BEGIN
+    INSERT INTO status_counts (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS books_count_delete AFTER DELETE ON books BEGIN
+    UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+END;
+CREATE TRIGGER IF NOT EXISTS books_count_update AFTER UPDATE OF status ON books BEGIN
+    UPDATE status_counts SET count = count - 1 WHERE status = OLD.status;
+    INSERT INTO status_counts (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+"""
+
+COLUMNS = 'id, title, author, year, status'
+
+
+def _row_to_book(row: tuple) -> Book:
+    book_id, title, author, year, status = row
+    return Book(book_id, title, author, year, BookStatus(status))
+
+
+def _book_to_row(book: Book) -> tuple:
+    return book.id, book.title, book.author, book.year, book.status.value
+
+
+class SqliteBooksValues(ValuesView):
+    """
+    Представление книг базы, которое читает их одним запросом, а не по одной.
+    """
+
+    def __iter__(self) -> Iterator[Book]:
+        yield from self._mapping.select('', ())
+
+
+class SqliteBooks(MutableMapping):
+    """
+    Книги в таблице SQLite с интерфейсом словаря {id: Book}.
+
+    Книги не хранятся в памяти: каждое обращение выполняет запрос к базе, а изменения
+    выполняются в открытой транзакции до вызова SqliteStorage.write.
+    Возвращаемые объекты Book - копии строк таблицы, поэтому измененную книгу нужно записать
+    обратно: books[book.id] = book.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def select(self, where: str, parameters: tuple) -> list[Book]:
+        query = f'SELECT {COLUMNS} FROM books {where} ORDER BY id'
+        return [_row_to_book(row) for row in self._connection.execute(query, parameters)]
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT count(*) FROM books').fetchone()[0]
+
+    def __iter__(self) -> Iterator[int]:
+        for (book_id,) in self._connection.execute('SELECT id FROM books ORDER BY id').fetchall():
+            yield book_id
+
+    def __contains__(self, book_id) -> bool:
+        return self._connection.execute('SELECT 1 FROM books WHERE id = ?', (book_id,)).fetchone() is not None
+
+    def __getitem__(self, book_id: int) -> Book:
+        row = self._connection.execute(f'SELECT {COLUMNS} FROM books WHERE id = ?', (book_id,)).fetchone()
+        if row is None:
+            raise KeyError(book_id)
+        return _row_to_book(row)
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        self._connection.execute(f'INSERT OR REPLACE INTO books ({COLUMNS}) VALUES (?, ?, ?, ?, ?)',
+                                 _book_to_row(book))
+
+    def __delitem__(self, book_id: int) -> None:
+        if self._connection.execute('DELETE FROM books WHERE id = ?', (book_id,)).rowcount == 0:
+            raise KeyError(book_id)
+
+    def values(self) -> SqliteBooksValues:
+        return SqliteBooksValues(self)
+
+
+class SqliteStorage(BooksStorage):
+    """
+    Хранилище каталога в базе SQLite.
+
+    Книги хранятся в таблице books с индексами по названию и автору без учета регистра, по году и статусу,
+    поэтому поиск, удаление и изменение статуса выполняются индексированными запросами без загрузки
+    каталога в память. Количество книг с каждым статусом хранится в таблице status_counts, которую
+    обновляют триггеры. База работает в режиме WAL.
+
+    SQLite-функция lower() учитывает регистр только латинских букв, поэтому для индексов
+    используется функция unicode_lower на основе str.lower, которая регистрируется при открытии базы.
+
+    Параметры:
+    - data_file (str): Путь к файлу базы.
+    """
+
+    lazy = True
+    SEARCH_CONDITIONS = {
+        'title': 'WHERE unicode_lower(title) = ?',
+        'author': 'WHERE unicode_lower(author) = ?',
+        'year': 'WHERE year = ?',
+    }
+
+    def __init__(self, data_file: str):
+        super().__init__()
+        self.data_file = data_file
+        self._connection = sqlite3.connect(data_file, check_same_thread=False)
+        self._connection.create_function('unicode_lower', 1, str.lower, deterministic=True)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        # INSERT OR REPLACE удаляет заменяемую строку, и триггер удаления должен это учесть
+        self._connection.execute('PRAGMA recursive_triggers=ON')
+        with self._connection:
+            new_counts = self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'status_counts'").fetchone() is None
+            self._connection.executescript(SCHEMA)
+            if new_counts:
+                # База создана до появления счетчиков
+                self._connection.execute(
+                    'INSERT INTO status_counts (status, count) SELECT status, count(*) FROM books GROUP BY status')
+
+    def load(self) -> SqliteBooks:
+        return SqliteBooks(self._connection)
+
+    def last_book_id(self, books: MutableMapping[int, Book]) -> int:
+        return self._connection.execute('SELECT coalesce(max(id), 0) FROM books').fetchone()[0]
+
+    def write(self, books: MutableMapping[int, Book], records: list[dict]) -> None:
+        """
+        Фиксирует транзакцию, в которой изменения уже выполнены.
+        """
+        with self.lock:
+            self._connection.commit()
+
+    def save(self, books: Iterable[Book]) -> None:
+        with self.lock:
+            self._connection.execute('DELETE FROM books')
+            self._connection.executemany(f'INSERT INTO books ({COLUMNS}) VALUES (?, ?, ?, ?, ?)',
+                                         (_book_to_row(book) for book in books))
+            self._connection.commit()
+
+    def compact(self, books: MutableMapping[int, Book]) -> None:
+        """
+        Переносит изменения из WAL-файла в базу и очищает его.
+        """
+        with self.lock:
+            self._connection.commit()
+            self._connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def rollback(self) -> None:
+        with self.lock:
+            self._connection.rollback()
+
+    def search(self, filter_field: str, query: str) -> list[Book] | None:
+        condition = self.SEARCH_CONDITIONS.get(filter_field)
+        if condition is None:
+            return None
+        if filter_field == 'year':
+            # Сохраняется прежнее сравнение строк: '1925' совпадает, а '01925' - нет
+            if not query.isdigit() or str(int(query)) != query:
+                return []
+            parameter = int(query)
+        else:
+            parameter = query.lower()
+        with self.lock:
+            return self.load().select(condition, (parameter,))
+
+    def range_search(self, filter_field: str, low: int | None, high: int | None, descending: bool,
+                     offset: int, limit: int | None) -> tuple[list[Book], int]:
+        # Имя поля подставляется в запрос только из известного списка
+        column = {'id': 'id', 'year': 'year'}[filter_field]
+        conditions, parameters = [], []
+        if low is not None:
+            conditions.append(f'{column} >= ?')
+            parameters.append(low)
+        if high is not None:
+            conditions.append(f'{column} <= ?')
+            parameters.append(high)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        order = 'DESC' if descending else 'ASC'
+        with self.lock:
+            total = self._connection.execute(f'SELECT count(*) FROM books {where}', parameters).fetchone()[0]
+            rows = self._connection.execute(
+                f'SELECT {COLUMNS} FROM books {where} ORDER BY {column} {order}, id {order} LIMIT ? OFFSET ?',
+                (*parameters, -1 if limit is None else limit, offset))
+            return [_row_to_book(row) for row in rows], total
+
+    @staticmethod
+    def _query_where(predicates: list[Predicate]) -> tuple[str, list, list[Predicate]]:
+        """
+        Переводит условия на равенство и диапазон в WHERE, а условия на начало слов
+        оставляет для проверки каждой найденной книги.
+        """
+        conditions, parameters, filters = [], [], []
+        for predicate in predicates:
+            # Имя поля подставляется в запрос только после проверки в Predicate
+            field = predicate.field
+            if predicate.operator == 'prefix':
+                filters.append(predicate)
+            elif predicate.operator == 'range':
+                if predicate.value is not None:
+                    conditions.append(f'{field} >= ?')
+                    parameters.append(predicate.value)
+                if predicate.high is not None:
+                    conditions.append(f'{field} <= ?')
+                    parameters.append(predicate.high)
+            elif field == 'status':
+                conditions.append('status = ?')
+                parameters.append(predicate.value.value)
+            elif field in ('title', 'author'):
+                conditions.append(f'unicode_lower({field}) = ?')
+                parameters.append(FieldIndex.normalize(predicate.value))
+            else:
+                # Как в search: '1925' совпадает с годом 1925, а '01925' - нет
+                text = FieldIndex.normalize(predicate.value)
+                if text.isdigit() and str(int(text)) == text:
+                    conditions.append(f'{field} = ?')
+                    parameters.append(int(text))
+                else:
+                    conditions.append('0')
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        return where, parameters, filters
+
+    def query(self, predicates: list[Predicate]) -> list[Book]:
+        where, parameters, filters = self._query_where(predicates)
+        with self.lock:
+            books = self.load().select(where, tuple(parameters))
+        return [book for book in books if all(predicate.matches(book) for predicate in filters)]
+
+    def explain_query(self, predicates: list[Predicate]) -> QueryPlan:
+        where, parameters, filters = self._query_where(predicates)
+        with self.lock:
+            rows = self._connection.execute(
+                f'EXPLAIN QUERY PLAN SELECT {COLUMNS} FROM books {where} ORDER BY id', parameters).fetchall()
+        steps = [PlanStep('storage', row[-1]) for row in rows]
+        steps.extend(PlanStep('filter', str(predicate)) for predicate in filters)
+        return QueryPlan(steps, filters=filters)
+
+    def status_counts(self) -> dict[BookStatus, int]:
+        with self.lock:
+            counts = dict(self._connection.execute('SELECT status, count FROM status_counts'))
+        return {status: counts.get(status.value, 0) for status in BookStatus}
+
+    def book_count(self) -> int:
+        return sum(self.status_counts().values())
+
+    def books_by_status(self, status: BookStatus, offset: int, limit: int | None) -> tuple[list[Book], int]:
+        with self.lock:
+            rows = self._connection.execute(
+                f'SELECT {COLUMNS} FROM books WHERE status = ? ORDER BY id LIMIT ? OFFSET ?',
+                (status.value, -1 if limit is None else limit, offset))
+            return [_row_to_book(row) for row in rows], self.status_counts()[status]
+
+    def page(self, after_id: int, before_id: int | None, limit: int) -> list[Book]:
+        with self.lock:
+            if before_id is None:
+                rows = self._connection.execute(
+                    f'SELECT {COLUMNS} FROM books WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit))
+                return [_row_to_book(row) for row in rows]
+            rows = self._connection.execute(
+                f'SELECT {COLUMNS} FROM books WHERE id < ? ORDER BY id DESC LIMIT ?', (before_id, limit))
+            return [_row_to_book(row) for row in rows][::-1]
+
+    def data_version(self) -> int:
+        """
+        Версия базы, которая меняется после каждой фиксации транзакции другим соединением.
+        """
+        with self.lock:
+            return self._connection.execute('PRAGMA data_version').fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self._connection.commit()
+            self._connection.close()
@@ -0,0 +1,528 @@
+import io
+import json
+import os
+import threading
+from collections.abc import MutableMapping
+from contextlib import nullcontext
+from functools import partial
+from typing import BinaryIO, Callable, ContextManager, Iterable, Iterator
+
+from book_store import BookStore
+from file_utils import FileLock, atomic_write
+from journal import Journal
+from json_stream import count_key, iter_json_array
+from lazy_catalog import LazyBooks, read_index, save_with_index
+from metrics import SIZE_BUCKETS, metrics
+from models import Book, BookStatus
+from parallel import PARALLEL_LOAD_MIN_BYTES, load_parallel
+from query import Predicate, QueryPlan
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+SNAPSHOT_EXTENSIONS = ('.snap',)
+SHARDED_EXTENSIONS = ('.shards',)
+
+
+class BooksStorage:
+    """
+    Базовый класс хранилища каталога книг.
+
+    Хранилище загружает книги в виде словаря (или объекта с интерфейсом словаря) и сохраняет
+    изменения, уже примененные к нему. Изменения описываются записями вида
+    {'op': 'add' | 'remove' | 'status' | 'batch', ...}.
+
+    Атрибуты:
+    - lock: Блокировка, защищающая загруженные книги; BooksManager использует ее же.
+    - lazy: Загружаются ли книги по требованию, а не целиком при открытии.
+    - shared: Могут ли хранилище одновременно менять другие процессы.
+    """
+
+    lazy = False
+    shared = False
+
+    def __init__(self):
+        self.lock = threading.RLock()
+
+    def load(self) -> MutableMapping[int, Book]:
+        """
+        Загружает книги из хранилища.
+        """
+        raise NotImplementedError
+
+    def last_book_id(self, books: MutableMapping[int, Book]) -> int:
+        return max(books.keys(), default=0)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return False
+
+    def write(self, books: MutableMapping[int, Book], records: list[dict]) -> None:
+        """
+        Сохраняет изменения records, уже примененные к books.
+        """
+        raise NotImplementedError
+
+    def prepare_write(self, books: MutableMapping[int, Book], records: list[dict]) -> Callable[[], None]:
+        """
+        Снимает все, что нужно для сохранения изменений records, и возвращает функцию, которая их сохраняет.
+
+        Метод вызывается, пока books не меняются, а возвращенная функция - уже без этого ограничения,
+        поэтому она не обращается к books. По умолчанию изменения сохраняются сразу.
+        """
+        self.write(books, records)
+        return lambda: None
+
+    def save(self, books: Iterable[Book]) -> None:
+        """
+        Полностью заменяет содержимое хранилища переданными книгами.
+        """
+        raise NotImplementedError
+
+    def compact(self, books: MutableMapping[int, Book]) -> None:
+        """
+        Приводит хранилище к компактному виду. По умолчанию ничего не делает.
+        """
+
+    def rollback(self) -> None:
+        """
+        Отменяет несохраненные изменения, если хранилище их отслеживает.
+        """
+
+    def search(self, filter_field: str, query: str) -> list[Book] | None:
+        """
+        Ищет книги средствами хранилища.
+
+        Возвращает:
+        - Список найденных книг или None, если хранилище не поддерживает поиск по этому полю.
+        """
+        return None
+
+    def range_search(self, filter_field: str, low: int | None, high: int | None, descending: bool,
+                     offset: int, limit: int | None) -> tuple[list[Book], int] | None:
+        """
+        Ищет книги по диапазону значений поля средствами хранилища (см. BooksManager.range_search).
+
+        Возвращает:
+        - Кортеж из списка книг и их общего количества или None, если хранилище это не поддерживает.
+        """
+        return None
+
+    def query(self, predicates: list[Predicate]) -> list[Book] | None:
+        """
+        Ищет книги по нескольким условиям средствами хранилища (см. BooksManager.query).
+
+        Возвращает:
+        - Список книг по возрастанию ID или None, если хранилище это не поддерживает.
+        """
+        return None
+
+    def explain_query(self, predicates: list[Predicate]) -> QueryPlan | None:
+        """
+        Возвращает план, по которому хранилище выполнит query, или None, если query не поддерживается.
+        """
+        return None
+
+    def book_count(self) -> int | None:
+        """
+        Возвращает количество книг без загрузки каталога или None, если хранилище это не поддерживает.
+        """
+        return None
+
+    def status_counts(self) -> dict[BookStatus, int] | None:
+        """
+        Возвращает количество книг с каждым статусом средствами хранилища или None, если оно это не поддерживает.
+        """
+        return None
+
+    def books_by_status(self, status: BookStatus, offset: int,
+                        limit: int | None) -> tuple[list[Book], int] | None:
+        """
+        Возвращает книги со статусом средствами хранилища (см. BooksManager.books_by_status).
+
+        Возвращает:
+        - Кортеж из списка книг и их общего количества или None, если хранилище это не поддерживает.
+        """
+        return None
+
+    def page(self, after_id: int, before_id: int | None, limit: int) -> list[Book] | None:
+        """
+        Возвращает страницу книг по возрастанию ID средствами хранилища (см. BooksManager.books_page).
+
+        Возвращает:
+        - Список книг или None, если хранилище не поддерживает постраничное чтение.
+        """
+        return None
+
+    def locked(self) -> ContextManager:
+        """
+        Блокирует хранилище от изменений другими процессами. По умолчанию ничего не делает.
+        """
+        return nullcontext()
+
+    def changed(self) -> bool:
+        """
+        Быстро проверяет, меняли ли хранилище другие процессы с последнего чтения или записи.
+        """
+        return False
+
+    def changes(self, books: MutableMapping[int, Book]) -> list[dict] | None:
+        """
+        Читает изменения, сделанные другими процессами, и возвращает их в виде записей.
+
+        Вызывается под блокировкой locked().
+
+        Возвращает:
+        - Список записей или None, если книги нужно загрузить заново.
+        """
+        return []
+
+    def data_version(self):
+        """
+        Возвращает значение, которое меняется, когда данные меняют другие соединения в обход changed(),
+        например версию базы. По умолчанию None.
+        """
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class JsonStorage(BooksStorage):
+    """
+    Хранилище каталога в JSON-файле.
+
+    Файл данных читается потоково, без загрузки всего JSON-массива в память, и сохраняется
+    атомарно: через временный файл, fsync и os.replace.
+
+    Параметры:
+    - data_file (str): Путь к файлу данных.
+    - journal (bool): Если True, изменения не перезаписывают файл данных целиком, а дописываются
+      в журнал `<data_file>.log`, который сворачивается в снимок, когда в нем накапливается
+      compact_threshold записей. Если журнал уже существует, он используется и при journal=False:
+      в нем могут быть еще не свернутые изменения, а процессы общего каталога должны писать одинаково.
+    - columnar (bool): Если True, книги хранятся в колоночном BookStore вместо словаря объектов Book.
+    - lazy (bool): Если True, при открытии читается только индекс ID -> смещение `<data_file>.idx`
+      поверх отображенного в память файла данных, а книги создаются при первом обращении.
+      Ленивый режим лучше сочетать с журналом, иначе каждое изменение перезаписывает файл целиком.
+    - progress (Callable[[int, int, int], None] | None): Функция, которая получает количество
+      прочитанных байт, размер файла и количество загруженных книг.
+    - recover (bool): Если True, поврежденные записи и оборванный конец файла пропускаются, а уже
+      прочитанные книги сохраняются; иначе поврежденный файл загружается как пустой каталог.
+    - shared (bool): Если True, файл данных могут одновременно использовать несколько процессов.
+      Запись выполняется под блокировкой fcntl на файле `<data_file>.lock`, а изменения других
+      процессов определяются по отметке файла данных (inode, время изменения, размер) и размеру
+      журнала. С журналом читаются только новые записи журнала, без журнала файл данных
+      перечитывается и сравнивается с загруженными книгами. С журналом его файл создается сразу,
+      а процесс, открывший каталог без журнала, переходит на журнал, как только тот появится.
+    - workers (int): Если больше 1, файл данных размером от PARALLEL_LOAD_MIN_BYTES делится на части,
+      которые разбираются в workers процессах (см. parallel.load_parallel). Не действует с recover и progress.
+
+    Формат файла данных задают методы _read_books и _write_books, а ошибки чтения - FORMAT_ERRORS;
+    подклассы заменяют их, чтобы хранить снимок в другом формате (см. snapshot.SnapshotStorage).
+    """
+
+    FORMAT_NAME = 'JSON'
+    FORMAT_ERRORS: tuple[type[Exception], ...] = (json.JSONDecodeError,)
+
+    def __init__(self, data_file: str, journal: bool = False, compact_threshold: int = 1000,
+                 columnar: bool = False, lazy: bool = False,
+                 progress: Callable[[int, int, int], None] | None = None, recover: bool = False,
+                 shared: bool = False, workers: int = 0):
+        super().__init__()
+        self.data_file = data_file
+        self.workers = workers
+        self.compact_threshold = compact_threshold
+        self.columnar = columnar
+        self.lazy = lazy
+        self.progress = progress
+        self.recover = recover
+        self._journal_path = f'{data_file}.log'
+        self._journal = Journal(self._journal_path) if journal or os.path.exists(self._journal_path) else None
+        self.shared = shared
+        self._file_lock = FileLock(f'{data_file}.lock') if shared else None
+        if shared and self._journal is not None:
+            # Другие процессы общего каталога определяют режим журнала по наличию его файла
+            open(self._journal_path, mode='a', encoding='utf-8').close()
+        self._data_stamp = None
+
+    def _file_stamp(self) -> tuple[int, int, int] | None:
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def locked(self) -> ContextManager:
+        if self._file_lock is None:
+            return nullcontext()
+        return self._file_lock.acquire()
+
+    def _empty_books(self) -> MutableMapping[int, Book]:
+        return BookStore() if self.columnar else {}
+
+    def load(self) -> MutableMapping[int, Book]:
+        """
+        Загружает книги из файла данных.
+
+        Если файл не существует или поврежден, создается пустой список.
+        В режиме журнала поверх снимка применяются записи журнала.
+        """
+        with self.locked():
+            books = self._load()
+            self._data_stamp = self._file_stamp()
+            return books
+
+    def _read_books(self, file: BinaryIO) -> Iterator[Book]:
+        """
+        Читает книги из открытого файла данных.
+        """
+        if self.workers > 1 and not self.recover and self.progress is None \
+                and os.fstat(file.fileno()).st_size >= PARALLEL_LOAD_MIN_BYTES:
+            books = load_parallel(file.name, self.workers)
+            if books is not None:
+                yield from books
+                return
+        for book in iter_json_array(file, self.progress, self.recover):
+            try:
+                yield Book.from_dict(book)
+            except (KeyError, TypeError, ValueError) as error:
+                # Синтаксически верный JSON с неверной книгой не считается пустым каталогом, иначе
+                # следующее сохранение затерло бы файл
+                raise ValueError(f"Некорректная книга в файле {self.data_file}: {book!r}") from error
+
+    def _count_books(self, file: BinaryIO) -> int:
+        """
+        Считает книги в открытом файле данных: по индексу ленивого режима, если он не устарел,
+        иначе по количеству ключей "id" без разбора JSON.
+        """
+        index = read_index(self.data_file)
+        if index is not None:
+            return len(index[0])
+        return count_key(file, 'id')
+
+    def book_count(self) -> int | None:
+        """
+        Возвращает количество книг без создания объектов Book (см. _count_books).
+
+        С непустым журналом возвращает None: записи журнала меняют каталог, и книги нужно загрузить.
+        """
+        if self._journal is not None and self._journal.size():
+            return None
+        try:
+            with open(self.data_file, mode='rb') as file:
+                return self._count_books(file)
+        except FileNotFoundError:
+            return 0
+        except self.FORMAT_ERRORS:
+            return None
+
+    def _write_books(self, file: BinaryIO, books: Iterable[Book]) -> None:
+        """
+        Записывает книги в открытый временный файл данных.
+        """
+        data = [book.to_dict() for book in books]
+        text_file = io.TextIOWrapper(file, encoding='utf-8')
+        json.dump(data, text_file, ensure_ascii=False, indent=4)
+        # Файл закрывает вызывающий код, поэтому обертка только сбрасывает буфер и отсоединяется
+        text_file.flush()
+        text_file.detach()
+
+    def _load(self) -> MutableMapping[int, Book]:
+        if not os.path.exists(self.data_file):
+            with open(self.data_file, "wb") as file:
+                self._write_books(file, [])
+        books = self._empty_books()
+        try:
+            if self.lazy:
+                books = LazyBooks(self.data_file)
+            else:
+                with open(self.data_file, mode='rb') as file:
+                    for book in self._read_books(file):
+                        books[book.id] = book
+        except self.FORMAT_ERRORS:
+            books = self._empty_books()
+            metrics.increment('load_errors')
+            print(f"Ошибка при чтении файла {self.data_file}: некорректный формат {self.FORMAT_NAME}")
+        except FileNotFoundError:
+            print(f"Файл {self.data_file} не найден")
+        if self._journal is not None:
+            for record in self._journal.replay():
+                apply_record(books, record)
+        return books
+
+    def last_book_id(self, books: MutableMapping[int, Book]) -> int:
+        if isinstance(books, LazyBooks):
+            return books.last_book_id
+        return super().last_book_id(books)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._journal is not None and self._journal.records >= self.compact_threshold
+
+    def changed(self) -> bool:
+        if self._file_lock is None:
+            return False
+        if self._journal is None and os.path.exists(self._journal_path):
+            # Другой процесс открыл каталог с журналом: его записи читаются с начала, а свои дописываются туда же
+            self._journal = Journal(self._journal_path)
+        if self._file_stamp() != self._data_stamp:
+            return True
+        return self._journal is not None and self._journal.size() != self._journal.offset
+
+    def changes(self, books: MutableMapping[int, Book]) -> list[dict] | None:
+        """
+        Читает изменения других процессов.
+
+        Если файл данных не менялся, читаются только новые записи журнала. Иначе (другой процесс
+        сохранил каталог или свернул журнал) файл данных перечитывается, и возвращаются записи
+        только для отличающихся книг, а журнал проигрывается с начала. Ленивый каталог в этом
+        случае загружается заново.
+        """
+        if not self.changed():
+            return []
+        records = []
+        offset = self._journal.offset if self._journal is not None else 0
+        data_stamp = self._file_stamp()
+        if data_stamp != self._data_stamp:
+            if isinstance(books, LazyBooks):
+                return None
+            records = self._snapshot_changes(books)
+            self._data_stamp = data_stamp
+            offset = 0
+        if self._journal is not None:
+            records.extend(self._journal.replay(offset))
+        return records
+
+    def _snapshot_changes(self, books: MutableMapping[int, Book]) -> list[dict]:
+        """
+        Сравнивает файл данных с загруженными книгами и возвращает записи об отличиях.
+        """
+        records = []
+        book_ids = set()
+        try:
+            with open(self.data_file, mode='rb') as file:
+                for loaded in self._read_books(file):
+                    book_ids.add(loaded.id)
+                    book = books.get(loaded.id)
+                    if book is None or book != loaded:
+                        records.append({'op': 'add', 'book': loaded.to_dict()})
+        except (*self.FORMAT_ERRORS, FileNotFoundError):
+            print(f"Ошибка при чтении файла {self.data_file}: некорректный формат {self.FORMAT_NAME}")
+            return []
+        records.extend({'op': 'remove', 'id': book_id} for book_id in books if book_id not in book_ids)
+        return records
+
+    def write(self, books: MutableMapping[int, Book], records: list[dict]) -> None:
+        """
+        Дописывает изменения в журнал одной записью или перезаписывает файл данных.
+        """
+        if self._journal is None:
+            self.save_books(books)
+            return
+        self._append(records)
+        if self.needs_compaction:
+            self.compact(books)
+
+    def _append(self, records: list[dict]) -> None:
+        # Пакет записывается одной строкой, поэтому при сбое он не применится частично
+        self._journal.append(records[0] if len(records) == 1 else {'op': 'batch', 'records': records})
+
+    def prepare_write(self, books: MutableMapping[int, Book], records: list[dict]) -> Callable[[], None]:
+        """
+        Записи журнала не ссылаются на книги, поэтому для дописывания в журнал ничего не снимается.
+        Для перезаписи файла данных снимаются копии книг: статус книги меняется на месте.
+        """
+        if self._journal is not None and self._journal.records + 1 < self.compact_threshold:
+            return partial(self._append, records)
+        if isinstance(books, LazyBooks):
+            return super().prepare_write(books, records)
+        with self.lock:
+            snapshot = [Book(book.id, book.title, book.author, book.year, book.status) for book in books.values()]
+        return partial(self._write_snapshot, records, snapshot)
+
+    def _write_snapshot(self, records: list[dict], snapshot: list[Book]) -> None:
+        if self._journal is None:
+            self.save(snapshot)
+            return
+        self._append(records)
+        self.save(snapshot)
+        self._journal.truncate()
+
+    def save_books(self, books: MutableMapping[int, Book]) -> None:
+        """
+        Сохраняет снимок загруженных книг в файл данных.
+        """
+        with self.lock:
+            if isinstance(books, LazyBooks):
+                save_with_index(self.data_file, books.values(), books.last_book_id)
+                books.reload()
+                self._data_stamp = self._file_stamp()
+                return
+            # Под блокировкой снимается только список книг, сериализация идет без нее
+            snapshot = list(books.values())
+        self.save(snapshot)
+
+    def save(self, books: Iterable[Book]) -> None:
+        with atomic_write(self.data_file, 'wb') as file:
+            self._write_books(file, books)
+            metrics.observe('save_bytes', file.tell(), SIZE_BUCKETS)
+        self._data_stamp = self._file_stamp()
+
+    def compact(self, books: MutableMapping[int, Book]) -> None:
+        """
+        Сворачивает журнал в снимок файла данных и очищает журнал.
+        """
+        self.save_books(books)
+        if self._journal is not None:
+            self._journal.truncate()
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+        if self._file_lock is not None:
+            self._file_lock.close()
+
+
+def apply_record(books: MutableMapping[int, Book], record: dict) -> None:
+    """
+    Применяет запись журнала к словарю книг.
+
+    Применение идемпотентно: повторное проигрывание журнала поверх снимка,
+    в который он уже свернут, не меняет результат.
+    """
+    operation = record['op']
+    if operation == 'batch':
+        for batch_record in record['records']:
+            apply_record(books, batch_record)
+    elif operation == 'add':
+        book = Book.from_dict(record['book'])
+        books[book.id] = book
+    elif operation == 'remove':
+        books.pop(record['id'], None)
+    elif operation == 'status':
+        book = books.get(record['id'])
+        if book is not None:
+            book.status = BookStatus(record['status'])
+            books[book.id] = book
+
+
+def open_storage(data_file: str, **options) -> BooksStorage:
+    """
+    Открывает хранилище, выбирая его по расширению файла.
+
+    Файлы с расширениями SQLITE_EXTENSIONS открываются как база SQLite, SNAPSHOT_EXTENSIONS -
+    как двоичный снимок, директории и пути с расширениями SHARDED_EXTENSIONS - как шардированный
+    каталог, остальные - как JSON.
+    Параметры options передаются JsonStorage, SnapshotStorage или ShardedStorage и игнорируются для SQLite.
+    """
+    extension = os.path.splitext(data_file)[1].lower()
+    # Импорт здесь, так как sqlite_storage, snapshot и sharded_storage сами зависят от этого модуля
+    if extension in SQLITE_EXTENSIONS:
+        from sqlite_storage import SqliteStorage
+        return SqliteStorage(data_file)
+    if extension in SNAPSHOT_EXTENSIONS:
+        from snapshot import SnapshotStorage
+        return SnapshotStorage(data_file, **options)
+    if extension in SHARDED_EXTENSIONS or os.path.isdir(data_file):
+        from sharded_storage import ShardedStorage
+        return ShardedStorage(data_file, **options)
+    return JsonStorage(data_file, **options)
@@ -0,0 +1,177 @@
+import re
+from bisect import bisect_left
+
+from models import Book
+
+
+class TextIndex:
+    """
+    Инвертированный индекс слов из названий и авторов книг.
+
+    Каждое слово (терм) указывает на ID книг, в которых оно встречается, с весом совпадения:
+    слово из названия весит больше, чем слово из имени автора.
+    Для поиска по началу слова поддерживается отсортированный список термов,
+    для поиска по подстроке - опциональный индекс триграмм.
+
+    Атрибуты:
+    - trigrams: Включен ли индекс триграмм для поиска по подстроке.
+    """
+
+    FIELD_WEIGHTS = (('title', 2), ('author', 1))
+    TOKEN_PATTERN = re.compile(r'\w+')
+
+    def __init__(self, trigrams: bool = False):
+        self.trigrams = trigrams
+        self._postings: dict[str, dict[int, int]] = {}
+        self._terms: list[str] = []
+        self._terms_sorted = True
+        self._trigrams: dict[str, set[str]] = {}
+
+    @classmethod
+    def tokenize(cls, text: str) -> list[str]:
+        return cls.TOKEN_PATTERN.findall(str(text).lower())
+
+    @staticmethod
+    def _term_trigrams(term: str) -> set[str]:
+        return {term[i:i + 3] for i in range(len(term) - 2)}
+
+    def _book_terms(self, book: Book) -> dict[str, int]:
+        terms = {}
+        for field, weight in self.FIELD_WEIGHTS:
+            for term in self.tokenize(getattr(book, field)):
+                terms[term] = terms.get(term, 0) + weight
+        return terms
+
+    def add(self, book: Book) -> None:
+        for term, weight in self._book_terms(book).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                # Список термов сортируется при первом обращении, а не при каждом добавлении
+                self._terms.append(term)
+                self._terms_sorted = False
+                if self.trigrams:
+                    for trigram in self._term_trigrams(term):
+                        self._trigrams.setdefault(trigram, set()).add(term)
+            postings[book.id] = weight
+
+    def discard(self, book: Book) -> None:
+        for term in self._book_terms(book):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(book.id, None)
+            if postings:
+                continue
+            del self._postings[term]
+            self._sort_terms()
+            del self._terms[bisect_left(self._terms, term)]
+            if self.trigrams:
+                for trigram in self._term_trigrams(term):
+                    terms = self._trigrams[trigram]
+                    terms.discard(term)
+                    if not terms:
+                        del self._trigrams[trigram]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._terms.clear()
+        self._terms_sorted = True
+        self._trigrams.clear()
+
+    def _sort_terms(self) -> None:
+        if not self._terms_sorted:
+            # Новый список вместо сортировки на месте: параллельные читатели видят либо старый,
+            # либо уже отсортированный список
+            self._terms = sorted(self._terms)
+            self._terms_sorted = True
+
+    def _prefix_terms(self, prefix: str) -> list[str]:
+        self._sort_terms()
+        start = bisect_left(self._terms, prefix)
+        end = bisect_left(self._terms, prefix + '\U0010ffff', start)
+        return self._terms[start:end]
+
+    def _substring_terms(self, fragment: str) -> list[str]:
+        if len(fragment) < 3 or not self.trigrams:
+            # Для коротких фрагментов триграмм нет - проверяются все термы
+            return [term for term in self._terms if fragment in term]
+        candidates = None
+        for trigram in sorted(self._term_trigrams(fragment), key=lambda item: len(self._trigrams.get(item, ()))):
+            terms = self._trigrams.get(trigram)
+            if not terms:
+                return []
+            candidates = set(terms) if candidates is None else candidates & terms
+        return [term for term in candidates if fragment in term]
+
+    def _prefix_postings(self, query: str) -> list[list[dict[int, int]]]:
+        return [[self._postings[term] for term in self._prefix_terms(token)] for token in self.tokenize(query)]
+
+    def estimate_prefix(self, query: str) -> int:
+        """
+        Оценивает сверху количество книг, найденных prefix_ids, не объединяя списки ID.
+        """
+        return min((sum(map(len, postings)) for postings in self._prefix_postings(query)), default=0)
+
+    def prefix_ids(self, query: str) -> set[int]:
+        """
+        Возвращает ID книг, в которых каждое слово запроса - начало какого-либо слова названия или автора.
+        Списки ID слов запроса пересекаются, начиная с самого короткого.
+        """
+        token_postings = sorted(self._prefix_postings(query), key=lambda postings: sum(map(len, postings)))
+        if not token_postings:
+            return set()
+        book_ids = None
+        for postings in token_postings:
+            token_ids = set().union(*postings)
+            book_ids = token_ids if book_ids is None else book_ids & token_ids
+            if not book_ids:
+                break
+        return book_ids
+
+    def search(self, query: str, mode: str = 'prefix', offset: int = 0, limit: int | None = None) -> tuple[list[int], int]:
+        """
+        Ищет книги, в которых каждое слово запроса совпадает с каким-либо словом названия или автора.
+
+        Параметры:
+        - query (str): Строка запроса.
+        - mode (str): 'word' - совпадение слова целиком, 'prefix' - по началу слова, 'substring' - по подстроке.
+        - offset (int): Количество пропускаемых результатов.
+        - limit (int | None): Максимальное количество результатов.
+
+        Возвращает:
+        - Кортеж из списка ID книг (по убыванию релевантности, затем по ID) и общего количества найденных книг.
+        """
+        tokens = self.tokenize(query)
+        if not tokens:
+            return [], 0
+
+        scores = None
+        for token in tokens:
+            if mode == 'word':
+                terms = [token] if token in self._postings else []
+            elif mode == 'prefix':
+                terms = self._prefix_terms(token)
+            elif mode == 'substring':
+                terms = self._substring_terms(token)
+            else:
+                raise ValueError(f"Неизвестный режим поиска {mode}")
+
+            token_scores = {}
+            for term in terms:
+                # Точное совпадение слова ценится выше частичного
+                factor = 2 if term == token else 1
+                for book_id, weight in self._postings[term].items():
+                    token_scores[book_id] = max(token_scores.get(book_id, 0), weight * factor)
+
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {book_id: score + token_scores[book_id]
+                          for book_id, score in scores.items() if book_id in token_scores}
+            if not scores:
+                return [], 0
+
+        ranked = sorted(scores, key=lambda book_id: (-scores[book_id], book_id))
+        end = None if limit is None else offset + limit
+        return ranked[offset:end], len(ranked)
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analytics import np
+from books_manager import BooksManager
+from models import Book, BookStatus
+
+
+@unittest.skipIf(np is None, "numpy не установлен")
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных.
+        - Инициализируется BooksManager с аналитикой.
+        - Добавляются книги для тестирования агрегатов.
+        """
+        self.data_file = 'test_analytics.json'
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+        self.books_manager = BooksManager(self.data_file, analytics=True)
+        self.books_manager.add_books([
+            Book(1, "The Great Gatsby", "F. Scott Fitzgerald", 1925, BookStatus.ISSUED),
+            Book(2, "Tender Is the Night", "F. Scott Fitzgerald", 1934),
+            Book(3, "Moby Dick", "Herman Melville", 1851, BookStatus.ISSUED),
+            Book(4, "Billy Budd", "Herman Melville", 1924),
+        ])
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляется временный файл данных.
+        """
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+    def test_aggregates(self):
+        """
+        Количество, группировки и гистограмма с фильтрами.
+        """
+        self.assertEqual(4, self.books_manager.count_books())
+        self.assertEqual(2, self.books_manager.count_books(year_low=1920, year_high=1930))
+        self.assertEqual(1, self.books_manager.count_books(status=BookStatus.ISSUED, author="Herman Melville"))
+        self.assertEqual(0, self.books_manager.count_books(author="Unknown"))
+
+        self.assertEqual({1850: 1, 1920: 2, 1930: 1}, self.books_manager.group_counts('decade'))
+        self.assertEqual({1800: 1, 1900: 3}, self.books_manager.year_histogram(100))
+        self.assertEqual({BookStatus.AVAILABLE: 2, BookStatus.ISSUED: 2}, self.books_manager.group_counts('status'))
+        self.assertEqual({"F. Scott Fitzgerald": 1}, self.books_manager.group_counts('author', year_low=1930))
+        self.assertEqual({"F. Scott Fitzgerald": 0.5, "Herman Melville": 0.5},
+                         self.books_manager.status_ratio_by_author())
+        with self.assertRaises(ValueError):
+            self.books_manager.group_counts('title')
+
+    def test_incremental(self):
+        """
+        Представление обновляется при добавлении, удалении и изменении статуса книг.
+        """
+        self.books_manager.update_status(2, BookStatus.ISSUED)
+        self.books_manager.remove_book(3)
+        self.books_manager.add_book(Book(5, "Typee", "Herman Melville", 1846))
+
+        self.assertEqual({BookStatus.AVAILABLE: 2, BookStatus.ISSUED: 2}, self.books_manager.group_counts('status'))
+        self.assertEqual({"F. Scott Fitzgerald": 1.0, "Herman Melville": 0.0},
+                         self.books_manager.status_ratio_by_author())
+        self.assertEqual({1840: 1, 1920: 2, 1930: 1}, self.books_manager.year_histogram())
+
+        self.books_manager.add_books(Book(book_id, "Book", "Author", 2000) for book_id in range(6, 3000))
+        self.assertEqual(2994, self.books_manager.count_books(year_low=2000))
+
+        with self.assertRaises(ValueError):
+            BooksManager(self.data_file).count_books()
+
+
+if __name__ == "__main__":
+    unittest.main()
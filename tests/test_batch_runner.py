@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+import unittest
+from io import StringIO
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from batch_runner import BatchRunner
+from books_manager import BooksManager
+from models import BookStatus
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных и журнал.
+        """
+        self.data_file = 'test_batch_runner.json'
+        self.tearDown()
+        self.books_manager = BooksManager(self.data_file, journal=True)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются файл данных и журнал.
+        """
+        for path in (self.data_file, f'{self.data_file}.log'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def run_commands(self, *commands, batch_size=10000) -> list[dict]:
+        lines = [command if isinstance(command, str) else json.dumps(command, ensure_ascii=False)
+                 for command in commands]
+        output = StringIO()
+        count = BatchRunner(self.books_manager, batch_size).run(StringIO('\n'.join(lines)), output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(count, len(results))
+        return results
+
+    def test_commands(self):
+        """
+        Команды выполняются по порядку, результаты выводятся построчно.
+        """
+        results = self.run_commands(
+            {'op': 'add', 'title': "Moby Dick", 'author': "Herman Melville", 'year': 1851, 'request_id': 'a'},
+            {'op': 'add', 'title': "1984", 'author': "George Orwell", 'year': 1949},
+            {'op': 'update_status', 'id': 1, 'status': "Выдана"},
+            {'op': 'search', 'field': 'author', 'query': "george orwell"},
+            {'op': 'search', 'field': 'text', 'query': "moby"},
+            {'op': 'remove', 'id': 2},
+            {'op': 'list'},
+        )
+        self.assertEqual({'request_id': 'a', 'id': 1, 'ok': True}, results[0])
+        self.assertEqual(2, results[1]['id'])
+        self.assertEqual([2], [book['id'] for book in results[3]['books']])
+        self.assertEqual(1, results[4]['total'])
+        self.assertEqual([{'id': 1, 'title': "Moby Dick", 'author': "Herman Melville", 'year': 1851,
+                           'status': "Выдана"}], results[6]['books'])
+        self.assertTrue(all(result['ok'] for result in results))
+
+    def test_errors(self):
+        """
+        Ошибочные команды не прерывают выполнение остальных.
+        """
+        results = self.run_commands(
+            '{bad json',
+            {'op': 'remove', 'id': 5},
+            {'op': 'unknown'},
+            {'op': 'add', 'title': "1984"},
+            {'op': 'add', 'title': "1984", 'author': "George Orwell", 'year': "1949"},
+            {'op': 'update_status', 'id': 1, 'status': "Потеряна"},
+            {'op': 'add', 'title': "1984", 'author': "George Orwell", 'year': 1949},
+        )
+        self.assertEqual([False] * 6 + [True], [result['ok'] for result in results])
+        self.assertEqual("Книга с ID 5 не найдена", results[1]['error'])
+        self.assertEqual(1, len(self.books_manager.books))
+
+    def test_grouped_adds(self):
+        """
+        Подряд идущие команды add выполняются одним вызовом add_books, а следующая команда уже видит книги.
+        """
+        commands = [{'op': 'add', 'title': f"Book {number}", 'author': "Author", 'year': 2000, 'request_id': number}
+                    for number in range(5)]
+        commands[2] = {'op': 'add', 'title': "Book 2", 'author': "Author", 'year': "2000"}
+        commands.append({'op': 'update_status', 'id': 4, 'status': "Выдана"})
+        commands.append({'op': 'add', 'title': "Book 5", 'author': "Author", 'year': 2000})
+        with mock.patch.object(self.books_manager, 'add_book', side_effect=AssertionError), \
+                mock.patch.object(self.books_manager, 'add_books', wraps=self.books_manager.add_books) as add_books:
+            results = self.run_commands(*commands)
+        self.assertEqual(2, add_books.call_count)
+        self.assertEqual([{'request_id': 0, 'id': 1, 'ok': True}, {'request_id': 1, 'id': 2, 'ok': True}],
+                         results[:2])
+        self.assertFalse(results[2]['ok'])
+        self.assertEqual([3, 4], [result['id'] for result in results[3:5]])
+        self.assertEqual([True, True], [result['ok'] for result in results[5:]])
+        self.assertEqual({'id': 5, 'ok': True}, results[6])
+        self.assertEqual(BookStatus.ISSUED, self.books_manager.books[4].status)
+
+    def test_unexpected_errors(self):
+        """
+        Любая ошибка команды откатывает только ее изменения, а результаты остальных команд группы выводятся.
+        """
+        with mock.patch.object(self.books_manager, '_set_status', side_effect=RuntimeError("сбой")):
+            results = self.run_commands(
+                {'op': 'add', 'title': "1984", 'author': "George Orwell", 'year': 1949},
+                {'op': 'search', 'field': 'author', 'query': "George Orwell"},
+                {'op': 'add', 'title': "Animal Farm", 'author': "George Orwell", 'year': 1945},
+                {'op': 'add', 'title': "Future", 'author': "Nobody", 'year': 10 ** 7},
+                {'op': 'add', 'title': "Burmese Days", 'author': "George Orwell", 'year': 1934},
+                {'op': 'update_status', 'id': 2, 'status': "Выдана"},
+            )
+        self.assertEqual([True, True, True, False, True, False], [result['ok'] for result in results])
+        self.assertEqual(1, results[1]['total'])
+        self.assertEqual([2, 3], [results[2]['id'], results[4]['id']])
+        self.assertIn("сбой", results[5]['error'])
+
+        self.books_manager.close()
+        books_manager = BooksManager(self.data_file, journal=True)
+        self.assertEqual([1, 2, 3], list(books_manager.books))
+        self.assertEqual(BookStatus.AVAILABLE, books_manager.books[2].status)
+
+    def test_grouped_persistence(self):
+        """
+        Изменения каждой группы команд сохраняются одной записью журнала.
+        """
+        commands = [{'op': 'add', 'title': f"Book {number}", 'author': "Author", 'year': 2000}
+                    for number in range(10)]
+        self.run_commands(*commands, batch_size=4)
+        with open(f'{self.data_file}.log', encoding='utf-8') as file:
+            self.assertEqual(3, len(file.readlines()))
+
+        self.books_manager.close()
+        books_manager = BooksManager(self.data_file, journal=True)
+        self.assertEqual(list(range(1, 11)), list(books_manager.books))
+        self.assertEqual(BookStatus.AVAILABLE, books_manager.books[10].status)
+
+
+if __name__ == "__main__":
+    unittest.main()
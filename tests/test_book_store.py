@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from book_store import BookStore
+from books_manager import BooksManager
+from models import Book, BookStatus
+
+
+class TestBookStore(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается колоночное хранилище с тремя книгами.
+        """
+        self.store = BookStore()
+        self.book1 = Book(1, "The Great Gatsby", "F. Scott Fitzgerald", 1925, BookStatus.AVAILABLE)
+        self.book2 = Book(2, "Tender Is the Night", "F. Scott Fitzgerald", 1934, BookStatus.ISSUED)
+        self.book3 = Book(5, "Moby Dick", "Herman Melville", 1851, BookStatus.AVAILABLE)
+        for book in (self.book1, self.book3, self.book2):
+            self.store[book.id] = book
+
+    def test_views(self):
+        """
+        Хранилище возвращает представления книг, упорядоченные по ID.
+        """
+        self.assertEqual([1, 2, 5], list(self.store))
+        self.assertEqual([self.book1, self.book2, self.book3], list(self.store.values()))
+        self.assertEqual(str(self.book2), str(self.store[2]))
+        self.assertEqual(self.book3.to_dict(), self.store[5].to_dict())
+
+    def test_update_and_delete(self):
+        """
+        Проверяется обновление статуса и удаление книги.
+        """
+        self.store.set_status(1, BookStatus.ISSUED)
+        self.assertEqual(BookStatus.ISSUED, self.store[1].status)
+
+        del self.store[2]
+        self.assertNotIn(2, self.store)
+        self.assertEqual(2, len(self.store))
+        with self.assertRaises(KeyError):
+            self.store[2]
+
+    def test_interned_strings(self):
+        """
+        Одинаковые имена авторов хранятся один раз.
+        """
+        self.assertEqual(2, len(self.store._authors))
+
+
+class TestColumnarManager(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных.
+        """
+        self.data_file = 'test_book_store.json'
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляется временный файл данных.
+        """
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+    def test_round_trip(self):
+        """
+        BooksManager в колоночном режиме сохраняет и загружает книги, обновляет статус.
+        """
+        books_manager = BooksManager(self.data_file, columnar=True)
+        books_manager.add_book(Book(1, "Moby Dick", "Herman Melville", 1851))
+        books_manager.add_book(Book(2, "Billy Budd", "Herman Melville", 1924))
+        books_manager.update_status(2, BookStatus.ISSUED)
+
+        books_manager = BooksManager(self.data_file, columnar=True)
+        self.assertIsInstance(books_manager.books, BookStore)
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[2].status)
+        self.assertEqual([1, 2], [book.id for book in books_manager.search_books('author', "herman melville")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import commands
+from json_stream import count_key
+from models import Book, BookStatus
+from storage import JsonStorage, open_storage
+
+MAIN = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/main.py'))
+# Модули, которые не должны импортироваться при запуске коротких команд
+HEAVY_MODULES = {'books_manager', 'books_handler', 'batch_runner', 'analytics', 'numpy', 'sqlite3',
+                 'multiprocessing', 'concurrent.futures'}
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создаются файлы каталога в JSON, двоичном снимке и SQLite с одинаковыми книгами.
+        """
+        self.data_file = 'test_cli.json'
+        self.data_files = [self.data_file, 'test_cli.snap', 'test_cli.db']
+        self.tearDown()
+        self.books = [Book(1, "Moby Dick", "Herman Melville", 1851, BookStatus.ISSUED),
+                      Book(2, "Typee", "Herman Melville", 1846),
+                      Book(3, "Walden", 'Henry "David" Thoreau', 1854)]
+        for data_file in self.data_files:
+            storage = open_storage(data_file)
+            storage.save(self.books)
+            storage.close()
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются временные файлы.
+        """
+        for data_file in self.data_files:
+            for path in (data_file, f'{data_file}.lock', f'{data_file}.log', f'{data_file}-wal', f'{data_file}-shm'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def run_main(self, *arguments: str, importtime: bool = False) -> subprocess.CompletedProcess:
+        options = ['-X', 'importtime'] if importtime else []
+        return subprocess.run([sys.executable, *options, MAIN, '--file', self.data_file, *arguments],
+                              capture_output=True, text=True, encoding='utf-8')
+
+    def test_commands(self):
+        """
+        Команды добавляют, ищут, считают, меняют статус и удаляют книги без меню и ввода.
+        """
+        # Название и автор нормализуются, а год издания проверяется так же, как в меню
+        self.assertEqual("4", self.run_main('add', " omoo ", "herman melville", "1847").stdout.strip())
+        result = self.run_main('add', "Future", "Nobody", "3000")
+        self.assertEqual(1, result.returncode)
+        self.assertIn("Год издания должен быть числом от 1 до", result.stderr)
+        self.assertEqual("4", self.run_main('count').stdout.strip())
+        # Файл блокировки создается только в режиме общего доступа
+        self.assertFalse(os.path.exists(f'{self.data_file}.lock'))
+
+        result = self.run_main('--shared', 'status', '4', 'issued')
+        self.assertTrue(os.path.exists(f'{self.data_file}.lock'))
+        self.assertEqual((0, "Статус книги с ID 4 обновлен на Выдана"), (result.returncode, result.stdout.strip()))
+        self.assertEqual("2", self.run_main('count', '--status', 'Выдана').stdout.strip())
+
+        found = self.run_main('search', '--author', "herman melville").stdout.splitlines()
+        self.assertEqual([str(book) for book in self.books[:2]] + [str(Book(4, "Omoo", "Herman Melville", 1847,
+                                                                              BookStatus.ISSUED))], found)
+        self.assertEqual([str(self.books[1]), str(self.books[2])],
+                         self.run_main('search', '--status', 'available').stdout.splitlines())
+
+        self.assertEqual(0, self.run_main('remove', '4').returncode)
+        result = self.run_main('remove', '4')
+        self.assertEqual((1, "Книга с ID 4 не найдена"), (result.returncode, result.stderr.strip()))
+        self.assertEqual(1, self.run_main('status', '1', 'lost').returncode)
+        self.assertEqual(2, self.run_main('search').returncode)
+
+    def test_batch_arguments(self):
+        """
+        --batch принимает файл команд и необязательный файл данных (иначе берется --file), лишние аргументы
+        отклоняются.
+        """
+        result = subprocess.run([sys.executable, MAIN, '--file', self.data_file, '--batch', '-'],
+                                input='{"op": "search", "field": "title", "query": "typee"}\n',
+                                capture_output=True, text=True, encoding='utf-8')
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertIn("Typee", result.stdout)
+
+        result = self.run_main('--batch', '-', self.data_file, 'extra')
+        self.assertEqual(2, result.returncode)
+        self.assertIn("--batch", result.stderr)
+
+    def test_count_without_load(self):
+        """
+        Количество книг считается по заголовку снимка, таблице SQLite или ключам JSON без загрузки книг.
+        """
+        with mock.patch.object(JsonStorage, 'load', side_effect=AssertionError):
+            for data_file in self.data_files:
+                self.assertEqual(3, commands.count_books(data_file), data_file)
+        self.assertEqual(1, commands.count_books('test_cli.db', BookStatus.ISSUED))
+        self.assertEqual(0, commands.count_books('test_cli_missing.snap'))
+
+        # Граница частей чтения приходится на середину ключа
+        with open(self.data_file, mode='rb') as file:
+            self.assertEqual(3, count_key(file, 'id', chunk_size=7))
+
+    def test_journal(self):
+        """
+        Команды учитывают изменения, дописанные в журнал и еще не свернутые в файл данных.
+        """
+        storage = open_storage(self.data_file, journal=True)
+        books = storage.load()
+        books[4] = Book(4, "Omoo", "Herman Melville", 1847)
+        storage.write(books, [{'op': 'add', 'book': books[4].to_dict()}, {'op': 'remove', 'id': 3}])
+        storage.close()
+        self.assertTrue(os.path.getsize(f'{self.data_file}.log'))
+
+        self.assertEqual(3, commands.count_books(self.data_file))
+        self.assertEqual([books[4]], commands.search_books(self.data_file, 'title', "omoo"))
+        self.assertEqual([], commands.search_books(self.data_file, 'title', "walden"))
+        self.assertEqual(5, commands.add_book(self.data_file, "Mardi", "Herman Melville", 1849))
+        commands.remove_book(self.data_file, 4)
+        storage = open_storage(self.data_file, journal=True)
+        self.assertEqual(["Moby Dick", "Typee", "Mardi"], [book.title for book in storage.load().values()])
+        storage.close()
+
+    def test_startup_imports(self):
+        """
+        По выводу python -X importtime короткие команды не импортируют менеджер, меню и пулы процессов.
+        """
+        for arguments in (('count',), ('search', '--title', "Typee")):
+            result = self.run_main(*arguments, importtime=True)
+            self.assertEqual(0, result.returncode, result.stderr)
+            imported = {line.split('|')[-1].strip() for line in result.stderr.splitlines()
+                        if line.startswith('import time:')}
+            self.assertIn('storage', imported)
+            self.assertEqual(set(), HEAVY_MODULES & imported, arguments)
+
+
+if __name__ == "__main__":
+    unittest.main()
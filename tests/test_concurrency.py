@@ -0,0 +1,230 @@
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from models import Book, BookStatus
+from rwlock import RWLock
+
+THREADS = 8
+OPERATIONS = 200
+
+
+def run_threads(*targets, timeout: float | None = None) -> None:
+    errors = []
+
+    def run(target):
+        try:
+            target()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run, args=(target,), daemon=True) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout)
+    if any(thread.is_alive() for thread in threads):
+        raise AssertionError("Потоки не завершились: взаимная блокировка")
+    if errors:
+        raise errors[0]
+
+
+class TestConcurrency(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных с журналом.
+        """
+        self.data_file = 'test_concurrency.json'
+        self.tearDown()
+        self.books_manager = BooksManager(self.data_file, journal=True, compact_threshold=10 ** 6)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются файл данных и журнал.
+        """
+        if hasattr(self, 'books_manager'):
+            self.books_manager.close()
+        for path in (self.data_file, f'{self.data_file}.log'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_concurrent_add(self):
+        """
+        ID, выделенные параллельно добавляющими потоками, не повторяются и сохраняются.
+        """
+        book_ids = [[] for _ in range(THREADS)]
+
+        def add(thread_ids):
+            for number in range(OPERATIONS):
+                thread_ids.append(self.books_manager.add_book(Book(None, f"Book {number}", "Author", 2000)))
+
+        run_threads(*(lambda ids=ids: add(ids) for ids in book_ids))
+
+        all_ids = sorted(book_id for ids in book_ids for book_id in ids)
+        self.assertEqual(list(range(1, THREADS * OPERATIONS + 1)), all_ids)
+        self.assertEqual(THREADS * OPERATIONS, self.books_manager.last_book_id)
+        self.books_manager.close()
+        self.books_manager = BooksManager(self.data_file, journal=True)
+        self.assertEqual(THREADS * OPERATIONS, len(self.books_manager.books))
+
+    def test_readers_and_writers(self):
+        """
+        Поиск и перебор снимка не ломаются, пока другие потоки добавляют, удаляют книги и меняют статусы.
+        """
+        self.books_manager.add_books(Book(book_id, f"Book {book_id}", "Author", 2000) for book_id in range(1, 101))
+
+        def write():
+            for number in range(OPERATIONS):
+                book_id = self.books_manager.add_book(Book(None, "Temporary", "Writer", 1999))
+                self.books_manager.update_status(book_id, BookStatus.ISSUED)
+                self.books_manager.remove_book(book_id)
+
+        def read():
+            for number in range(OPERATIONS):
+                self.assertEqual(100, len(self.books_manager.search_books('author', "author")))
+                found_books, total = self.books_manager.full_text_search("book")
+                self.assertEqual(100, total)
+                snapshot = self.books_manager.snapshot()
+                self.assertGreaterEqual(len(snapshot), 100)
+                self.assertTrue(all(book.author for book in snapshot))
+
+        run_threads(*[write] * 2, *[read] * (THREADS - 2))
+        self.assertEqual(list(range(1, 101)), sorted(self.books_manager.books))
+        self.assertEqual([], self.books_manager.search_books('author', "writer"))
+
+    def test_concurrent_transactions(self):
+        """
+        Транзакции разных потоков не смешиваются: откат одной не затрагивает другие.
+        """
+        def transfer(thread_number):
+            for number in range(OPERATIONS // 4):
+                try:
+                    with self.books_manager.transaction():
+                        self.books_manager.add_book(Book(None, f"Thread {thread_number}", "Author", 2000))
+                        if number % 2:
+                            raise RuntimeError("откат")
+                except RuntimeError:
+                    pass
+
+        run_threads(*(lambda number=number: transfer(number) for number in range(THREADS)))
+        self.assertEqual(THREADS * OPERATIONS // 8, len(self.books_manager.books))
+        self.assertEqual(len(self.books_manager.books), len(set(self.books_manager.books)))
+
+    def test_flush_during_transaction(self):
+        """
+        Сохранение из другого потока, в том числе фоновая запись, не блокируется транзакцией
+        и не сохраняет ее незавершенные изменения.
+        """
+        for write_behind in (None, 0.001):
+            with self.subTest(write_behind=write_behind):
+                self.tearDown()
+                self.books_manager = BooksManager(self.data_file, journal=True, compact_threshold=10 ** 6,
+                                                  write_behind=write_behind)
+                inside = threading.Event()
+                flushed = threading.Event()
+
+                def transfer():
+                    for number in range(OPERATIONS // 4):
+                        try:
+                            with self.books_manager.transaction():
+                                self.books_manager.add_book(Book(None, "Committed", "Author", 2000))
+                                self.books_manager.add_book(Book(None, "Rolled back" if number % 2 else "Committed",
+                                                                 "Author", 2000))
+                                if not number:
+                                    # Первая транзакция ждет сохранения из другого потока
+                                    inside.set()
+                                    flushed.wait(0.5)
+                                if number % 2:
+                                    raise RuntimeError("откат")
+                        except RuntimeError:
+                            pass
+
+                def flush():
+                    inside.wait(5)
+                    self.books_manager.flush()
+                    flushed.set()
+                    for _ in range(OPERATIONS):
+                        self.books_manager.flush()
+
+                run_threads(transfer, flush, timeout=30)
+                # Закрытие дожидается потока фоновой записи и сохраняет оставшиеся изменения
+                run_threads(self.books_manager.close, timeout=30)
+                self.books_manager = BooksManager(self.data_file, journal=True)
+                books = self.books_manager.books
+                self.assertEqual(OPERATIONS // 4, len(books))
+                self.assertEqual({"Committed"}, {book.title for book in books.values()})
+
+    def test_writes_during_flush(self):
+        """
+        Пока сохранение записывает файл данных, добавление книг не ждет его, а в файл попадает снимок,
+        снятый до этих добавлений.
+        """
+        self.tearDown()
+        self.books_manager = BooksManager(self.data_file, write_behind=3600)
+        self.books_manager.add_book(Book(None, "Before", "Author", 2000))
+        saving = threading.Event()
+        added = threading.Event()
+        save = self.books_manager._storage.save
+
+        def slow_save(books):
+            saving.set()
+            if not added.wait(5):
+                raise AssertionError("Добавление книги ждет окончания сохранения")
+            save(books)
+
+        def flush():
+            with mock.patch.object(self.books_manager._storage, 'save', side_effect=slow_save):
+                self.books_manager.flush()
+
+        def add():
+            saving.wait(5)
+            self.books_manager.add_book(Book(None, "During", "Author", 2000))
+            self.books_manager.update_status(1, BookStatus.ISSUED)
+            added.set()
+
+        run_threads(flush, add, timeout=30)
+        books = BooksManager(self.data_file).books
+        self.assertEqual([1], list(books))
+        self.assertEqual(BookStatus.AVAILABLE, books[1].status)
+
+
+class TestRWLock(unittest.TestCase):
+    def test_readers_share_writer_excludes(self):
+        """
+        Читатели работают одновременно, писатель - только один, без читателей.
+        """
+        lock = RWLock()
+        state = {'readers': 0, 'max_readers': 0, 'writers': 0}
+        counter = threading.Lock()
+        barrier = threading.Barrier(4)
+
+        def read():
+            with lock.read():
+                with counter:
+                    state['readers'] += 1
+                    state['max_readers'] = max(state['max_readers'], state['readers'])
+                barrier.wait(timeout=5)
+                with counter:
+                    state['readers'] -= 1
+
+        def write():
+            for _ in range(OPERATIONS):
+                with lock.write(), lock.write(), lock.read():
+                    self.assertEqual(0, state['readers'])
+                    state['writers'] += 1
+                    self.assertEqual(1, state['writers'])
+                    state['writers'] -= 1
+
+        run_threads(*[read] * 4)
+        self.assertEqual(4, state['max_readers'])
+        run_threads(*[write] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from http_service import BooksService
+from models import BookStatus
+
+
+class TestHttpService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Запускается сервис на свободном порту поверх временного файла данных.
+        """
+        self.data_file = 'test_http_service.json'
+        self.tearDown()
+        self.books_manager = BooksManager(self.data_file, journal=True, write_behind=60)
+        self.service = BooksService(self.books_manager)
+        self.server = await self.service.start('127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        """
+        Остановка сервиса после каждого теста.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.stop()
+        self.books_manager.close()
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются файл данных и журнал.
+        """
+        for path in (self.data_file, f'{self.data_file}.log'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def request(self, method: str, path: str, data: dict | None = None) -> tuple[int, dict]:
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        body = json.dumps(data).encode('utf-8') if data is not None else b''
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+                     .encode('latin-1') + body)
+        response = await reader.read()
+        writer.close()
+        head, _, content = response.partition(b'\r\n\r\n')
+        return int(head.split()[1]), json.loads(content)
+
+    async def test_endpoints(self):
+        """
+        Все маршруты работают и возвращают ожидаемые статусы.
+        """
+        book = {'title': "Moby Dick", 'author': "Herman Melville", 'year': 1851}
+        self.assertEqual((201, {'id': 1}), await self.request('POST', '/books', book))
+        self.assertEqual((200, {}), await self.request('PUT', '/books/1/status', {'status': "Выдана"}))
+
+        status, found = await self.request('GET', '/search?field=title&query=moby%20dick')
+        self.assertEqual((200, 1), (status, found['total']))
+        self.assertEqual("Выдана", found['books'][0]['status'])
+        self.assertEqual(1, (await self.request('GET', '/search?query=melv'))[1]['total'])
+        self.assertEqual("Moby Dick", (await self.request('GET', '/books/1'))[1]['title'])
+        self.assertEqual((200, {"В наличии": 0, "Выдана": 1}), await self.request('GET', '/status_counts'))
+        self.assertEqual(['counters', 'histograms'], sorted((await self.request('GET', '/metrics'))[1]))
+
+        self.assertEqual(400, (await self.request('POST', '/books', {'title': "1984"}))[0])
+        self.assertEqual(400, (await self.request('PUT', '/books/1/status', {'status': "Потеряна"}))[0])
+        self.assertEqual(404, (await self.request('DELETE', '/books/2'))[0])
+        self.assertEqual(404, (await self.request('GET', '/unknown'))[0])
+        self.assertEqual(405, (await self.request('PATCH', '/books'))[0])
+
+        await self.request('POST', '/books', {'title': "1984", 'author': "George Orwell", 'year': 1949})
+        status, found = await self.request('GET', '/books?after_id=1&limit=5')
+        self.assertEqual((200, 2, [2]), (status, found['total'], [book['id'] for book in found['books']]))
+
+        self.assertEqual(200, (await self.request('DELETE', '/books/1'))[0])
+        self.assertEqual(200, (await self.request('DELETE', '/books/2'))[0])
+        self.assertEqual((200, {'total': 0, 'books': []}), await self.request('GET', '/books'))
+
+    async def test_group_commit(self):
+        """
+        Одновременные изменения сохраняются общими записями журнала до ответа клиентам.
+        """
+        books = [{'title': f"Book {number}", 'author': "Author", 'year': 2000} for number in range(20)]
+        responses = await asyncio.gather(*(self.request('POST', '/books', book) for book in books))
+        self.assertEqual(list(range(1, 21)), sorted(body['id'] for _, body in responses))
+
+        with open(f'{self.data_file}.log', encoding='utf-8') as file:
+            self.assertLess(len(file.readlines()), 20)
+        await self.request('PUT', '/books/3/status', {'status': "Выдана"})
+        books_manager = BooksManager(self.data_file, journal=True)
+        self.assertEqual(20, len(books_manager.books))
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[3].status)
+
+    async def test_failed_change(self):
+        """
+        Неожиданная ошибка одного изменения группы откатывает и отклоняет только его.
+        """
+        await self.request('POST', '/books', {'title': "Moby Dick", 'author': "Herman Melville", 'year': 1851})
+        books = [{'title': f"Book {number}", 'author': "Author", 'year': 2000} for number in range(5)]
+        with mock.patch.object(self.books_manager, '_set_status', side_effect=RuntimeError("сбой")):
+            responses = await asyncio.gather(
+                *(self.request('POST', '/books', book) for book in books[:3]),
+                self.request('PUT', '/books/1/status', {'status': "Выдана"}),
+                *(self.request('POST', '/books', book) for book in books[3:]))
+        self.assertEqual([201, 201, 201, 500, 201, 201], [status for status, _ in responses])
+        self.assertEqual("сбой", responses[3][1]['error'])
+
+        self.assertEqual((200, {'В наличии': 6, 'Выдана': 0}), await self.request('GET', '/status_counts'))
+        self.books_manager.flush()
+        self.assertEqual(6, len(BooksManager(self.data_file, journal=True).books))
+
+
+if __name__ == "__main__":
+    unittest.main()
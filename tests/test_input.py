@@ -5,6 +5,7 @@ from io import StringIO
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
+from books_handler import BooksHandler
 from main import main
 from books_manager import BooksManager
 from models import Book, BookStatus
@@ -132,6 +133,9 @@ class TestMainInputOutput(unittest.TestCase):
         - Проверка поиска по названию.
         - Проверка поиска по автору.
         - Проверка поиска по году.
+        - Проверка полнотекстового поиска.
+        - Проверка поиска по диапазону годов.
+        - Проверка поиска по статусу.
         """
         # Проверка поиска по названию
         input_data = ["3\n", "INVALID_DATA\n", "1\n", "Moby Dick\n"]
@@ -145,6 +149,18 @@ class TestMainInputOutput(unittest.TestCase):
         input_data = ["1\n", "3\n", "3\n", "1925\n"]
         self.fake_input.writelines(input_data)
 
+        # Проверка полнотекстового поиска по части названия и автора
+        input_data = ["1\n", "3\n", "4\n", "moby mel\n"]
+        self.fake_input.writelines(input_data)
+
+        # Проверка поиска по диапазону годов
+        input_data = ["1\n", "3\n", "5\n", "1900-1930\n"]
+        self.fake_input.writelines(input_data)
+
+        # Проверка поиска по статусу
+        input_data = ["1\n", "3\n", "7\n", "1\n"]
+        self.fake_input.writelines(input_data)
+
         self.fake_input.write("2\n")  # Выход из программы
         self.fake_input.seek(0)
 
@@ -156,16 +172,16 @@ class TestMainInputOutput(unittest.TestCase):
         # Проверяем сообщения об ошибке
         expected_output = [
             "Ошибка",
-            "Введите число от 1 до 3",
+            "Введите число от 1 до 7",
         ]
-        self.assertEqual(expected_output, output[11:13])
+        self.assertEqual(expected_output, output[15:17])
 
         # Проверяем результаты поиска по названию
         expected_output = [
             "Количество найденных книг: 1",
             str(self.book3),
         ]
-        self.assertEqual(expected_output, output[14:16])
+        self.assertEqual(expected_output, output[18:20])
 
         # Проверяем результаты поиска по автору
         expected_output = [
@@ -173,7 +189,7 @@ class TestMainInputOutput(unittest.TestCase):
             str(self.book1),
             str(self.book2),
         ]
-        self.assertEqual(expected_output, output[31:34])
+        self.assertEqual(expected_output, output[39:42])
 
         # Проверяем результаты поиска по году
         expected_output = [
@@ -181,7 +197,31 @@ class TestMainInputOutput(unittest.TestCase):
             str(self.book1),
             str(self.book3),
         ]
-        self.assertEqual(expected_output, output[49:52])
+        self.assertEqual(expected_output, output[61:64])
+
+        # Проверяем результаты полнотекстового поиска
+        expected_output = [
+            "Количество найденных книг: 1",
+            str(self.book3),
+        ]
+        self.assertEqual(expected_output, output[83:85])
+
+        # Проверяем результаты поиска по диапазону годов
+        expected_output = [
+            "Количество найденных книг: 2",
+            str(self.book1),
+            str(self.book3),
+        ]
+        self.assertEqual(expected_output, output[104:107])
+
+        # Проверяем результаты поиска по статусу
+        expected_output = [
+            "Количество найденных книг: 3",
+            str(self.book1),
+            str(self.book2),
+            str(self.book3),
+        ]
+        self.assertEqual(expected_output, output[128:132])
 
     def test_display_all(self):
         """
@@ -207,6 +247,54 @@ class TestMainInputOutput(unittest.TestCase):
         ]
         self.assertEqual(expected_output, output[-6:-3])
 
+    def test_display_pages(self):
+        """
+        Тест постраничного просмотра книг: следующая и предыдущая страница, переход к ID, неверная команда.
+        """
+        self.fake_input.writelines(["\n", "p\n", "x\n", "3\n", "q\n"])
+        self.fake_input.seek(0)
+
+        books_manager = BooksManager(self.data_file)
+        BooksHandler(books_manager, page_size=2).handle_display_books()
+
+        output = self.fake_output.getvalue().strip().splitlines()
+        prompt = "Enter - следующая страница, p - предыдущая, ID - перейти к книге, q - закончить просмотр:"
+        expected_output = [
+            str(self.book1), str(self.book2), prompt,
+            str(self.book3), prompt,
+            str(self.book1), str(self.book2), prompt,
+            "Неверная команда", prompt,
+            str(self.book3), prompt,
+        ]
+        self.assertEqual(expected_output, output)
+
+    def test_search_pages(self):
+        """
+        Тест постраничного вывода результатов поиска по диапазону и по статусу.
+        """
+        self.fake_input.writelines(["5\n", "1900-1950\n", "\n", "\n", "x\n", "p\n", "q\n",
+                                    "7\n", "1\n", "\n", "q\n"])
+        self.fake_input.seek(0)
+
+        books_handler = BooksHandler(BooksManager(self.data_file), page_size=2)
+        books_handler.handle_search_book()
+        books_handler.handle_search_book()
+
+        output = self.fake_output.getvalue().strip().splitlines()
+        prompt = "Enter - следующая страница, p - предыдущая, q - закончить просмотр:"
+        page_1 = [str(self.book1), str(self.book3)]
+        expected_output = [
+            'Количество найденных книг: 3', *page_1, prompt,
+            str(self.book2), prompt,
+            "Книг на этой странице нет", prompt,
+            "Неверная команда", prompt,
+            *page_1, prompt,
+        ]
+        start = output.index(expected_output[0])
+        self.assertEqual(expected_output, output[start:start + len(expected_output)])
+        self.assertEqual(['Количество найденных книг: 3', str(self.book1), str(self.book2), prompt,
+                          str(self.book3), prompt], output[-6:])
+
     def test_status_update(self):
         """
          Тест обновления статуса книги:
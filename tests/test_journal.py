@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from models import Book, BookStatus
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных и журнал.
+        - Инициализируется BooksManager в режиме журнала.
+        """
+        self.data_file = 'test_journal.json'
+        self.log_file = f'{self.data_file}.log'
+        self.tearDown()
+        self.books_manager = BooksManager(self.data_file, journal=True)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются файл данных и журнал.
+        """
+        for path in (self.data_file, self.log_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_mutations_are_appended(self):
+        """
+        Изменения дописываются в журнал, файл данных не перезаписывается.
+        """
+        self.books_manager.add_book(Book(1, "Moby Dick", "Herman Melville", 1851))
+        self.books_manager.add_book(Book(2, "1984", "George Orwell", 1949))
+        self.books_manager.update_status(1, BookStatus.ISSUED)
+        self.books_manager.remove_book(2)
+
+        with open(self.data_file, encoding='utf-8') as file:
+            self.assertEqual([], json.load(file))
+        with open(self.log_file, encoding='utf-8') as file:
+            self.assertEqual(4, len(file.readlines()))
+
+        books_manager = BooksManager(self.data_file, journal=True)
+        self.assertEqual([1], list(books_manager.books))
+
+        # Следующая запись не склеивается с оборванной строкой и не теряется
+        books_manager.add_book(Book(3, "Typee", "Herman Melville", 1846))
+        books_manager.close()
+        self.assertEqual([1, 3], list(BooksManager(self.data_file, journal=True).books))
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[1].status)
+
+    def test_compact(self):
+        """
+        Журнал сворачивается в снимок при достижении порога и остается читаемым без журнала.
+        """
+        books_manager = BooksManager(self.data_file, journal=True, compact_threshold=3)
+        for book_id in range(1, 4):
+            books_manager.add_book(Book(book_id, f"Title {book_id}", "Author", 2000))
+
+        self.assertEqual(0, os.path.getsize(self.log_file))
+        self.assertEqual([1, 2, 3], list(BooksManager(self.data_file).books))
+
+    def test_torn_tail_is_skipped(self):
+        """
+        Оборванная последняя запись журнала игнорируется при загрузке.
+        """
+        self.books_manager.add_book(Book(1, "Moby Dick", "Herman Melville", 1851))
+        with open(self.log_file, mode='a', encoding='utf-8') as file:
+            file.write('{"op":"add","book":{"id":2,')
+
+        books_manager = BooksManager(self.data_file, journal=True)
+        self.assertEqual([1], list(books_manager.books))
+
+        # Следующая запись не склеивается с оборванной строкой и не теряется
+        books_manager.add_book(Book(3, "Typee", "Herman Melville", 1846))
+        books_manager.close()
+        self.assertEqual([1, 3], list(BooksManager(self.data_file, journal=True).books))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import os
+import sys
+import unittest
+from io import BytesIO, StringIO
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from json_stream import iter_json_array
+from models import Book
+
+
+class TestJsonStream(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Формируется JSON-массив из нескольких книг в формате файла данных.
+        - Перенаправляется вывод сообщений об ошибках.
+        """
+        books = [Book(book_id, f"Книга {book_id}", "Автор", 2000).to_dict() for book_id in range(1, 6)]
+        self.data = json.dumps(books, ensure_ascii=False, indent=4).encode('utf-8')
+        self.data_file = 'test_json_stream.json'
+        self.stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляется временный файл данных.
+        - Восстанавливается вывод.
+        """
+        sys.stdout = self.stdout
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+    def test_small_chunks(self):
+        """
+        Элементы, разрезанные между фрагментами (в том числе посреди UTF-8 символа), разбираются корректно.
+        """
+        elements = list(iter_json_array(BytesIO(self.data), chunk_size=7))
+        self.assertEqual(json.loads(self.data), elements)
+
+    def test_truncated_tail(self):
+        """
+        Оборванный конец файла: без recover - ошибка, с recover - загружаются целые элементы.
+        """
+        data = self.data[:-60]
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(BytesIO(data), chunk_size=16))
+
+        elements = list(iter_json_array(BytesIO(data), recover=True, chunk_size=16))
+        self.assertEqual([1, 2, 3, 4], [element['id'] for element in elements])
+
+    def test_corrupt_element(self):
+        """
+        Поврежденный элемент в середине массива пропускается в режиме recover.
+        """
+        data = self.data.replace(b'"id": 3,', b'"id": 3,,')
+        elements = list(iter_json_array(BytesIO(data), recover=True))
+        self.assertEqual([1, 2, 4, 5], [element['id'] for element in elements])
+
+    def test_manager_recover_and_progress(self):
+        """
+        BooksManager сохраняет прочитанные книги при recover=True и сообщает о прогрессе загрузки.
+        """
+        with open(self.data_file, 'wb') as file:
+            file.write(self.data[:-60])
+
+        self.assertEqual({}, BooksManager(self.data_file).books)
+
+        progress = []
+        books_manager = BooksManager(self.data_file, recover=True,
+                                     progress=lambda *args: progress.append(args))
+        self.assertEqual([1, 2, 3, 4], list(books_manager.books))
+        self.assertEqual(len(self.data) - 60, progress[-1][0])
+        self.assertEqual(len(self.data) - 60, progress[-1][1])
+
+    def test_invalid_books(self):
+        """
+        Оборванный посреди UTF-8 символа файл - ошибка формата, а книга без обязательного поля
+        не скрывается за пустым каталогом: ошибка пробрасывается.
+        """
+        data = self.data[:self.data.index('Книга'.encode('utf-8')) + 1]
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(BytesIO(data)))
+        self.assertEqual([], list(iter_json_array(BytesIO(data), recover=True)))
+
+        books = json.loads(self.data)
+        del books[2]['title']
+        with open(self.data_file, 'w', encoding='utf-8') as file:
+            json.dump(books, file, ensure_ascii=False)
+        with self.assertRaises(ValueError) as context:
+            BooksManager(self.data_file)
+        self.assertIn("Некорректная книга", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
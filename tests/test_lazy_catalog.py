@@ -0,0 +1,84 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from lazy_catalog import LazyBooks, index_path, read_index
+from models import Book, BookStatus
+
+
+class TestLazyCatalog(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается файл данных с тремя книгами в обычном режиме.
+        """
+        self.data_file = 'test_lazy_catalog.json'
+        self.tearDown()
+
+        books_manager = BooksManager(self.data_file)
+        self.book1 = Book(1, "The Great Gatsby", "F. Scott Fitzgerald", 1925, BookStatus.AVAILABLE)
+        self.book2 = Book(2, "Война и мир", "Лев Толстой", 1869, BookStatus.ISSUED)
+        self.book3 = Book(3, "Moby Dick", "Herman Melville", 1851, BookStatus.AVAILABLE)
+        for book in (self.book1, self.book2, self.book3):
+            books_manager.add_book(book)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются файл данных, индекс и журнал.
+        """
+        for path in (self.data_file, index_path(self.data_file), f'{self.data_file}.log'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_open(self):
+        """
+        При открытии строится индекс, книги создаются только при обращении.
+        """
+        books_manager = BooksManager(self.data_file, lazy=True)
+        books = books_manager.books
+        self.assertIsInstance(books, LazyBooks)
+        self.assertEqual(3, books_manager.last_book_id)
+        self.assertEqual(3, len(books))
+        self.assertEqual({}, books._cache)
+
+        self.assertEqual(self.book2, books[2])
+        self.assertEqual([2], list(books._cache))
+        self.assertEqual([self.book1, self.book2, self.book3], list(books.values()))
+
+        # Повторное открытие использует сохраненный индекс
+        self.assertIsNotNone(read_index(self.data_file))
+
+    def test_stale_index(self):
+        """
+        Индекс перестраивается, если файл данных изменился без него.
+        """
+        BooksManager(self.data_file, lazy=True)
+        BooksManager(self.data_file).remove_book(2)
+
+        self.assertIsNone(read_index(self.data_file))
+        books_manager = BooksManager(self.data_file, lazy=True)
+        self.assertEqual([1, 3], list(books_manager.books))
+
+    def test_mutations(self):
+        """
+        Изменения в ленивом режиме сохраняются, а поиск строит индексы при первом обращении.
+        """
+        books_manager = BooksManager(self.data_file, lazy=True, journal=True)
+        books_manager.add_book(Book(4, "1984", "George Orwell", 1949))
+        books_manager.remove_book(1)
+        books_manager.update_status(3, BookStatus.ISSUED)
+        self.assertEqual([3], [book.id for book in books_manager.search_books('year', "1851")])
+
+        books_manager.compact()
+        books_manager = BooksManager(self.data_file, lazy=True)
+        self.assertEqual([2, 3, 4], list(books_manager.books))
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[3].status)
+        self.assertEqual(4, books_manager.last_book_id)
+        self.assertEqual([2, 3, 4], list(BooksManager(self.data_file).books))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,9 @@ import unittest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 from books_manager import BooksManager
+from indexes import SortedIndex
 from models import Book, BookStatus
+from query import Predicate
 
 
 class TestLogic(unittest.TestCase):
@@ -68,6 +70,17 @@ class TestLogic(unittest.TestCase):
         books_number = len(self.books_manager._load_books())
         self.assertEqual(self.books_number+2,books_number)
 
+    def test_book_hash(self):
+        """
+        Книги можно класть в множества и использовать как ключи словаря, в том числе после смены статуса.
+        """
+        copy = Book(self.book1.id, self.book1.title, self.book1.author, self.book1.year)
+        books = {self.book1, self.book2, copy}
+        self.assertEqual(2, len(books))
+        self.book1.status = BookStatus.ISSUED
+        self.assertIn(self.book1, books)
+        self.assertNotIn(copy, {self.book1})
+
     def test_delete(self):
         """
         Тестирование функции удаления книг.
@@ -136,5 +149,133 @@ class TestLogic(unittest.TestCase):
 
         self.assertEqual(f"Книга с ID {book_id} не найдена",str(context.exception))
 
+    def test_search_index(self):
+        """
+        Тестирование вторичных индексов поиска.
+        - Проверяется поиск без учета регистра.
+        - Проверяется обновление индекса при удалении и добавлении книг.
+        - Проверяется сохранение порядка добавления.
+        """
+        searched_books = self.books_manager.search_books('author', "f. scott FITZGERALD")
+        self.assertListEqual([self.book1, self.book2], searched_books)
+
+        # Удаленная книга не находится
+        self.books_manager.remove_book(self.book1.id)
+        searched_books = self.books_manager.search_books('author', "F. Scott Fitzgerald")
+        self.assertListEqual([self.book2], searched_books)
+
+        # Добавленная книга находится после уже существующих
+        book_id = self.books_manager.last_book_id + 1
+        book = Book(book_id, "This Side of Paradise", "F. Scott Fitzgerald", 1920, BookStatus.AVAILABLE)
+        self.books_manager.add_book(book)
+        searched_books = self.books_manager.search_books('author', "F. Scott Fitzgerald")
+        self.assertListEqual([self.book2, book], searched_books)
+
+        # Индексы строятся при загрузке
+        books_manager = BooksManager(self.data_file)
+        searched_books = books_manager.search_books('year', "1925")
+        self.assertListEqual([self.book3.id], [book.id for book in searched_books])
+
+
+    def test_books_page(self):
+        """
+        Постраничное получение книг по ключу: следующая, предыдущая страница и переход к ID.
+        """
+        self.books_manager.add_book(Book(10, "1984", "George Orwell", 1949))
+        self.books_manager.add_book(Book(5, "Animal Farm", "George Orwell", 1945))
+        self.books_manager.remove_book(2)
+
+        self.assertEqual([1, 3], [book.id for book in self.books_manager.books_page(limit=2)])
+        self.assertEqual([5, 10], [book.id for book in self.books_manager.books_page(3, 2)])
+        self.assertEqual([], self.books_manager.books_page(10, 2))
+        self.assertEqual([3, 5], [book.id for book in self.books_manager.books_page(limit=2, before_id=10)])
+        self.assertEqual([1], [book.id for book in self.books_manager.books_page(limit=2, before_id=3)])
+        self.assertEqual(self.book3, self.books_manager.books_page(2, 1)[0])
+
+
+    def test_range_search(self):
+        """
+        Поиск по диапазону года и ID с сортировкой, смещением и ограничением количества.
+        """
+        self.books_manager.add_book(Book(4, "1984", "George Orwell", 1949))
+        self.books_manager.update_status(1, BookStatus.ISSUED)
+
+        self.assertEqual(([self.book1, self.book3, self.book2], 3), self.books_manager.range_search('year', 1900, 1940))
+        books, total = self.books_manager.range_search('year', low=1930, descending=True)
+        self.assertEqual(([4, 2], 2), ([book.id for book in books], total))
+        books, total = self.books_manager.range_search('id', low=2, offset=1, limit=1)
+        self.assertEqual(([3], 3), ([book.id for book in books], total))
+        self.assertEqual(([], 0), self.books_manager.range_search('year', 1950, 1900))
+
+        self.books_manager.remove_book(3)
+        books, _ = self.books_manager.range_search('year', high=1925)
+        self.assertEqual([1], [book.id for book in books])
+        with self.assertRaises(ValueError):
+            self.books_manager.range_search('title', 1, 2)
+
+    def test_sorted_index_chunks(self):
+        """
+        Отсортированный индекс остается упорядоченным при добавлении и удалении ключей не по порядку,
+        когда ключи разбиты на несколько частей.
+        """
+        index = SortedIndex('year')
+        index.CHUNK_SIZE = 4
+        books = [Book(book_id, "Title", "Author", 1900 + book_id * 37 % 50) for book_id in range(1, 101)]
+        for book in books:
+            index.add(book)
+        for book in books[::3]:
+            index.discard(book)
+        index.discard(Book(1000, "Missing", "Author", 1925))
+        expected = sorted((book.year, book.id) for book in books if book.id % 3 != 1)
+        self.assertEqual([book_id for _, book_id in expected], index.range()[0])
+        in_range = [book_id for year, book_id in expected if 1910 <= year <= 1930]
+        self.assertEqual((in_range[5:15], len(in_range)), index.range(1910, 1930, offset=5, limit=10))
+        self.assertEqual(in_range[::-1][:7], index.range(1910, 1930, descending=True, limit=7)[0])
+        self.assertEqual(len(in_range), index.count(1910, 1930))
+
+
+    def test_query(self):
+        """
+        Поиск по нескольким условиям и план запроса.
+        """
+        self.books_manager.update_status(2, BookStatus.ISSUED)
+        predicates = [Predicate.eq('author', 'f. scott fitzgerald'), Predicate.range('year', 1920, 1930)]
+        self.assertEqual([self.book1], self.books_manager.query(predicates))
+        self.assertEqual([self.book2], self.books_manager.query([Predicate.status(BookStatus.ISSUED)]))
+        self.assertEqual([self.book3], self.books_manager.query([Predicate.prefix('title', 'mob'),
+                                                                 Predicate.status("В наличии")]))
+        self.assertEqual([], self.books_manager.query([Predicate.prefix('author', 'mob')]))
+
+        plan = str(self.books_manager.explain([Predicate.prefix('title', 'mob'), Predicate.eq('year', 1925)]))
+        self.assertEqual(["1. индекс: слова названия и автора, слова title начинаются с 'mob' (~1 книг)",
+                          "2. пересечение с индексом: хеш year, year = 1925 (~1 книг)",
+                          "3. проверка: слова title начинаются с 'mob'"], plan.splitlines())
+        plan = str(self.books_manager.explain([Predicate.status(BookStatus.ISSUED)]))
+        self.assertEqual(["1. индекс: статус, status = 'Выдана' (~1 книг)"], plan.splitlines())
+        with self.assertRaises(ValueError):
+            Predicate.range('title', 1, 2)
+
+
+    def test_status_counts(self):
+        """
+        Количество и список книг по статусу обновляются при добавлении, удалении и изменении статуса.
+        """
+        self.assertEqual({BookStatus.AVAILABLE: 3, BookStatus.ISSUED: 0}, self.books_manager.status_counts())
+        self.books_manager.update_status(3, BookStatus.ISSUED)
+        self.books_manager.update_status(1, BookStatus.ISSUED)
+        self.books_manager.add_book(Book(4, "1984", "George Orwell", 1949, BookStatus.ISSUED))
+        self.books_manager.remove_book(3)
+
+        self.assertEqual({BookStatus.AVAILABLE: 1, BookStatus.ISSUED: 2}, self.books_manager.status_counts())
+        books, total = self.books_manager.books_by_status(BookStatus.ISSUED)
+        self.assertEqual(([1, 4], 2), ([book.id for book in books], total))
+        books, total = self.books_manager.books_by_status(BookStatus.ISSUED, offset=1, limit=1)
+        self.assertEqual(([4], 2), ([book.id for book in books], total))
+
+        with self.assertRaises(ValueError):
+            self.books_manager.update_statuses({2: BookStatus.ISSUED, 5: BookStatus.ISSUED})
+        self.assertEqual([self.book2], self.books_manager.books_by_status(BookStatus.AVAILABLE)[0])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from metrics import Metrics, configure, metrics
+from models import Book, BookStatus
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных.
+        - Включаются и очищаются общие метрики.
+        """
+        self.data_file = 'test_metrics.json'
+        self.metrics_file = 'test_metrics.prom'
+        self.tearDown()
+        metrics.reset()
+        metrics.enabled = True
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Метрики выключаются, временные файлы удаляются.
+        """
+        metrics.enabled = False
+        for path in (self.data_file, self.metrics_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_manager_metrics(self):
+        """
+        Загрузка, сохранение и поиск записывают время, размер сохранения и количество просмотренных книг.
+        """
+        books_manager = BooksManager(self.data_file)
+        books_manager.add_books([Book(1, "Moby Dick", "Herman Melville", 1851),
+                                 Book(2, "Typee", "Herman Melville", 1846)])
+        books_manager.search_books('author', "Herman Melville")
+        books_manager.search_books('id', "1")
+        with self.assertRaises(ValueError):
+            books_manager.update_status(3, BookStatus.ISSUED)
+
+        histograms = metrics.to_dict()['histograms']
+        self.assertEqual(1, histograms['load_seconds']['count'])
+        self.assertEqual(1, histograms['save_seconds']['count'])
+        self.assertEqual(os.path.getsize(self.data_file), histograms['save_bytes']['sum'])
+        self.assertEqual(2, histograms['search_seconds']['count'])
+        # По индексу просмотрены две найденные книги, перебором - весь каталог
+        self.assertEqual(4, histograms['search_scanned_books']['sum'])
+
+    def test_timed_and_export(self):
+        """
+        Декоратор timed считает время и ошибки; метрики выводятся в JSON и формате Prometheus.
+        """
+        local_metrics = Metrics()
+
+        @local_metrics.timed('operation')
+        def operation(fail: bool) -> str:
+            if fail:
+                raise ValueError
+            return 'ok'
+
+        self.assertEqual('ok', operation(False))
+        self.assertEqual({'counters': {}, 'histograms': {}}, local_metrics.to_dict())
+
+        local_metrics.enabled = True
+        operation(False)
+        with self.assertRaises(ValueError):
+            operation(True)
+        local_metrics.observe('size', 3000, (1024, 4096))
+
+        self.assertEqual({'operation_errors': 1}, local_metrics.to_dict()['counters'])
+        self.assertEqual(2, local_metrics.to_dict()['histograms']['operation_seconds']['count'])
+        text = local_metrics.to_prometheus()
+        self.assertIn('books_operation_errors_total 1\n', text)
+        self.assertIn('books_size_bucket{le="1024"} 0\nbooks_size_bucket{le="4096"} 1\n'
+                      'books_size_bucket{le="+Inf"} 1\nbooks_size_sum 3000\nbooks_size_count 1\n', text)
+
+        local_metrics.dump(self.metrics_file)
+        with open(self.metrics_file, encoding='utf-8') as file:
+            self.assertEqual(text, file.read())
+        local_metrics.dump(self.data_file)
+        with open(self.data_file, encoding='utf-8') as file:
+            self.assertEqual(local_metrics.to_dict(), json.load(file))
+
+        with self.assertRaises(ValueError):
+            configure(profile='disk')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from models import Book, BookStatus
+from parallel import load_parallel
+from query import Predicate
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных с книгами.
+        - Пороги параллельной работы снижаются, чтобы ее можно было проверить на маленьком каталоге.
+        """
+        self.data_file = 'test_parallel.json'
+        self.tearDown()
+        self.books = [Book(book_id, f"Книга {book_id}", f"Автор {book_id % 3}", 1900 + book_id,
+                           BookStatus.ISSUED if book_id % 4 == 0 else BookStatus.AVAILABLE)
+                      for book_id in range(1, 41)]
+        books_manager = BooksManager(self.data_file)
+        books_manager.add_books(self.books)
+        books_manager.close()
+
+        for target, value in (('storage.PARALLEL_LOAD_MIN_BYTES', 0), ('parallel.PARALLEL_SCAN_MIN_BOOKS', 1)):
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляется временный файл данных.
+        """
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+    def test_load(self):
+        """
+        Файл данных, загруженный по частям в нескольких процессах, совпадает с исходными книгами.
+        """
+        self.assertEqual(self.books, load_parallel(self.data_file, 3))
+        with BooksManager(self.data_file, workers=3) as books_manager:
+            self.assertEqual(self.books, list(books_manager.books.values()))
+
+    def test_scan(self):
+        """
+        Перебор в пуле процессов находит те же книги, видит изменения каталога и не перезапускает пул.
+        """
+        with BooksManager(self.data_file, workers=2, cache_size=0) as books_manager:
+            self.assertEqual([self.books[6]], books_manager.search_books('id', '7'))
+            processes = list(books_manager._scanner._processes)
+            self.assertEqual(2, len(processes))
+
+            books_manager.update_status(7, BookStatus.ISSUED)
+            self.assertEqual(BookStatus.ISSUED, books_manager.search_books('id', '7')[0].status)
+            books_manager.remove_book(7)
+            self.assertEqual([], books_manager.search_books('id', '7'))
+            books_manager.add_book(Book(7, "Книга 7", "Автор 1", 1907))
+            books_manager.add_book(Book(3, "Новая книга 3", "Автор 0", 1903))
+            with self.assertRaises(RuntimeError):
+                with books_manager.transaction():
+                    books_manager.remove_book(1)
+                    books_manager.add_book(Book(41, "Книга 41", "Автор 2", 1941))
+                    raise RuntimeError("откат")
+
+            # Условие подходит для всех книг, поэтому индекс не сужает выборку и книги перебираются
+            found_books = books_manager.query([Predicate.range('year', 1800, 2000)])
+            self.assertEqual(list(range(1, 41)), [book.id for book in found_books])
+            self.assertEqual("Новая книга 3", found_books[2].title)
+            # Процессы хранят книги в порядке каталога: замененная книга остается на месте,
+            # а удаленная и добавленная снова, как и возвращенная откатом, оказывается в конце
+            found_books = books_manager._scanner.scan(books_manager.books, [Predicate.range('year', 1800, 2000)])
+            self.assertEqual(list(books_manager.books.values()), found_books)
+            self.assertEqual([*range(2, 7), *range(8, 41), 7, 1], [book.id for book in found_books])
+            self.assertEqual(processes, books_manager._scanner._processes)
+
+
+if __name__ == "__main__":
+    unittest.main()
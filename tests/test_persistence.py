@@ -0,0 +1,85 @@
+import json
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from models import Book, BookStatus
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных с одной книгой.
+        """
+        self.data_file = 'test_persistence.json'
+        self.tearDown()
+        books_manager = BooksManager(self.data_file)
+        books_manager.add_book(Book(1, "Moby Dick", "Herman Melville", 1851))
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются файл данных, временный файл и журнал.
+        """
+        for path in (self.data_file, f'{self.data_file}.tmp', f'{self.data_file}.log'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def read_ids(self) -> list[int]:
+        with open(self.data_file, encoding='utf-8') as file:
+            return [book['id'] for book in json.load(file)]
+
+    def test_atomic_save(self):
+        """
+        Сбой во время сохранения не повреждает файл данных и не оставляет временный файл.
+        """
+        books_manager = BooksManager(self.data_file)
+        with mock.patch('storage.json.dump', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                books_manager.add_book(Book(2, "1984", "George Orwell", 1949))
+
+        self.assertEqual([1], self.read_ids())
+        self.assertFalse(os.path.exists(f'{self.data_file}.tmp'))
+
+    def test_write_behind_flush(self):
+        """
+        В режиме отложенной записи изменения сохраняются при flush() и close().
+        """
+        books_manager = BooksManager(self.data_file, write_behind=60)
+        books_manager.add_book(Book(2, "1984", "George Orwell", 1949))
+        self.assertEqual([1], self.read_ids())
+
+        books_manager.flush()
+        self.assertEqual([1, 2], self.read_ids())
+
+        books_manager.update_status(2, BookStatus.ISSUED)
+        books_manager.remove_book(1)
+        books_manager.close()
+        books_manager = BooksManager(self.data_file)
+        self.assertEqual([2], list(books_manager.books))
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[2].status)
+
+    def test_write_behind_background(self):
+        """
+        Фоновый поток сам сохраняет накопившиеся изменения одной записью в журнал.
+        """
+        with BooksManager(self.data_file, journal=True, write_behind=0.01) as books_manager:
+            books_manager.add_book(Book(2, "1984", "George Orwell", 1949))
+            books_manager.add_book(Book(3, "Animal Farm", "George Orwell", 1945))
+            deadline = time.monotonic() + 5
+            while books_manager._dirty and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertFalse(books_manager._dirty)
+
+        with open(f'{self.data_file}.log', encoding='utf-8') as file:
+            self.assertLessEqual(len(file.readlines()), 2)
+        self.assertEqual([1, 2, 3], list(BooksManager(self.data_file, journal=True).books))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from models import Book, BookStatus
+from query_cache import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных.
+        - Инициализируется BooksManager с кешем запросов на два результата.
+        - Добавляются книги для тестирования кеша.
+        """
+        self.data_file = 'test_query_cache.json'
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+        self.books_manager = BooksManager(self.data_file, cache_size=2)
+        self.book1 = Book(1, "Moby Dick", "Herman Melville", 1851, BookStatus.AVAILABLE)
+        self.book2 = Book(2, "Billy Budd", "Herman Melville", 1924, BookStatus.AVAILABLE)
+        self.book3 = Book(3, "Dick Tracy", "Chester Gould", 1931, BookStatus.AVAILABLE)
+        for book in (self.book1, self.book2, self.book3):
+            self.books_manager.add_book(book)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляется временный файл данных.
+        """
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+    def test_hits_and_eviction(self):
+        """
+        Повторный запрос берется из кеша без учета регистра, старые результаты вытесняются.
+        """
+        self.assertEqual([self.book1, self.book2], self.books_manager.search_books('author', 'herman melville'))
+        self.assertEqual([self.book1, self.book2], self.books_manager.search_books('author', 'Herman Melville'))
+        self.books_manager.search_books('year', '1931')
+        self.books_manager.search_books('title', 'moby dick')
+
+        stats = self.books_manager.cache_stats()
+        self.assertEqual((1, 3, 1, 2), (stats['hits'], stats['misses'], stats['evictions'], stats['size']))
+
+        # Изменение возвращенного списка не меняет кеш
+        self.books_manager.search_books('year', '1931').clear()
+        self.assertEqual([self.book3], self.books_manager.search_books('year', '1931'))
+
+    def test_invalidation(self):
+        """
+        Изменение книги сбрасывает только результаты, в которые она входит.
+        """
+        self.books_manager.search_books('author', 'herman melville')
+        self.books_manager.search_books('year', '1931')
+
+        self.books_manager.update_status(1, BookStatus.ISSUED)
+        self.assertEqual(BookStatus.ISSUED, self.books_manager.search_books('author', 'herman melville')[0].status)
+        self.books_manager.add_book(Book(4, "Typee", "Herman Melville", 1846))
+        self.assertEqual([1, 2, 4], [book.id for book in self.books_manager.search_books('author', 'herman melville')])
+        self.books_manager.remove_book(2)
+        self.assertEqual([1, 4], [book.id for book in self.books_manager.search_books('author', 'herman melville')])
+        self.assertEqual([self.book3], self.books_manager.search_books('year', '1931'))
+
+        stats = self.books_manager.cache_stats()
+        self.assertEqual((1, 5, 3), (stats['hits'], stats['misses'], stats['invalidations']))
+
+        with self.assertRaises(ValueError):
+            with self.books_manager.transaction():
+                self.books_manager.remove_book(1)
+                self.assertEqual([4], [book.id for book in self.books_manager.search_books('author', 'herman melville')])
+                raise ValueError
+        self.assertEqual([1, 4], sorted(book.id for book in self.books_manager.search_books('author', 'herman melville')))
+
+    def test_ttl(self):
+        """
+        Результат устаревает через ttl секунд.
+        """
+        now = [0.0]
+        cache = QueryCache(maxsize=10, ttl=5, clock=lambda: now[0])
+        key = QueryCache.key('year', 1851)
+        cache.put(key, [self.book1])
+        now[0] = 4
+        self.assertEqual([self.book1], cache.get(key))
+        now[0] = 6
+        self.assertIsNone(cache.get(key))
+        self.assertEqual((1, 1, 1), (cache.hits, cache.misses, cache.expirations))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import shutil
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from migrate import migrate
+from models import Book, BookStatus
+from sharded_storage import ShardedStorage, reshard
+
+
+class TestShardedStorage(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается шардированный каталог с книгами.
+        """
+        self.directory = 'test_sharded.shards'
+        self.json_file = 'test_sharded.json'
+        self.tearDown()
+
+        self.books = [Book(book_id, f"Книга {book_id}", f"Автор {book_id % 3}", 1900 + book_id)
+                      for book_id in range(1, 21)]
+        self.books_manager = BooksManager(self.directory)
+        self.books_manager.add_books(self.books)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются временные файлы и директория каталога.
+        """
+        if os.path.exists(self.directory):
+            shutil.rmtree(self.directory)
+        if os.path.exists(self.json_file):
+            os.remove(self.json_file)
+
+    def shard_files(self) -> dict[str, int]:
+        return {name: os.stat(os.path.join(self.directory, name)).st_mtime_ns
+                for name in os.listdir(self.directory) if name.startswith('shard-')}
+
+    def test_round_trip(self):
+        """
+        Книги распределяются по шардам и загружаются обратно; last_book_id хранится в манифесте.
+        """
+        storage = self.books_manager._storage
+        self.assertIsInstance(storage, ShardedStorage)
+        self.assertEqual(16, len(self.shard_files()))
+        self.assertEqual([1] + [2] * 4 + [1] * 11, storage.shard_sizes())
+
+        self.books_manager.update_status(3, BookStatus.ISSUED)
+        self.books_manager.remove_book(20)
+
+        books_manager = BooksManager(self.directory)
+        self.assertEqual(list(range(1, 20)), list(books_manager.books))
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[3].status)
+        self.assertEqual(20, books_manager.last_book_id)
+        self.assertEqual(21, books_manager.add_book(Book(None, "Новая книга", "Автор", 2000)))
+
+    def test_write_affected_shards(self):
+        """
+        Изменение книги перезаписывает только ее шард.
+        """
+        before = self.shard_files()
+        self.books_manager.update_status(5, BookStatus.ISSUED)
+        after = self.shard_files()
+        changed = [name for name in before if before[name] != after[name]]
+        self.assertEqual(['shard-0-0005.json'], changed)
+
+    def test_reshard(self):
+        """
+        Перераспределение по интервалам ID сохраняет книги и удаляет файлы прежнего разбиения.
+        """
+        self.books_manager.close()
+        self.assertEqual([5, 5, 5, 5], reshard(self.directory, partition='range', range_size=5, format='snapshot'))
+        self.assertEqual(['shard-1-0000.snap', 'shard-1-0001.snap', 'shard-1-0002.snap', 'shard-1-0003.snap'],
+                         sorted(self.shard_files()))
+
+        books_manager = BooksManager(self.directory)
+        self.assertEqual(self.books, list(books_manager.books.values()))
+        # Книга за последним интервалом попадает в новый шард
+        books_manager.add_book(Book(None, "Новая книга", "Автор", 2000))
+        self.assertEqual([5, 5, 5, 5, 1], books_manager._storage.shard_sizes())
+        self.assertEqual(5, BooksManager(self.directory)._storage.manifest['shards'])
+
+        with self.assertRaises(ValueError):
+            reshard(self.directory, partition='modulo')
+        with self.assertRaises(FileNotFoundError):
+            reshard(self.json_file)
+
+    def test_parallel_load(self):
+        """
+        Шарды, загруженные в пуле процессов, совпадают с исходными книгами. Процессы пула запускаются
+        не через fork.
+        """
+        with mock.patch('sharded_storage.PARALLEL_LOAD_MIN_BYTES', 0), \
+                mock.patch('concurrent.futures.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as executor:
+            books = ShardedStorage(self.directory, workers=3).load()
+        self.assertEqual(self.books, list(books.values()))
+        self.assertIn(executor.call_args.kwargs['mp_context'].get_start_method(), ('forkserver', 'spawn'))
+
+    def test_load_options(self):
+        """
+        Параметры recover и progress действуют на все шарды, workers=0 загружает шарды без пула,
+        а неподдерживаемые параметры отклоняются.
+        """
+        path = os.path.join(self.directory, 'shard-0-0005.json')
+        with open(path, 'rb+') as file:
+            file.truncate(os.path.getsize(path) - 20)
+        progress = []
+        with mock.patch('sharded_storage.PARALLEL_LOAD_MIN_BYTES', 0), \
+                mock.patch('concurrent.futures.ProcessPoolExecutor', side_effect=AssertionError):
+            books = ShardedStorage(self.directory, recover=True, progress=lambda *args: progress.append(args)).load()
+        self.assertEqual([book for book in self.books if book.id != 21 - 16], list(books.values()))
+        total_size = sum(os.path.getsize(os.path.join(self.directory, name)) for name in self.shard_files())
+        self.assertEqual((total_size, total_size), progress[-1][:2])
+        self.assertEqual(sorted(progress), progress)
+
+        # Параметры по умолчанию, которые передает BooksManager, принимаются
+        ShardedStorage(self.directory, journal=False, compact_threshold=10, lazy=False, shared=False)
+        for option in ('journal', 'lazy', 'shared'):
+            with self.assertRaises(ValueError):
+                ShardedStorage(self.directory, **{option: True})
+        with self.assertRaises(TypeError):
+            ShardedStorage(self.directory, cache_size=0)
+
+    def test_migrate(self):
+        """
+        Каталог переносится из шардов в JSON-файл и обратно.
+        """
+        self.assertEqual(20, migrate(self.directory, self.json_file))
+        shutil.rmtree(self.directory)
+        self.assertEqual(20, migrate(self.json_file, self.directory))
+        self.assertEqual(self.books, list(BooksManager(self.directory).books.values()))
+
+        with self.assertRaises(ValueError):
+            BooksManager(self.directory, journal=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import sys
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import file_utils
+from books_manager import BooksManager
+from models import Book, BookStatus
+
+DATA_FILE = 'test_shared_catalog.json'
+PROCESSES = 4
+BOOKS_PER_PROCESS = 50
+
+
+def add_books_in_process(journal: bool) -> None:
+    with BooksManager(DATA_FILE, journal=journal, shared=True) as books_manager:
+        for number in range(BOOKS_PER_PROCESS):
+            books_manager.add_book(Book(None, f"Book {os.getpid()} {number}", "Author", 2000))
+
+
+class TestSharedCatalog(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Удаляются файлы, оставшиеся от предыдущих запусков.
+        """
+        self.managers = []
+        self.tearDown()
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Закрываются экземпляры BooksManager и удаляются файл данных, журнал и файл блокировки.
+        """
+        for books_manager in self.managers:
+            books_manager.close()
+        for path in (DATA_FILE, f'{DATA_FILE}.log', f'{DATA_FILE}.lock'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def open(self, **options) -> BooksManager:
+        books_manager = BooksManager(DATA_FILE, shared=True, **options)
+        self.managers.append(books_manager)
+        return books_manager
+
+    def test_journal_changes(self):
+        """
+        С журналом изменения другого экземпляра применяются по новым записям журнала,
+        без перечитывания файла данных.
+        """
+        first = self.open(journal=True)
+        second = self.open(journal=True)
+        first.add_book(Book(None, "Moby Dick", "Herman Melville", 1851))
+        first.add_book(Book(None, "1984", "George Orwell", 1949))
+
+        with mock.patch.object(second._storage, '_snapshot_changes', side_effect=AssertionError):
+            self.assertEqual([1, 2], list(second.books))
+            self.assertEqual(3, second.add_book(Book(None, "Animal Farm", "George Orwell", 1945)))
+            second.update_status(1, BookStatus.ISSUED)
+            second.remove_book(2)
+
+        self.assertEqual(BookStatus.ISSUED, first.books[1].status)
+        self.assertEqual([3], [book.id for book in first.search_books('author', "george orwell")])
+        self.assertEqual(0, first.full_text_search("1984")[1])
+
+    def test_snapshot_changes(self):
+        """
+        Без журнала запись одного экземпляра не затирает изменения другого.
+        """
+        first = self.open()
+        second = self.open()
+        first.add_book(Book(None, "Moby Dick", "Herman Melville", 1851))
+        second.add_book(Book(None, "1984", "George Orwell", 1949))
+        first.update_status(2, BookStatus.ISSUED)
+
+        self.assertEqual([1, 2], list(BooksManager(DATA_FILE).books))
+        self.assertEqual(BookStatus.ISSUED, second.books[2].status)
+        self.assertEqual([1], [book.id for book in second.search_books('title', "moby dick")])
+
+    def test_journal_detection(self):
+        """
+        Экземпляр, открытый без журнала, переходит на журнал, если его использует другой экземпляр,
+        поэтому ID не повторяются и изменения не теряются.
+        """
+        first = self.open()
+        second = self.open(journal=True)
+        self.assertTrue(os.path.exists(f'{DATA_FILE}.log'))
+        second.add_book(Book(None, "Moby Dick", "Herman Melville", 1851))
+        self.assertEqual(2, first.add_book(Book(None, "1984", "George Orwell", 1949)))
+        second.update_status(2, BookStatus.ISSUED)
+
+        self.assertEqual(BookStatus.ISSUED, first.books[2].status)
+        self.assertEqual([1, 2], list(second.books))
+        # Новый экземпляр без journal=True тоже читает несвернутые записи журнала
+        self.assertEqual([1, 2], list(BooksManager(DATA_FILE).books))
+
+    def test_compaction(self):
+        """
+        Свертка журнала другим экземпляром не теряет изменений.
+        """
+        first = self.open(journal=True)
+        second = self.open(journal=True)
+        first.add_book(Book(None, "Moby Dick", "Herman Melville", 1851))
+        self.assertEqual(1, len(second.books))
+        first.add_book(Book(None, "1984", "George Orwell", 1949))
+        first.compact()
+        first.remove_book(1)
+
+        self.assertEqual([2], list(second.books))
+        second.add_book(Book(None, "Animal Farm", "George Orwell", 1945))
+        self.assertEqual([2, 3], list(first.books))
+
+    @unittest.skipIf(file_utils.fcntl is None, "fcntl недоступен")
+    def test_processes(self):
+        """
+        Несколько процессов одновременно добавляют книги в один каталог без потерь и повторов ID.
+        """
+        for journal in (True, False):
+            with self.subTest(journal=journal):
+                self.tearDown()
+                processes = [multiprocessing.Process(target=add_books_in_process, args=(journal,))
+                             for _ in range(PROCESSES)]
+                for process in processes:
+                    process.start()
+                for process in processes:
+                    process.join()
+                self.assertTrue(all(process.exitcode == 0 for process in processes))
+
+                books = BooksManager(DATA_FILE, journal=journal).books
+                self.assertEqual(list(range(1, PROCESSES * BOOKS_PER_PROCESS + 1)), sorted(books))
+
+
+if __name__ == "__main__":
+    unittest.main()
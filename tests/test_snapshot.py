@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+from io import BytesIO, StringIO
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from migrate import migrate
+from models import Book, BookStatus
+from snapshot import SnapshotError, SnapshotStorage, read_snapshot, write_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается каталог в двоичном снимке с тремя книгами.
+        """
+        self.data_file = 'test_snapshot.snap'
+        self.json_file = 'test_snapshot.json'
+        self.tearDown()
+
+        self.books_manager = BooksManager(self.data_file)
+        self.book1 = Book(1, "Война и мир", "Лев Толстой", 1869, BookStatus.AVAILABLE)
+        self.book2 = Book(2, "", "Anonymous", -800, BookStatus.ISSUED)
+        self.book3 = Book(3, "Moby Dick", "Herman Melville", 1851, BookStatus.AVAILABLE)
+        self.books_manager.add_books([self.book1, self.book2, self.book3])
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются временные файлы.
+        """
+        for path in (self.data_file, self.json_file, f'{self.data_file}.log'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_round_trip(self):
+        """
+        Книги сохраняются в снимок и загружаются обратно без изменений.
+        """
+        self.assertIsInstance(self.books_manager._storage, SnapshotStorage)
+        self.books_manager.update_status(1, BookStatus.ISSUED)
+        self.books_manager.remove_book(3)
+
+        books_manager = BooksManager(self.data_file)
+        self.assertEqual([1, 2], list(books_manager.books))
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[1].status)
+        self.assertEqual(self.book2, books_manager.books[2])
+        self.assertEqual([self.book2], books_manager.search_books('year', '-800'))
+
+    def test_format(self):
+        """
+        Снимок в памяти читается так же, как записан; статус хранится одним байтом.
+        """
+        file = BytesIO()
+        write_snapshot(file, [self.book1, self.book3])
+        self.assertNotIn("В наличии".encode('utf-8'), file.getvalue())
+        file.seek(0)
+        self.assertEqual([self.book1, self.book3], list(read_snapshot(file)))
+
+        with self.assertRaises(SnapshotError):
+            list(read_snapshot(BytesIO(file.getvalue()[:-3])))
+        with self.assertRaises(SnapshotError):
+            list(read_snapshot(BytesIO(b'[]')))
+
+    def test_corrupted(self):
+        """
+        Поврежденный снимок загружается как пустой каталог с сообщением об ошибке.
+        """
+        with open(self.data_file, 'wb') as file:
+            file.write(b'BOOKSNAP\x02\x00')
+        with mock.patch('sys.stdout', new=StringIO()) as output:
+            books_manager = BooksManager(self.data_file)
+        self.assertEqual(0, len(books_manager.books))
+        self.assertIn("некорректный формат снимка", output.getvalue())
+
+    def test_journal(self):
+        """
+        В режиме журнала изменения дописываются в журнал и сворачиваются в снимок.
+        """
+        books_manager = BooksManager(self.data_file, journal=True, compact_threshold=2)
+        books_manager.add_book(Book(4, "1984", "George Orwell", 1949))
+        self.assertEqual(4, len(BooksManager(self.data_file, journal=True).books))
+        books_manager.update_status(4, BookStatus.ISSUED)
+        self.assertFalse(os.path.getsize(f'{self.data_file}.log'))
+        self.assertEqual(BookStatus.ISSUED, BooksManager(self.data_file).books[4].status)
+
+        with self.assertRaises(ValueError):
+            BooksManager(self.data_file, lazy=True)
+
+    def test_migrate(self):
+        """
+        Каталог конвертируется из снимка в JSON и обратно.
+        """
+        self.assertEqual(3, migrate(self.data_file, self.json_file))
+        os.remove(self.data_file)
+        self.assertEqual(3, migrate(self.json_file, self.data_file))
+        books = BooksManager(self.data_file).books
+        self.assertEqual([self.book1, self.book2, self.book3], list(books.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from migrate import migrate
+from models import Book, BookStatus
+from query import Predicate
+from sqlite_storage import SqliteStorage
+
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временная база SQLite с тремя книгами.
+        """
+        self.data_file = 'test_sqlite_storage.db'
+        self.json_file = 'test_sqlite_storage.json'
+        self.tearDown()
+
+        self.books_manager = BooksManager(self.data_file)
+        self.book1 = Book(1, "Война И Мир", "Лев Толстой", 1869, BookStatus.AVAILABLE)
+        self.book2 = Book(2, "Анна Каренина", "Лев Толстой", 1878, BookStatus.AVAILABLE)
+        self.book3 = Book(3, "Moby Dick", "Herman Melville", 1851, BookStatus.AVAILABLE)
+        for book in (self.book1, self.book2, self.book3):
+            self.books_manager.add_book(book)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Закрывается база и удаляются временные файлы.
+        """
+        if hasattr(self, 'books_manager'):
+            self.books_manager.close()
+        for path in (self.data_file, f'{self.data_file}-wal', f'{self.data_file}-shm', self.json_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_backend_by_extension(self):
+        """
+        Хранилище выбирается по расширению файла, книги сохраняются в базе.
+        """
+        self.assertIsInstance(self.books_manager._storage, SqliteStorage)
+        self.books_manager.close()
+
+        self.books_manager = BooksManager(self.data_file)
+        self.assertEqual(3, len(self.books_manager.books))
+        self.assertEqual(3, self.books_manager.last_book_id)
+        self.assertEqual([self.book1, self.book2, self.book3], list(self.books_manager.books.values()))
+
+    def test_search(self):
+        """
+        Поиск без учета регистра, в том числе для кириллицы, выполняется по индексу.
+        """
+        self.assertEqual([self.book1], self.books_manager.search_books('title', "война и мир"))
+        self.assertEqual([self.book1, self.book2], self.books_manager.search_books('author', "ЛЕВ ТОЛСТОЙ"))
+        self.assertEqual([self.book3], self.books_manager.search_books('year', "1851"))
+        self.assertEqual([], self.books_manager.search_books('year', "01851"))
+
+        connection = self.books_manager._storage._connection
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM books WHERE unicode_lower(title) = ?", ("x",)).fetchall()
+        self.assertIn("books_title", str(plan))
+
+    def test_mutations(self):
+        """
+        Удаление и изменение статуса сохраняются в базе, транзакция откатывается при ошибке.
+        """
+        self.books_manager.update_status(1, BookStatus.ISSUED)
+        self.books_manager.remove_book(2)
+        with self.assertRaises(ValueError):
+            with self.books_manager.transaction():
+                self.books_manager.remove_book(3)
+                self.books_manager.remove_book(99999)
+        self.books_manager.close()
+
+        self.books_manager = BooksManager(self.data_file)
+        self.assertEqual([1, 3], list(self.books_manager.books))
+        self.assertEqual(BookStatus.ISSUED, self.books_manager.books[1].status)
+
+    def test_full_text_search(self):
+        """
+        Полнотекстовый поиск работает поверх базы.
+        """
+        found_books, total = self.books_manager.full_text_search("толст")
+        self.assertEqual(([self.book1, self.book2], 2), (found_books, total))
+
+    def test_books_page(self):
+        """
+        Страницы книг читаются запросами к базе по ключу.
+        """
+        self.assertEqual([self.book2, self.book3], self.books_manager.books_page(1, 2))
+        self.assertEqual([self.book1, self.book2], self.books_manager.books_page(limit=5, before_id=3))
+        self.assertFalse(self.books_manager._indexes_ready)
+
+    def test_range_search(self):
+        """
+        Поиск по диапазону выполняется запросом к базе.
+        """
+        self.assertEqual(([self.book2, self.book1], 2), self.books_manager.range_search('year', 1860, descending=True))
+        self.assertEqual(([self.book3], 3), self.books_manager.range_search('id', limit=1, offset=2))
+        self.assertFalse(self.books_manager._indexes_ready)
+
+    def test_query(self):
+        """
+        Поиск по нескольким условиям выполняется запросом к базе.
+        """
+        predicates = [Predicate.eq('author', 'лев толстой'), Predicate.range('year', high=1870),
+                      Predicate.prefix('title', 'вой')]
+        self.assertEqual([self.book1], self.books_manager.query(predicates))
+        self.assertIn('books_author', str(self.books_manager.explain(predicates[:1])))
+        self.assertFalse(self.books_manager._indexes_ready)
+
+    def test_status_counts(self):
+        """
+        Количество книг по статусу читается из таблицы счетчиков, которую обновляют триггеры.
+        """
+        self.books_manager.update_status(2, BookStatus.ISSUED)
+        self.books_manager.remove_book(1)
+        self.assertEqual({BookStatus.AVAILABLE: 1, BookStatus.ISSUED: 1}, self.books_manager.status_counts())
+        self.assertEqual(([self.book3], 1), self.books_manager.books_by_status(BookStatus.AVAILABLE))
+        self.assertFalse(self.books_manager._indexes_ready)
+
+    def test_search_cache(self):
+        """
+        Результаты поиска сбрасываются из кеша, когда базу меняет другое соединение.
+        """
+        self.assertEqual([self.book3], self.books_manager.search_books('author', 'herman melville'))
+        with BooksManager(self.data_file) as other_manager:
+            other_manager.add_book(Book(4, "Typee", "Herman Melville", 1846))
+        self.assertEqual(2, len(self.books_manager.search_books('author', 'herman melville')))
+
+    def test_migrate(self):
+        """
+        Каталог переносится из базы в JSON-файл и обратно.
+        """
+        self.books_manager.update_status(3, BookStatus.ISSUED)
+        self.assertEqual(3, migrate(self.data_file, self.json_file))
+        books = list(BooksManager(self.json_file).books.values())
+        self.assertEqual(list(self.books_manager.books.values()), books)
+        self.assertEqual(BookStatus.ISSUED, books[2].status)
+
+        self.books_manager.remove_book(1)
+        self.assertEqual(3, migrate(self.json_file, self.data_file))
+        self.assertEqual(3, len(self.books_manager.books))
+
+
+if __name__ == "__main__":
+    unittest.main()
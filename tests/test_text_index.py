@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from models import Book, BookStatus
+
+
+class TestFullTextSearch(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных.
+        - Инициализируется BooksManager с индексом триграмм.
+        - Добавляются книги для тестирования поиска.
+        """
+        self.data_file = 'test_text_index.json'
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+        self.books_manager = BooksManager(self.data_file, trigrams=True)
+        self.book1 = Book(1, "Moby Dick", "Herman Melville", 1851, BookStatus.AVAILABLE)
+        self.book2 = Book(2, "Billy Budd", "Herman Melville", 1924, BookStatus.AVAILABLE)
+        self.book3 = Book(3, "Dick Tracy", "Chester Gould", 1931, BookStatus.AVAILABLE)
+        self.book4 = Book(4, "Herman's Head", "Andy Guild", 1991, BookStatus.AVAILABLE)
+        for book in (self.book1, self.book2, self.book3, self.book4):
+            self.books_manager.add_book(book)
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляется временный файл данных.
+        """
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+
+    def test_prefix(self):
+        """
+        Поиск по началу слов названия и автора.
+        """
+        found_books, total = self.books_manager.full_text_search("mob", mode='prefix')
+        self.assertEqual(([self.book1], 1), (found_books, total))
+
+        # Все слова запроса должны совпасть
+        found_books, total = self.books_manager.full_text_search("dick mel", mode='prefix')
+        self.assertEqual(([self.book1], 1), (found_books, total))
+
+    def test_ranking(self):
+        """
+        Совпадение в названии ранжируется выше совпадения в имени автора.
+        """
+        found_books, total = self.books_manager.full_text_search("herman", mode='word')
+        self.assertEqual([self.book4, self.book1, self.book2], found_books)
+        self.assertEqual(3, total)
+
+    def test_substring(self):
+        """
+        Поиск по подстроке с помощью индекса триграмм.
+        """
+        found_books, total = self.books_manager.full_text_search("ick")
+        self.assertEqual([self.book1, self.book3], found_books)
+
+        found_books, total = self.books_manager.full_text_search("xyz")
+        self.assertEqual(([], 0), (found_books, total))
+
+    def test_pagination(self):
+        """
+        Результаты разбиваются на страницы, общее количество не зависит от страницы.
+        """
+        found_books, total = self.books_manager.full_text_search("herman", page=2, page_size=2)
+        self.assertEqual(([self.book2], 3), (found_books, total))
+
+    def test_index_update(self):
+        """
+        Индекс обновляется при удалении книги.
+        """
+        self.books_manager.remove_book(self.book1.id)
+        found_books, total = self.books_manager.full_text_search("moby")
+        self.assertEqual(([], 0), (found_books, total))
+
+        found_books, total = self.books_manager.full_text_search("melville")
+        self.assertEqual(([self.book2], 1), (found_books, total))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import os
+import sys
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from books_manager import BooksManager
+from models import Book, BookStatus
+
+
+class TestTransactions(unittest.TestCase):
+    def setUp(self):
+        """
+        Подготовка перед каждым тестом:
+        - Создается временный файл данных с тремя книгами.
+        """
+        self.data_file = 'test_transactions.json'
+        self.log_file = f'{self.data_file}.log'
+        self.tearDown()
+
+        self.books_manager = BooksManager(self.data_file)
+        self.books_manager.add_books([
+            Book(1, "The Great Gatsby", "F. Scott Fitzgerald", 1925),
+            Book(2, "Tender Is the Night", "F. Scott Fitzgerald", 1934),
+            Book(3, "Moby Dick", "Herman Melville", 1925),
+        ])
+
+    def tearDown(self):
+        """
+        Очистка после каждого теста:
+        - Удаляются файл данных и журнал.
+        """
+        for path in (self.data_file, self.log_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_single_write(self):
+        """
+        Пакетные операции сохраняют данные одной записью файла.
+        """
+        with mock.patch.object(self.books_manager._storage, 'save', wraps=self.books_manager._storage.save) as save:
+            self.books_manager.add_books(Book(book_id, f"Title {book_id}", "Author", 2000) for book_id in range(4, 14))
+            self.books_manager.update_statuses({1: BookStatus.ISSUED, 2: BookStatus.ISSUED})
+            self.books_manager.remove_books([4, 5, 6])
+        self.assertEqual(3, save.call_count)
+
+        books_manager = BooksManager(self.data_file)
+        self.assertEqual([1, 2, 3, *range(7, 14)], list(books_manager.books))
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[2].status)
+        self.assertEqual(13, self.books_manager.last_book_id)
+
+    def test_validation(self):
+        """
+        При ошибке проверки пакет не применяется целиком.
+        """
+        with self.assertRaises(ValueError) as context:
+            self.books_manager.remove_books([1, 99999])
+        self.assertEqual("Книга с ID 99999 не найдена", str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            self.books_manager.add_books([Book(4, "1984", "George Orwell", 1949), Book(3, "Dup", "Dup", 2000)])
+        self.assertEqual("Книга с ID 3 уже существует", str(context.exception))
+
+        with self.assertRaises(ValueError):
+            self.books_manager.update_statuses({1: BookStatus.ISSUED, 99999: BookStatus.ISSUED})
+
+        self.assertEqual([1, 2, 3], list(self.books_manager.books))
+        self.assertEqual(BookStatus.AVAILABLE, self.books_manager.books[1].status)
+
+    def test_rollback(self):
+        """
+        Исключение внутри транзакции откатывает все изменения в памяти, файл не меняется.
+        """
+        with self.assertRaises(ValueError):
+            with self.books_manager.transaction():
+                self.books_manager.add_book(Book(4, "1984", "George Orwell", 1949))
+                self.books_manager.update_status(1, BookStatus.ISSUED)
+                self.books_manager.remove_book(3)
+                self.books_manager.remove_book(99999)
+
+        self.assertEqual([1, 2, 3], sorted(self.books_manager.books))
+        self.assertEqual(BookStatus.AVAILABLE, self.books_manager.books[1].status)
+        self.assertEqual(3, self.books_manager.last_book_id)
+        self.assertEqual([], self.books_manager.search_books('title', "1984"))
+        self.assertEqual([3], [book.id for book in self.books_manager.search_books('title', "Moby Dick")])
+        self.assertEqual([1, 2, 3], list(BooksManager(self.data_file).books))
+
+    def test_add_books_ids(self):
+        """
+        Пакет выделяет ID книгам без ID, отклоняет ID не целым числом и откатывается целиком
+        при ошибке в индексах.
+        """
+        new_books = [Book(None, "1984", "George Orwell", 1949), Book(10, "Typee", "Herman Melville", 1846),
+                     Book(None, "Omoo", "Herman Melville", 1847)]
+        self.books_manager.add_books(new_books)
+        self.assertEqual([11, 10, 12], [book.id for book in new_books])
+
+        with self.assertRaises(ValueError):
+            self.books_manager.add_books([Book(None, "Walden", "Henry Thoreau", 1854), Book("13", "X", "Y", 2000)])
+        with self.assertRaises(ValueError):
+            self.books_manager.add_book(Book(True, "X", "Y", 2000))
+
+        book = Book(None, "Walden", "Henry Thoreau", 1854)
+        with mock.patch('indexes.SortedIndex.add', side_effect=TypeError):
+            with self.assertRaises(TypeError):
+                self.books_manager.add_books([book])
+            with self.assertRaises(TypeError):
+                self.books_manager.add_book(book)
+        self.assertIsNone(book.id)
+        self.assertEqual(12, self.books_manager.last_book_id)
+        self.assertEqual([], self.books_manager.search_books('title', "Walden"))
+
+        self.assertEqual(13, self.books_manager.add_book(book))
+        self.assertEqual([1, 2, 3, 10, 11, 12, 13], sorted(BooksManager(self.data_file).books))
+
+    def test_add_books_partial_failure(self):
+        """
+        Ошибка на второй книге пакета откатывает первую: каталог, индексы и last_book_id не меняются.
+        """
+        index_book = self.books_manager._index_book
+
+        def fail_on_second(book):
+            if book.title == "Omoo":
+                raise OverflowError
+            index_book(book)
+
+        new_books = [Book(None, "Typee", "Herman Melville", 1846), Book(None, "Omoo", "Herman Melville", 1847)]
+        with mock.patch.object(self.books_manager, '_index_book', side_effect=fail_on_second):
+            with self.assertRaises(OverflowError):
+                self.books_manager.add_books(new_books)
+
+        self.assertEqual([None, None], [book.id for book in new_books])
+        self.assertEqual([1, 2, 3], list(self.books_manager.books))
+        self.assertEqual(3, self.books_manager.last_book_id)
+        books, count = self.books_manager.range_search('id', 1, 10)
+        self.assertEqual(([1, 2, 3], 3), ([book.id for book in books], count))
+        books, count = self.books_manager.range_search('year', 1800, 1930)
+        self.assertEqual(([1, 3], 2), ([book.id for book in books], count))
+        self.assertEqual([], self.books_manager.search_books('title', "Typee"))
+
+    def test_year_range(self):
+        """
+        Год, не помещающийся в ключ отсортированного индекса, отклоняется с ValueError без изменений каталога.
+        """
+        new_books = [Book(None, "Typee", "Herman Melville", 1846), Book(None, "Omoo", "Herman Melville", 10 ** 7)]
+        with self.assertRaises(ValueError):
+            self.books_manager.add_books(new_books)
+        with self.assertRaises(ValueError):
+            self.books_manager.add_book(Book(None, "X", "Y", -2 ** 22))
+        with self.assertRaises(ValueError):
+            self.books_manager.add_book(Book(2 ** 40, "X", "Y", 2000))
+
+        self.assertEqual([None, None], [book.id for book in new_books])
+        self.assertEqual([1, 2, 3], list(self.books_manager.books))
+        self.assertEqual(3, self.books_manager.last_book_id)
+        books, count = self.books_manager.range_search('year', None, None)
+        self.assertEqual(([1, 3, 2], 3), ([book.id for book in books], count))
+
+    def test_savepoint(self):
+        """
+        Ошибка во вложенной транзакции, перехваченная внутри внешней, откатывает только ее изменения.
+        """
+        with self.books_manager.transaction():
+            self.books_manager.update_status(1, BookStatus.ISSUED)
+            with self.assertRaises(ValueError):
+                with self.books_manager.transaction():
+                    self.books_manager.add_book(Book(None, "1984", "George Orwell", 1949))
+                    self.books_manager.remove_book(2)
+                    self.books_manager.remove_book(99999)
+            with mock.patch.object(self.books_manager, '_index_book', side_effect=OverflowError):
+                with self.assertRaises(OverflowError):
+                    self.books_manager.add_book(Book(None, "Walden", "Henry Thoreau", 1854))
+            self.books_manager.add_book(Book(None, "Typee", "Herman Melville", 1846))
+
+        for books_manager in (self.books_manager, BooksManager(self.data_file)):
+            self.assertEqual([1, 2, 3, 4], sorted(books_manager.books))
+            self.assertEqual("Typee", books_manager.books[4].title)
+            self.assertEqual(BookStatus.ISSUED, books_manager.books[1].status)
+            self.assertEqual([], books_manager.search_books('title', "1984"))
+
+    def test_journal_batch(self):
+        """
+        В режиме журнала транзакция записывается одной строкой журнала.
+        """
+        books_manager = BooksManager(self.data_file, journal=True)
+        with books_manager.transaction():
+            books_manager.add_book(Book(4, "1984", "George Orwell", 1949))
+            books_manager.update_status(4, BookStatus.ISSUED)
+            books_manager.remove_book(1)
+
+        with open(self.log_file, encoding='utf-8') as file:
+            self.assertEqual(1, len(file.readlines()))
+
+        books_manager = BooksManager(self.data_file, journal=True)
+        self.assertEqual([2, 3, 4], list(books_manager.books))
+        self.assertEqual(BookStatus.ISSUED, books_manager.books[4].status)
+
+
+if __name__ == "__main__":
+    unittest.main()